@@ -0,0 +1,57 @@
+# Порівняння звітів до/після індексу книг: лінійний пошук по списку книг
+# на кожен продаж (O(продажі × книги)) проти пошуку за id у словнику (O(продажі)).
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from var2_2 import Book, BookManager, Sale, SaleManager
+
+
+def build_store(n_books, n_sales, seed=1):
+    rnd = random.Random(seed)
+    book_mgr = BookManager()
+    for i in range(n_books):
+        book_mgr.add_book(Book(f"Книга {i}", 2000 + i % 25, f"Автор {i % 50}",
+                               f"Жанр {i % 10}", 10.0, 20.0))
+    ids = [b.id for b in book_mgr.books]
+    sale_mgr = SaleManager()
+    sale_mgr.set_sales([
+        Sale(f"Продавець {rnd.randrange(20)}", rnd.choice(ids),
+             f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}", 22.0)
+        for _ in range(n_sales)
+    ])
+    return book_mgr, sale_mgr
+
+
+def total_profit_linear(sale_mgr, start_date, end_date, book_manager):
+    # Стара реалізація: перебір усіх книг для кожного продажу
+    profit = 0
+    for s in sale_mgr.sales_by_period(start_date, end_date):
+        book = next((b for b in book_manager.books if b.id == s.book_id), None)
+        if book:
+            profit += s.real_price - book.cost_price
+    return profit
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print(f"{'книги/продажі':>14} {'лінійно, с':>12} {'індекс, с':>12} {'прискорення':>12}")
+    for n in (500, 1000, 2000, 4000):
+        book_mgr, sale_mgr = build_store(n, n)
+        period = ("2025-01-01", "2025-12-31")
+        old, t_old = timed(total_profit_linear, sale_mgr, *period, book_mgr)
+        new, t_new = timed(sale_mgr.total_profit, *period, book_mgr)
+        assert abs(old - new) < 1e-6
+        print(f"{n:>14} {t_old:>12.4f} {t_new:>12.4f} {t_old / t_new:>11.0f}x")
+
+
+if __name__ == "__main__":
+    main()
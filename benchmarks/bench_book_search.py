@@ -0,0 +1,70 @@
+# Пошук книг: індекс слів і триграм BookManager.search_books проти перебору
+# каталогу з тим самим ранжуванням; побудова індексу, додавання і видалення.
+# Запуск: python bench_book_search.py [кількість книг]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from book_search import book_score, ranked, search_words
+from synthetic import GENRES
+from var2_2 import Book, BookManager
+
+WORDS = ("війна мир кобзар тіні забутих предків місто сад сонце море ніч дорога людина "
+         "весна камінь вогонь зоря степ").split()
+QUERIES = ("кобзар", "ко", "тіні предк", "сад 12", "автор 7 роман", "зор", "zzz")
+
+
+def build(n_books, seed=1):
+    rnd = random.Random(seed)
+    books = [Book(" ".join(rnd.sample(WORDS, rnd.randint(1, 3))) + f" {i}", 2000,
+                  f"Автор {rnd.randrange(max(1, n_books // 8))}", rnd.choice(GENRES), 10.0, 20.0)
+             for i in range(n_books)]
+    book_mgr = BookManager()
+    start = time.perf_counter()
+    book_mgr.set_books(books)
+    return book_mgr, time.perf_counter() - start
+
+
+def scan(books, query, limit=10):
+    tokens = list(dict.fromkeys(search_words(query)))
+    return ranked(((b, s) for b in books for s in [book_score(tokens, b)] if s), limit)
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    n_books = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    book_mgr, t_build = build(n_books)
+    print(f"Книг: {n_books}, побудова індексу: {t_build:.2f} с")
+    books = book_mgr.books
+    for query in QUERIES:
+        found, t_index = timed(lambda: book_mgr.search_books(query))
+        expected, t_scan = timed(lambda: scan(books, query), repeat=1)
+        same = "так" if [b.id for b in found] == [b.id for b in expected] else "НІ"
+        print(f"  {query!r:<18} індекс {t_index * 1000:8.2f} мс | перебір {t_scan * 1000:8.1f} мс | збіг: {same}")
+
+    new_books = [Book(f"нова {word} {i}", 2020, "Автор 1", "Роман", 10.0, 20.0)
+                 for i, word in enumerate(WORDS * 50)]
+    start = time.perf_counter()
+    for book in new_books:
+        book_mgr.add_book(book)
+    t_add = (time.perf_counter() - start) / len(new_books)
+    start = time.perf_counter()
+    for book in new_books:
+        book_mgr.remove_book(book.id)
+    t_remove = (time.perf_counter() - start) / len(new_books)
+    print(f"Додавання книги: {t_add * 1e6:.1f} мкс, видалення: {t_remove * 1e6:.1f} мкс")
+
+
+if __name__ == "__main__":
+    main()
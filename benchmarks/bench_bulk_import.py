@@ -0,0 +1,46 @@
+# Пропускна здатність пакетного імпорту продажів (рядків/с) на згенерованому CSV.
+# Запуск: python bench_bulk_import.py [кількість рядків]
+import csv
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bulk_import import import_file
+from var2_2 import Book, BookManager, Employee, EmployeeManager, SaleManager
+
+
+def write_sales_csv(path, n_rows, book_ids, names, seed=1):
+    rnd = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["employee_name", "book_id", "sale_date", "real_price"])
+        for i in range(n_rows):
+            # Кожен тисячний рядок зіпсований, щоб перевірити шлях відхилення
+            sale_date = "2025-13-01" if i % 1000 == 999 else \
+                f"{rnd.randint(2015, 2025)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+            writer.writerow([rnd.choice(names), rnd.choice(book_ids), sale_date, f"{rnd.uniform(5, 50):.2f}"])
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    employee_mgr, book_mgr, sale_mgr = EmployeeManager(), BookManager(), SaleManager()
+    names = [f"Продавець {i}" for i in range(100)]
+    for name in names:
+        employee_mgr.add_employee(Employee(name, "Продавець", "", ""))
+    for i in range(10_000):
+        book_mgr.add_book(Book(f"Книга {i}", 2000, f"Автор {i % 500}", f"Жанр {i % 20}", 10.0, 20.0))
+    book_ids = [b.id for b in book_mgr.books]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sales.csv")
+        write_sales_csv(path, n_rows, book_ids, names)
+        result = import_file(path, "sales", employee_mgr, book_mgr, sale_mgr)
+    result.print_summary(show=3)
+    print(f"Продажів у менеджері: {len(sale_mgr.sales)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# Розбір дат продажів: strptime (як було) проти date.fromisoformat і date_key
+# з кешем на типовому потоці продажів (кілька років -> ~1800 різних дат).
+# Запуск: python bench_date_key.py [кількість дат]
+import os
+import random
+import sys
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import var2_2
+from var2_2 import date_key
+
+
+def strptime_key(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def fromisoformat_key(value):
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rnd = random.Random(1)
+    dates = [f"{rnd.randint(2021, 2025)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}" for _ in range(n)]
+    print(f"Дат: {n}, різних: {len(set(dates))}")
+    for name, parse in (("strptime", strptime_key), ("fromisoformat", fromisoformat_key), ("date_key", date_key)):
+        var2_2._DATE_KEYS.clear()
+        start = time.perf_counter()
+        for value in dates:
+            parse(value)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<14} {elapsed:6.2f} с ({n / elapsed:>12,.0f} дат/с)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Масштабування паралельних звітів з кількістю процесів на двійковому знімку
+# (багаторічний період, продажі читаються з mmap).
+# Запуск: python bench_parallel_reports.py [кількість продажів]
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from parallel_reports import ParallelReports
+from snapshot_bin import load_snapshot, write_snapshot
+from var2_2 import Book, BookManager, EmployeeManager, Sale, SaleManager
+
+
+def build_snapshot(path, n_sales, seed=1):
+    rnd = random.Random(seed)
+    book_mgr = BookManager()
+    for i in range(5000):
+        book_mgr.add_book(Book(f"Книга {i}", 2000, f"Автор {i % 300}", f"Жанр {i % 15}", 10.0, 20.0))
+    ids = [b.id for b in book_mgr.books]
+    names = [f"Продавець {i}" for i in range(100)]
+    sale_mgr = SaleManager()
+    sale_mgr.set_sales([
+        Sale(rnd.choice(names), rnd.choice(ids),
+             f"{rnd.randint(2016, 2025)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}", 20.0)
+        for _ in range(n_sales)
+    ])
+    write_snapshot(path, EmployeeManager(), book_mgr, sale_mgr)
+
+
+def main():
+    n_sales = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    period = ("2016-01-01", "2025-12-31")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.bin")
+        build_snapshot(path, n_sales)
+        _, book_mgr, sale_mgr = load_snapshot(path)
+        print(f"Продажів: {n_sales}, ядер: {os.cpu_count()}")
+        baseline = None
+        workers = 1
+        while workers <= max(os.cpu_count() or 1, 2):
+            reports = ParallelReports(sale_mgr, workers=workers, threshold=0)
+            start = time.perf_counter()
+            if workers == 1:
+                report = sale_mgr.period_report(*period, book_mgr)
+            else:
+                report = reports.period_report(*period, book_mgr)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"  процесів {workers:>2}: {elapsed:7.2f} с (x{baseline / elapsed:.1f}) "
+                  f"- книга {report['most_sold_book']}")
+            workers *= 2
+        sale_mgr.snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Пам'ять на запис продажу: старий клас Sale зі словником __dict__
+# проти компактного Sale на __slots__. Запуск: python bench_record_memory.py [кількість]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from var2_2 import Sale, date_key
+
+
+class DictSale:
+    # Відтворення попереднього класу Sale (атрибути у __dict__)
+    def __init__(self, employee_name, book_id, sale_date, real_price):
+        self.employee_name = employee_name
+        self.book_id = book_id
+        self.sale_date = sale_date
+        self.real_price = real_price
+        self.date_key = date_key(sale_date)
+
+    @staticmethod
+    def from_dict(data):
+        return DictSale(
+            data.get('employee_name', ''),
+            data.get('book_id', None),
+            data.get('sale_date', ''),
+            data.get('real_price', 0.0)
+        )
+
+
+def raw_sales(n):
+    # Рядки та числа спільні для обох вимірювань, тож рахуються лише самі записи
+    names = [f"Продавець {i}" for i in range(100)]
+    dates = [f"2025-{m:02d}-{d:02d}" for m in range(1, 13) for d in range(1, 29)]
+    return [
+        {"employee_name": names[i % 100], "book_id": i % 1000,
+         "sale_date": dates[i % len(dates)], "real_price": 20.0}
+        for i in range(n)
+    ]
+
+
+def record_size(record):
+    # Сам об'єкт, його __dict__ (якщо є) і власний int з ординалом дати;
+    # рядки та ціни спільні з вхідними даними, тому не враховуються
+    size = sys.getsizeof(record) + sys.getsizeof(record.date_key)
+    if hasattr(record, "__dict__"):
+        size += sys.getsizeof(record.__dict__)
+    return size
+
+
+def measure(cls, data):
+    start = time.perf_counter()
+    records = [cls.from_dict(d) for d in data]
+    elapsed = time.perf_counter() - start
+    per_record = sum(record_size(r) for r in records) / len(records)
+    return per_record, elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    data = raw_sales(n)
+    before, t_before = measure(DictSale, data)
+    after, t_after = measure(Sale, data)
+    print(f"Продажів: {n}")
+    print(f"До (__dict__):     {before:8.1f} байт/запис, завантаження {t_before:.2f} с")
+    print(f"Після (__slots__): {after:8.1f} байт/запис, завантаження {t_after:.2f} с")
+    print(f"Економія: {before - after:.1f} байт/запис ({(1 - after / before) * 100:.0f}%), "
+          f"{(before - after) * n / 2 ** 20:.1f} МіБ загалом")
+
+
+if __name__ == "__main__":
+    main()
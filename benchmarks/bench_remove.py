@@ -0,0 +1,47 @@
+# Масове видалення: поодинокі remove_sale (надгробки) і пакетне remove_sales
+# (усі продажі книги до дати) на синтетичному магазині.
+# Запуск: python bench_remove.py [кількість продажів] [кількість видалень]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import generate_store
+
+
+def main():
+    n_sales = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_removals = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    _, _, sale_mgr = generate_store(n_sales, n_sales // 100)
+    rnd = random.Random(1)
+    victims = [(s.book_id, s.sale_date) for s in rnd.sample(sale_mgr.sales, n_removals)]
+    print(f"Продажів: {n_sales}")
+
+    start = time.perf_counter()
+    for book_id, sale_date in victims:
+        sale_mgr.remove_sale(book_id, sale_date)
+    elapsed = time.perf_counter() - start
+    print(f"  remove_sale x{n_removals}: {elapsed:6.2f} с ({elapsed / n_removals * 1e6:8.1f} мкс на видалення)")
+
+    book_ids = rnd.sample(sorted({book_id for book_id, _ in victims}), 100)
+    start = time.perf_counter()
+    if hasattr(sale_mgr, "remove_sales"):
+        removed = sum(sale_mgr.remove_sales(book_id=book_id, end_date="2023-12-31") for book_id in book_ids)
+    else:
+        # Без пакетного API: кожен продаж книги до дати окремим remove_sale
+        removed = 0
+        for book_id in book_ids:
+            pairs = {s.sale_date for s in sale_mgr.sales_by_period("0001-01-01", "2023-12-31")
+                     if s.book_id == book_id}
+            for sale_date in pairs:
+                sale_mgr.remove_sale(book_id, sale_date)
+                removed += 1
+    elapsed = time.perf_counter() - start
+    print(f"  продажі 100 книг до 2023-12-31 ({removed}): {elapsed:6.2f} с")
+    print(f"  залишилось продажів: {len(sale_mgr.sales)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# Динаміка за п'ять років (день/тиждень/місяць) одним викликом time_series
+# проти окремого total_profit і most_sold_book на кожен місяць.
+# Запуск: python bench_time_series.py [кількість продажів] [list|columnar]
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from synthetic import generate_store
+from var2_2 import GRANULARITIES, create_sale_manager, month_partitions
+
+PERIOD = ("2021-01-01", "2025-12-31")
+
+
+def main():
+    n_sales = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    backend = sys.argv[2] if len(sys.argv) > 2 else "list"
+    _, book_mgr, generated = generate_store(n_sales, max(1000, n_sales // 100))
+    sale_mgr = create_sale_manager(backend)
+    sale_mgr.set_sales(generated.sales)
+    del generated
+    print(f"Продажів: {n_sales}, сховище: {backend}")
+
+    for granularity in GRANULARITIES:
+        start = time.perf_counter()
+        rows = sale_mgr.time_series(*PERIOD, book_mgr, granularity)
+        print(f"  time_series[{granularity:<5}] {len(rows):>5} рядків: {time.perf_counter() - start:7.3f} с")
+
+    months = [(date.fromordinal(a).isoformat(), date.fromordinal(b).isoformat())
+              for a, b in month_partitions(date.fromisoformat(PERIOD[0]).toordinal(),
+                                           date.fromisoformat(PERIOD[1]).toordinal())]
+    start = time.perf_counter()
+    for first, last in months:
+        sale_mgr.total_profit(first, last, book_mgr)
+        sale_mgr.most_sold_book(first, last)
+    print(f"  окремі звіти x{len(months)} місяців:      {time.perf_counter() - start:7.3f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Топ-10 книг і авторів за п'ять років: точний Counter за період проти
+# наближених місячних підсумків top-k (холодний і теплий запит), похибка оцінок
+# і фактичне відхилення від точних лічильників.
+# Запуск: python bench_topn_sketch.py [кількість продажів] [кількість книг]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from var2_2 import Book, BookManager, Sale, SaleManager
+
+PERIOD = ("2021-01-01", "2025-12-31")
+
+
+def build(n_sales, n_books, seed=1):
+    rnd = random.Random(seed)
+    book_mgr = BookManager()
+    for i in range(n_books):
+        book_mgr.add_book(Book(f"Книга {i}", 2000, f"Автор {i % (n_books // 10)}", f"Жанр {i % 25}", 10.0, 20.0))
+    ids = [b.id for b in book_mgr.books]
+    # Zipf-подібний розподіл: кілька бестселерів і довгий хвіст
+    weights = [1 / (rank + 1) for rank in range(n_books)]
+    chosen = rnd.choices(ids, weights, k=n_sales)
+    sale_mgr = SaleManager()
+    sale_mgr.set_sales([
+        Sale(f"Продавець {rnd.randrange(200)}", book_id,
+             f"{rnd.randint(2021, 2025)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}", 20.0)
+        for book_id in chosen
+    ])
+    return book_mgr, sale_mgr
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_sales = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_books = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    book_mgr, sale_mgr = build(n_sales, n_books)
+    print(f"Продажів: {n_sales}, книг: {n_books}, розмір місячного підсумку: {sale_mgr.sketch_capacity}")
+    for kind, exact_method in (("book", "most_sold_book"), ("author", "most_sold_author")):
+        method = getattr(sale_mgr, exact_method)
+        args = (*PERIOD, book_mgr, 10) if kind == "author" else (*PERIOD, 10)
+        exact, t_exact = timed(lambda: method(*args))
+        _, t_cold = timed(lambda: sale_mgr.approx_top(kind, *PERIOD, book_mgr, 10))
+        approx, t_warm = timed(lambda: sale_mgr.approx_top(kind, *PERIOD, book_mgr, 10))
+        counts = dict(exact)
+        recall = len(set(counts) & {item for item, _, _ in approx}) / len(exact)
+        max_error = max(error for _, _, error in approx)
+        max_miss = max(estimate - counts.get(item, 0) for item, estimate, _ in approx)
+        print(f"\n{kind}: точно {t_exact * 1000:8.1f} мс | наближено: холодний {t_cold * 1000:8.1f} мс, "
+              f"теплий {t_warm * 1000:6.1f} мс")
+        print(f"  збіг топ-10: {recall:.0%}, межа похибки до {max_error}, фактичне відхилення до {max_miss}")
+        for (item, count), (a_item, estimate, error) in zip(exact[:3], approx[:3]):
+            print(f"  {item!s:>12}: {count:>7} | {a_item!s:>12}: {estimate:>7} ± {error}")
+
+
+if __name__ == "__main__":
+    main()
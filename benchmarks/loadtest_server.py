@@ -0,0 +1,133 @@
+# Навантажувальний тест звітів HTTP-сервісу: кілька кас (з'єднань keep-alive)
+# одночасно запитують звіти за випадкові місяці; виводяться p50 і p99 затримки.
+# Запуск проти вже запущеного сервісу:
+#   python loadtest_server.py [--port 8080] [--clients 16] [--requests 2000]
+# або з власним тимчасовим сервісом на синтетичних даних:
+#   python loadtest_server.py --serve [--sales 200000]
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from var2_2 import Book, BookManager, Employee, EmployeeManager, Sale, SaleManager, save_data
+
+
+def build_data(path, n_sales, seed=1):
+    rnd = random.Random(seed)
+    employee_mgr, book_mgr, sale_mgr = EmployeeManager(), BookManager(), SaleManager()
+    for i in range(50):
+        employee_mgr.add_employee(Employee(f"Продавець {i}", "Касир", "", ""))
+    for i in range(2000):
+        book_mgr.add_book(Book(f"Книга {i}", 2000, f"Автор {i % 200}", f"Жанр {i % 15}", 10.0, 20.0))
+    ids = [b.id for b in book_mgr.books]
+    sale_mgr.set_sales([
+        Sale(f"Продавець {rnd.randrange(50)}", rnd.choice(ids),
+             f"{rnd.randint(2022, 2025)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}", 20.0)
+        for _ in range(n_sales)
+    ])
+    save_data(employee_mgr, book_mgr, sale_mgr, path, indent=None)
+
+
+async def request(reader, writer, target):
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, targets, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for target in targets:
+            started = time.perf_counter()
+            status = await request(reader, writer, target)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def wait_ready(host, port, timeout=120):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def run(args):
+    await wait_ready(args.host, args.port)
+    rnd = random.Random(args.seed)
+    months = [(y, m) for y in range(2022, 2026) for m in range(1, 13)]
+    targets = []
+    for _ in range(args.requests):
+        year, month = rnd.choice(months[:args.months])
+        targets.append(f"/reports?start={year}-{month:02d}-01&end={year}-{month:02d}-28")
+    latencies, errors = [], []
+    per_client = [targets[i::args.clients] for i in range(args.clients)]
+    started = time.perf_counter()
+    await asyncio.gather(*(client(args.host, args.port, part, latencies, errors) for part in per_client))
+    elapsed = time.perf_counter() - started
+
+    q = statistics.quantiles(latencies, n=100)
+    print(f"Запитів: {len(latencies)}, з'єднань: {args.clients}, помилок: {len(errors)}")
+    print(f"  {len(latencies) / elapsed:,.0f} запитів/с")
+    print(f"  p50 {q[49] * 1000:.2f} мс, p99 {q[98] * 1000:.2f} мс, макс {max(latencies) * 1000:.2f} мс")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Навантажувальний тест звітів HTTP-сервісу")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--clients", type=int, default=16, help="одночасних з'єднань")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--months", type=int, default=48, help="скільки різних місяців запитувати")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--serve", action="store_true", help="запустити тимчасовий сервіс на синтетичних даних")
+    parser.add_argument("--sales", type=int, default=200_000, help="продажів у синтетичних даних")
+    parser.add_argument("--report-cache", type=int, default=128, help="розмір кешу звітів сервісу (--serve)")
+    args = parser.parse_args()
+
+    if not args.serve:
+        asyncio.run(run(args))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.json")
+        build_data(path, args.sales)
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "server.py"), "--data", path, "--no-journal",
+             "--host", args.host, "--port", str(args.port), "--report-cache", str(args.report_cache)],
+            stdout=subprocess.DEVNULL
+        )
+        try:
+            asyncio.run(run(args))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# Набір бенчмарків моделей магазину на синтетичних даних: завантаження і збереження,
+# вибірка за період, усі звіти, пошук книги й працівника. Результати пишуться в JSON,
+# щоб порівнювати коміти між собою.
+#
+#   python run_benchmarks.py --sizes small,medium --out bench.json
+#   python run_benchmarks.py --sizes small --out new.json --compare bench.json
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from synthetic import SIZES, generate_store
+from var2_2 import BookManager, EmployeeManager, create_sale_manager, load_data, save_data
+
+REPORTS = ("most_sold_book", "best_employee", "total_profit", "most_sold_author", "most_sold_genre")
+BOOK_REPORTS = ("total_profit", "most_sold_author", "most_sold_genre")
+PERIODS = {
+    "month": ("2024-11-01", "2024-11-30"),
+    "year": ("2024-01-01", "2024-12-31"),
+    "all": ("2021-01-01", "2025-12-31"),
+}
+LOOKUPS = 10_000
+SLOWER = 1.10  # поріг регресії при порівнянні
+
+
+def measure(fn, repeat, number=1):
+    # Час одного виклику (мін. і медіана з repeat замірів по number викликів)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return {"min": min(times), "median": statistics.median(times), "runs": repeat, "number": number}
+
+
+def run_size(size, n_sales, n_books, sales_backend, repeat, seed):
+    results = {}
+    print(f"\n== {size}: {n_sales} продажів, {n_books} книг ==")
+    started = time.perf_counter()
+    employee_mgr, book_mgr, sale_mgr = generate_store(n_sales, n_books, seed=seed)
+    print(f"  генерація: {time.perf_counter() - started:.1f} с")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.json")
+        results["save_data"] = measure(lambda: save_data(employee_mgr, book_mgr, sale_mgr, path), repeat)
+        del employee_mgr, book_mgr, sale_mgr
+
+        loaded = {}
+
+        def load():
+            loaded["managers"] = (EmployeeManager(), BookManager(), create_sale_manager(sales_backend))
+            load_data(*loaded["managers"], path)
+        results["load_data"] = measure(load, repeat)
+        results["file_mb"] = os.path.getsize(path) / 2 ** 20
+    employee_mgr, book_mgr, sale_mgr = loaded.pop("managers")
+
+    for name, period in PERIODS.items():
+        results[f"sales_by_period[{name}]"] = measure(lambda: sale_mgr.sales_by_period(*period), repeat)
+        for report in REPORTS:
+            method = getattr(sale_mgr, report)
+            args = (*period, book_mgr) if report in BOOK_REPORTS else period
+            results[f"{report}[{name}]"] = measure(lambda: method(*args), repeat)
+        results[f"period_report[{name}]"] = measure(lambda: sale_mgr.period_report(*period, book_mgr), repeat)
+        results[f"employee_leaderboard[{name}]"] = measure(lambda: sale_mgr.employee_leaderboard(*period), repeat)
+        results[f"sales_by_employee[{name}]"] = measure(
+            lambda: sale_mgr.sales_by_employee("Продавець 000", *period), repeat)
+
+    rnd = random.Random(seed)
+    book_ids = [rnd.randint(1, n_books) for _ in range(LOOKUPS)]
+    titles = [f"Книга {rnd.randrange(n_books)}" for _ in range(LOOKUPS)]
+    names = [f"продавець {rnd.randrange(100):03d}" for _ in range(LOOKUPS)]
+    # Пошуки міряються пакетом і діляться на кількість: час одного пошуку
+    results["find_book"] = measure(lambda: [book_mgr.find_book(i) for i in book_ids], repeat)
+    results["find_book_by_title"] = measure(lambda: [book_mgr.find_book_by_title(t) for t in titles], repeat)
+    results["find_employee"] = measure(lambda: [employee_mgr.find_employee(n) for n in names], repeat)
+    for op in ("find_book", "find_book_by_title", "find_employee"):
+        for stat in ("min", "median"):
+            results[op][stat] /= LOOKUPS
+        results[op]["number"] = LOOKUPS
+
+    for op, stats in results.items():
+        if isinstance(stats, dict):
+            print(f"  {op:<32} {_fmt(stats['median'])}")
+    return results
+
+
+def _fmt(seconds):
+    if seconds >= 1:
+        return f"{seconds:8.2f} с"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.2f} мс"
+    return f"{seconds * 1e6:8.2f} мкс"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline):
+    print(f"\nПорівняння з {baseline['meta'].get('commit')} (медіани, новий / старий):")
+    regressions = 0
+    for size, ops in current["results"].items():
+        old_ops = baseline["results"].get(size, {})
+        for op, stats in ops.items():
+            old = old_ops.get(op)
+            if not isinstance(stats, dict) or not isinstance(old, dict) or not old["median"]:
+                continue
+            ratio = stats["median"] / old["median"]
+            mark = "  <- повільніше" if ratio > SLOWER else ""
+            regressions += ratio > SLOWER
+            print(f"  {size:<7}{op:<32} {_fmt(old['median'])} -> {_fmt(stats['median'])}  x{ratio:5.2f}{mark}")
+    print(f"Повільніше більш ніж у {SLOWER}: {regressions}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки книжкового магазину")
+    parser.add_argument("--sizes", default="small,medium",
+                        help=f"розміри через кому: {', '.join(SIZES)} або ПРОДАЖІВ:КНИГ")
+    parser.add_argument("--sales-backend", choices=["list", "columnar"], default="list")
+    parser.add_argument("--repeat", type=int, default=5, help="замірів кожної операції")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="записати результати в JSON")
+    parser.add_argument("--compare", metavar="JSON", help="порівняти з попередніми результатами")
+    args = parser.parse_args()
+
+    current = {
+        "meta": {
+            "commit": _git_commit(),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sales_backend": args.sales_backend,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+    for size in args.sizes.split(","):
+        if size in SIZES:
+            n_sales, n_books = SIZES[size]
+        else:
+            n_sales, n_books = map(int, size.split(":"))
+        current["results"][size] = run_size(size, n_sales, n_books, args.sales_backend, args.repeat, args.seed)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"\nРезультати записано у {args.out}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(current, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
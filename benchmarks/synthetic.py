@@ -0,0 +1,77 @@
+# Генератор синтетичних магазинів для бенчмарків: книги з бестселерами (Zipf),
+# продажі з ростом за роками, сезонністю (грудень, вихідні) і 100 працівниками,
+# серед яких теж є лідери продажів.
+import os
+import random
+import sys
+from datetime import date
+from itertools import accumulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from var2_2 import Book, BookManager, Employee, EmployeeManager, Sale, SaleManager
+
+# Розміри: (продажів, книг)
+SIZES = {
+    "small": (10_000, 1_000),
+    "medium": (1_000_000, 10_000),
+    "large": (10_000_000, 100_000),
+}
+GENRES = ["Роман", "Детектив", "Фантастика", "Фентезі", "Поезія", "Історія", "Біографія", "Наука",
+          "Дитяча", "Бізнес", "Психологія", "Кулінарія", "Подорожі", "Мистецтво", "Підручник"]
+MONTH_WEIGHTS = [0.8, 0.8, 0.9, 0.9, 1.0, 0.9, 0.9, 1.1, 1.3, 1.0, 1.2, 1.8]
+
+
+def zipf_weights(n, s):
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def day_weights(first_year, last_year, growth=0.15):
+    # Вага кожного дня: ріст обсягу рік до року, сезонність за місяцем, вихідні вдвічі активніші
+    days, weights = [], []
+    for ordinal in range(date(first_year, 1, 1).toordinal(), date(last_year, 12, 31).toordinal() + 1):
+        day = date.fromordinal(ordinal)
+        weight = (1 + growth) ** (day.year - first_year) * MONTH_WEIGHTS[day.month - 1]
+        if day.weekday() >= 5:
+            weight *= 2
+        days.append(day.isoformat())
+        weights.append(weight)
+    return days, weights
+
+
+def generate_store(n_sales, n_books, n_employees=100, first_year=2021, last_year=2025,
+                   book_skew=1.1, employee_skew=0.6, seed=1):
+    rnd = random.Random(seed)
+    employee_mgr, book_mgr, sale_mgr = EmployeeManager(), BookManager(), SaleManager()
+    Book._id_counter = 1
+
+    employee_mgr.set_employees(
+        Employee(f"Продавець {i:03d}", "Консультант", f"+38050{i:07d}", f"seller{i}@shop.ua")
+        for i in range(n_employees)
+    )
+    n_authors = max(1, n_books // 8)
+    books = []
+    for i in range(n_books):
+        cost = round(rnd.uniform(50, 400), 2)
+        books.append(Book(f"Книга {i}", rnd.randint(1950, last_year), f"Автор {rnd.randrange(n_authors)}",
+                          rnd.choice(GENRES), cost, round(cost * rnd.uniform(1.2, 1.8), 2)))
+    book_mgr.set_books(books)
+
+    # Популярність не залежить від id: перемішуємо, хто стане бестселером
+    ranked_books = books[:]
+    rnd.shuffle(ranked_books)
+    book_cum = list(accumulate(zipf_weights(n_books, book_skew)))
+    employees = [e.full_name for e in employee_mgr.employees]
+    employee_cum = list(accumulate(zipf_weights(n_employees, employee_skew)))
+    days, weights = day_weights(first_year, last_year)
+    day_cum = list(accumulate(weights))
+
+    picked_books = rnd.choices(ranked_books, cum_weights=book_cum, k=n_sales)
+    picked_days = rnd.choices(days, cum_weights=day_cum, k=n_sales)
+    picked_employees = rnd.choices(employees, cum_weights=employee_cum, k=n_sales)
+    discount = [1.0, 1.0, 1.0, 0.95, 0.9]
+    sale_mgr.set_sales([
+        Sale(name, book.id, day, round(book.sale_price * rnd.choice(discount), 2))
+        for book, day, name in zip(picked_books, picked_days, picked_employees)
+    ])
+    return employee_mgr, book_mgr, sale_mgr
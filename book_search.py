@@ -0,0 +1,146 @@
+# Пошук книг за назвою, автором і жанром: інвертований індекс слів плюс індекс
+# триграм над словником. Кожне слово запиту має бути частиною якогось слова книги
+# (запити з 1-2 символів - початком слова). Ранжування: поле (назва > автор > жанр)
+# і якість збігу (слово цілком > початок слова > частина слова).
+import re
+from heapq import nsmallest
+
+DEFAULT_LIMIT = 10
+FIELD_WEIGHTS = (("title", 3), ("author", 2), ("genre", 1))
+EXACT, PREFIX, INFIX = 3, 2, 1
+CHECK_RATIO = 8  # у скільки разів частіше слово запиту перевіряється по книгах, а не перетином
+
+_WORD = re.compile(r"\w+")
+
+
+def search_words(text):
+    return _WORD.findall(str(text).casefold())
+
+
+def _word_grams(word):
+    # Префікси з одного і двох символів (для коротких запитів) і всі триграми
+    grams = {"^" + word[:1], "^" + word[:2]}
+    grams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+def _query_grams(token):
+    if len(token) < 3:
+        return ["^" + token]
+    return [token[i:i + 3] for i in range(len(token) - 2)]
+
+
+def match_quality(token, word):
+    if word == token:
+        return EXACT
+    if word.startswith(token):
+        return PREFIX
+    return INFIX if len(token) >= 3 and token in word else 0
+
+
+def book_score(tokens, book):
+    # Сума найкращих збігів кожного слова запиту; 0 - книга не підходить.
+    # Той самий розрахунок, що й в індексі, - для сховищ без індексу в пам'яті
+    fields = [(search_words(getattr(book, field)), weight) for field, weight in FIELD_WEIGHTS]
+    total = 0
+    for token in tokens:
+        best = max((weight * match_quality(token, word) for words, weight in fields for word in words), default=0)
+        if not best:
+            return 0
+        total += best
+    return total
+
+
+def ranked(scores, limit):
+    # [(книга, бал)] -> найкращі limit книг: за балом, потім за назвою та id
+    best = nsmallest(limit, scores, key=lambda item: (-item[1], item[0].title.casefold(), item[0].id))
+    return [book for book, _ in best]
+
+
+class SearchIndex:
+    def __init__(self):
+        self._postings = {}  # слово -> {книга: вага найважливішого поля з цим словом}
+        self._grams = {}     # триграма або "^префікс" -> множина слів
+        self._words = {}     # книга -> її слова (для видалення)
+
+    def __len__(self):
+        return len(self._words)
+
+    def add(self, book):
+        weights = {}
+        for field, weight in FIELD_WEIGHTS:
+            for word in search_words(getattr(book, field)):
+                if weights.get(word, 0) < weight:
+                    weights[word] = weight
+        self._words[book] = tuple(weights)
+        for word, weight in weights.items():
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = {}
+                for gram in _word_grams(word):
+                    self._grams.setdefault(gram, set()).add(word)
+            postings[book] = weight
+
+    def discard(self, book):
+        for word in self._words.pop(book, ()):
+            postings = self._postings[word]
+            del postings[book]
+            if not postings:
+                del self._postings[word]
+                for gram in _word_grams(word):
+                    words = self._grams[gram]
+                    words.discard(word)
+                    if not words:
+                        del self._grams[gram]
+
+    def _candidates(self, token):
+        # Слова словника, що підходять до слова запиту
+        sets = [self._grams.get(gram) for gram in _query_grams(token)]
+        if not all(sets):
+            return []
+        sets.sort(key=len)
+        words = sets[0].intersection(*sets[1:]) if len(sets) > 1 else sets[0]
+        return [(word, quality) for word in words for quality in [match_quality(token, word)] if quality]
+
+    def _token_scores(self, candidates):
+        # {книга: найкращий бал за це слово запиту}
+        scores = {}
+        for word, quality in candidates:
+            for book, weight in self._postings[word].items():
+                score = weight * quality
+                if scores.get(book, 0) < score:
+                    scores[book] = score
+        return scores
+
+    def _book_score(self, token, book):
+        # Бал однієї книги за словом запиту - за її власними словами
+        best = 0
+        for word in self._words[book]:
+            quality = match_quality(token, word)
+            if quality:
+                best = max(best, self._postings[word][book] * quality)
+        return best
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        tokens = list(dict.fromkeys(search_words(query)))
+        if not tokens:
+            return []
+        # Слова запиту - від найрідкіснішого. Наступне слово або рахується повністю
+        # і перетинається, або, якщо воно набагато частіше (як "автор"), перевіряється
+        # лише для книг, що лишились
+        candidates = []
+        for token in tokens:
+            words = self._candidates(token)
+            candidates.append((sum(len(self._postings[word]) for word, _ in words), token, words))
+        candidates.sort(key=lambda item: item[0])
+        totals = self._token_scores(candidates[0][2])
+        for cost, token, words in candidates[1:]:
+            if not totals:
+                break
+            if cost <= CHECK_RATIO * len(totals):
+                scores = self._token_scores(words)
+                totals = {book: total + scores[book] for book, total in totals.items() if book in scores}
+            else:
+                totals = {book: total + score for book, total in totals.items()
+                          for score in [self._book_score(token, book)] if score}
+        return ranked(totals.items(), limit)
@@ -0,0 +1,202 @@
+# Пакетний імпорт працівників, книг і продажів з CSV або JSON Lines.
+# Рядки читаються потоково й додаються пакетами; некоректні рядки не зупиняють
+# імпорт, а потрапляють у звіт з номером рядка і причиною.
+#
+#   python bulk_import.py sales sales.csv [--data data.json] [--batch 10000] [--rejects rejects.csv]
+import csv
+import json
+import os
+import time
+from datetime import datetime
+
+from var2_2 import Book, Employee, Sale
+
+MAX_REJECTS_KEPT = 1000
+
+
+class ImportResult:
+    def __init__(self, kind):
+        self.kind = kind
+        self.accepted = 0
+        self.rejected = 0
+        self.rejects = []  # (номер рядка, причина), не більше MAX_REJECTS_KEPT
+        self.seconds = 0.0
+
+    def reject(self, line_no, reason):
+        self.rejected += 1
+        if len(self.rejects) < MAX_REJECTS_KEPT:
+            self.rejects.append((line_no, reason))
+
+    @property
+    def rows_per_second(self):
+        total = self.accepted + self.rejected
+        return total / self.seconds if self.seconds else 0.0
+
+    def print_summary(self, show=10):
+        print(f"Імпорт ({self.kind}): прийнято {self.accepted}, відхилено {self.rejected}, "
+              f"{self.seconds:.2f} с ({self.rows_per_second:,.0f} рядків/с)")
+        for line_no, reason in self.rejects[:show]:
+            print(f"  рядок {line_no}: {reason}")
+        if self.rejected > show:
+            print(f"  ... ще {self.rejected - show}")
+
+
+# ---------------------- Перевірки (як у BookActions) ----------------------
+
+def parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"не число: {value!r}")
+
+
+def parse_year(value):
+    current_year = datetime.now().year
+    try:
+        year = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"некоректний рік: {value!r}")
+    if not 1400 <= year <= current_year:
+        raise ValueError(f"рік повинен бути в межах 1400 - {current_year}")
+    return year
+
+
+def required(row, field):
+    value = row.get(field)
+    if value is None or value == "":
+        raise ValueError(f"порожнє поле {field}")
+    return value
+
+
+# ---------------------- Читання файлів ----------------------
+
+def iter_rows(path):
+    # Пари (номер рядка, словник полів); формат визначається за розширенням
+    if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                yield line_no, row if isinstance(row, dict) else None
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+
+
+# ---------------------- Побудова записів ----------------------
+
+def employee_from_row(row):
+    return Employee(required(row, "full_name"), row.get("position", ""), row.get("phone", ""), row.get("email", ""))
+
+
+def book_from_row(row, book_mgr):
+    data = {
+        "title": required(row, "title"),
+        "year": parse_year(required(row, "year")),
+        "author": row.get("author", ""),
+        "genre": row.get("genre", ""),
+        "cost_price": parse_float(required(row, "cost_price")),
+        "sale_price": parse_float(required(row, "sale_price"))
+    }
+    if row.get("id") not in (None, ""):
+        try:
+            data["id"] = int(row["id"])
+        except (TypeError, ValueError):
+            raise ValueError(f"некоректний id: {row['id']!r}")
+        if book_mgr.find_book(data["id"]) is not None:
+            raise ValueError(f"книга з ID {data['id']} вже існує")
+    return Book.from_dict(data)
+
+
+def sale_from_row(row, employee_mgr, book_mgr):
+    # Ім'я шукається як у меню (без урахування регістру), у продаж іде ім'я з довідника
+    name = str(required(row, "employee_name"))
+    employee = employee_mgr.find_employee(name)
+    if employee is None:
+        raise ValueError(f"працівник '{name}' не знайдений")
+    book_id = row.get("book_id")
+    if book_id not in (None, ""):
+        try:
+            book_id = int(book_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"некоректний ID книги: {book_id!r}")
+        if book_mgr.find_book(book_id) is None:
+            raise ValueError(f"книга з ID {book_id} не знайдена")
+    else:
+        book = book_mgr.find_book_by_title(required(row, "book_title"))
+        if book is None:
+            raise ValueError(f"книга '{row['book_title']}' не знайдена")
+        book_id = book.id
+    sale = Sale(employee.full_name, book_id, required(row, "sale_date"), parse_float(required(row, "real_price")))
+    if sale.date_key is None:
+        raise ValueError(f"невірний формат дати (YYYY-MM-DD): {sale.sale_date!r}")
+    return sale
+
+
+# ---------------------- Імпорт ----------------------
+
+def import_file(path, kind, employee_mgr, book_mgr, sale_mgr, batch_size=10000):
+    result = ImportResult(kind)
+    started = time.perf_counter()
+    # Продажі додаються пакетами (одне злиття на пакет); книги й працівники - одразу,
+    # щоб наступні рядки того ж файлу бачили їх в індексах
+    batch = []
+    for line_no, row in iter_rows(path):
+        if row is None:
+            result.reject(line_no, "не вдалося розібрати рядок")
+            continue
+        try:
+            if kind == "sales":
+                batch.append(sale_from_row(row, employee_mgr, book_mgr))
+            elif kind == "books":
+                book_mgr.add_book(book_from_row(row, book_mgr))
+            else:
+                employee_mgr.add_employee(employee_from_row(row))
+        except ValueError as e:
+            result.reject(line_no, str(e))
+            continue
+        result.accepted += 1
+        if len(batch) >= batch_size:
+            sale_mgr.add_sales(batch)
+            batch = []
+    if batch:
+        sale_mgr.add_sales(batch)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def write_rejects(result, path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["line", "reason"])
+        writer.writerows(result.rejects)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from var2_2 import BookManager, EmployeeManager, Journal, SaleManager, journal_path, load_data, save_data
+
+    parser = argparse.ArgumentParser(description="Пакетний імпорт з CSV або JSON Lines")
+    parser.add_argument("kind", choices=["employees", "books", "sales"])
+    parser.add_argument("path", help="файл .csv або .jsonl")
+    parser.add_argument("--data", default="data.json", help="файл знімка даних")
+    parser.add_argument("--batch", type=int, default=10000, help="розмір пакета")
+    parser.add_argument("--rejects", metavar="FILE", help="зберегти відхилені рядки у CSV")
+    args = parser.parse_args()
+
+    employee_mgr, book_mgr, sale_mgr = EmployeeManager(), BookManager(), SaleManager()
+    journal = Journal(journal_path(args.data))
+    load_data(employee_mgr, book_mgr, sale_mgr, args.data, journal=journal)
+    result = import_file(args.path, args.kind, employee_mgr, book_mgr, sale_mgr, args.batch)
+    result.print_summary()
+    if args.rejects:
+        write_rejects(result, args.rejects)
+    # Після великого імпорту одразу стискаємо журнал у знімок
+    save_data(employee_mgr, book_mgr, sale_mgr, args.data, journal=journal)
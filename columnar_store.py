@@ -0,0 +1,433 @@
+# Колонкове сховище продажів: дати, id книг, коди працівників і ціни
+# лежать у компактних масивах замість окремих об'єктів Sale.
+# Якщо встановлено NumPy, агрегації виконуються векторно.
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date
+
+from var2_2 import GRANULARITIES, DayBucket, Sale, SaleManager, date_key, series_row
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NO_BOOK = -1  # book_id = None у колонці id книг
+EPOCH = date(1970, 1, 1).toordinal()  # ординал нуля для datetime64[D]
+
+
+class ColumnarSaleManager(SaleManager):
+    def __init__(self):
+        self._keys = array("i")       # ординали дат, відсортовані
+        self._book_ids = array("q")   # id книги або NO_BOOK
+        self._employees = array("i")  # код працівника в self._names
+        self._prices = array("d")
+        self._names = []              # код -> ім'я працівника
+        self._codes = {}              # ім'я працівника -> код
+        self._by_employee = {}        # ім'я працівника -> відсортовані ординали дат його продажів
+        self.invalid_sales = []
+        self.journal = None
+        self.report_cache = None
+        self._month_tops = {}
+        self.rows_scanned = 0
+
+    # ---------------------- Представлення рядків ----------------------
+
+    def _code(self, name):
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self._names)
+            self._names.append(name)
+        return code
+
+    def _view(self, i):
+        # Легкий об'єкт Sale, створений на вимогу з рядка i
+        sale = Sale.__new__(Sale)
+        book_id = self._book_ids[i]
+        sale.employee_name = self._names[self._employees[i]]
+        sale.book_id = None if book_id == NO_BOOK else book_id
+        sale.date_key = self._keys[i]
+        sale.sale_date = date.fromordinal(sale.date_key).isoformat()
+        sale.real_price = self._prices[i]
+        return sale
+
+    @property
+    def sales(self):
+        return [self._view(i) for i in range(len(self._keys))]
+
+    # ---------------------- Зміни ----------------------
+
+    def add_sale(self, sale):
+        if self.journal is not None:
+            self.journal.append("add_sale", sale.to_dict())
+        if sale.date_key is None:
+            print(f"Продаж {sale.book_id} має некоректну дату: {sale.sale_date}")
+            self.invalid_sales.append(sale)
+            return
+        pos = bisect_right(self._keys, sale.date_key)
+        self._keys.insert(pos, sale.date_key)
+        self._book_ids.insert(pos, NO_BOOK if sale.book_id is None else sale.book_id)
+        self._employees.insert(pos, self._code(sale.employee_name))
+        self._prices.insert(pos, sale.real_price)
+        own = self._by_employee.setdefault(sale.employee_name, array("i"))
+        own.insert(bisect_right(own, sale.date_key), sale.date_key)
+        self._changed([sale.date_key])
+
+    def add_sales(self, sales):
+        sales = list(sales)
+        if self.journal is not None:
+            self.journal.append("add_sales", [s.to_dict() for s in sales])
+        batch = sorted(self._quarantine(sales), key=lambda s: s.date_key)
+        if batch and self._keys and batch[0].date_key < self._keys[-1]:
+            # Пакет перекривається з наявними датами - пересортовуємо все разом
+            invalid, cache = self.invalid_sales, self.report_cache
+            self.report_cache = None
+            self.set_sales(self.sales + batch)
+            self.invalid_sales, self.report_cache = invalid, cache
+        else:
+            self._keys.extend(s.date_key for s in batch)
+            self._book_ids.extend(NO_BOOK if s.book_id is None else s.book_id for s in batch)
+            self._employees.extend(self._code(s.employee_name) for s in batch)
+            self._prices.extend(s.real_price for s in batch)
+            for s in batch:
+                self._by_employee.setdefault(s.employee_name, array("i")).append(s.date_key)
+        self._changed(s.date_key for s in batch)
+
+    def set_sales(self, sales):
+        self.invalid_sales = []
+        valid = self._quarantine(sales)
+        valid.sort(key=lambda s: s.date_key)
+        self._names = []
+        self._codes = {}
+        self._keys = array("i", [s.date_key for s in valid])
+        self._book_ids = array("q", [NO_BOOK if s.book_id is None else s.book_id for s in valid])
+        self._employees = array("i", [self._code(s.employee_name) for s in valid])
+        self._prices = array("d", [s.real_price for s in valid])
+        self._by_employee = {}
+        for s in valid:
+            self._by_employee.setdefault(s.employee_name, array("i")).append(s.date_key)
+        self._reset()
+
+    def remove_sale(self, book_id, sale_date):
+        if self.journal is not None:
+            self.journal.append("remove_sale", {"book_id": book_id, "sale_date": sale_date})
+        key = date_key(sale_date)
+        if key is None:
+            before = len(self.invalid_sales)
+            self.invalid_sales = [s for s in self.invalid_sales
+                                  if not (s.book_id == book_id and s.sale_date == sale_date)]
+            return before - len(self.invalid_sales)
+        stored = NO_BOOK if book_id is None else book_id
+        lo = bisect_left(self._keys, key)
+        hi = bisect_right(self._keys, key, lo)
+        kept = [i for i in range(lo, hi) if self._book_ids[i] != stored]
+        if len(kept) == hi - lo:
+            return 0
+        for i in range(lo, hi):
+            if self._book_ids[i] == stored:
+                name = self._names[self._employees[i]]
+                own = self._by_employee[name]
+                del own[bisect_left(own, key)]
+                if not own:
+                    del self._by_employee[name]
+        for column in (self._keys, self._book_ids, self._employees, self._prices):
+            column[lo:hi] = array(column.typecode, [column[i] for i in kept])
+        self._changed([key])
+        return hi - lo - len(kept)
+
+    def remove_sales(self, book_id=None, employee_name=None, start_date=None, end_date=None):
+        # Один прохід по відрізку періоду: колонки переписуються один раз
+        if book_id is None and employee_name is None and start_date is None and end_date is None:
+            raise ValueError("Потрібна хоча б одна умова видалення продажів.")
+        if self.journal is not None:
+            self.journal.append("remove_sales", {"book_id": book_id, "employee_name": employee_name,
+                                                 "start_date": start_date, "end_date": end_date})
+        keys = self._open_period_keys(start_date, end_date)
+        if keys is None:
+            return 0
+        code = None if employee_name is None else self._codes.get(employee_name, -1)
+        removed = 0
+        if start_date is None and end_date is None:
+            before = len(self.invalid_sales)
+            self.invalid_sales = [s for s in self.invalid_sales
+                                  if not ((book_id is None or s.book_id == book_id)
+                                          and (employee_name is None or s.employee_name == employee_name))]
+            removed = before - len(self.invalid_sales)
+        lo = bisect_left(self._keys, keys[0])
+        hi = bisect_right(self._keys, keys[1], lo)
+        self.rows_scanned += hi - lo
+        gone = [i for i in range(lo, hi)
+                if (book_id is None or self._book_ids[i] == book_id)
+                and (code is None or self._employees[i] == code)]
+        if not gone:
+            return removed
+        for i in gone:
+            own = self._by_employee[self._names[self._employees[i]]]
+            del own[bisect_left(own, self._keys[i])]
+        self._by_employee = {name: own for name, own in self._by_employee.items() if own}
+        days = {self._keys[i] for i in gone}
+        gone = set(gone)
+        kept = [i for i in range(lo, hi) if i not in gone]
+        for column in (self._keys, self._book_ids, self._employees, self._prices):
+            column[lo:hi] = array(column.typecode, [column[i] for i in kept])
+        self._changed(days)
+        return removed + len(gone)
+
+    # ---------------------- Запити ----------------------
+
+    def sales_by_period(self, start_date, end_date):
+        bounds = self._period_bounds(start_date, end_date)
+        if bounds is None:
+            return []
+        return [self._view(i) for i in range(*bounds)]
+
+    def iter_sales(self, start_date=None, end_date=None, employee_name=None, book_id=None):
+        keys = self._open_period_keys(start_date, end_date)
+        if keys is None:
+            return
+        code = None
+        if employee_name is not None:
+            # Відрізок між першим і останнім продажем працівника в періоді
+            own = self._by_employee.get(employee_name)
+            if own is None:
+                return
+            first = bisect_left(own, keys[0])
+            last = bisect_right(own, keys[1], first)
+            if first == last:
+                return
+            keys = own[first], own[last - 1]
+            code = self._codes[employee_name]
+        lo = bisect_left(self._keys, keys[0])
+        hi = bisect_right(self._keys, keys[1], lo)
+        for i in range(lo, hi):
+            if (code is None or self._employees[i] == code) and (book_id is None or self._book_ids[i] == book_id):
+                yield self._view(i)
+
+    def sells_book(self, book_id, start_date, end_date):
+        bounds = self._period_bounds(start_date, end_date)
+        return bounds is not None and book_id in self._book_ids[bounds[0]:bounds[1]]
+
+    def sales_by_employee(self, employee_name, start_date, end_date):
+        # Індекс працівника містить лише дати: за ним звужуємо відрізок до днів між
+        # першим і останнім його продажем у періоді, а рядки вибираємо за кодом
+        keys = self._period_keys(start_date, end_date)
+        own = self._by_employee.get(employee_name)
+        if keys is None or own is None:
+            return []
+        first = bisect_left(own, keys[0])
+        last = bisect_right(own, keys[1], first)
+        if first == last:
+            return []
+        lo = bisect_left(self._keys, own[first])
+        hi = bisect_right(self._keys, own[last - 1], lo)
+        self.rows_scanned += hi - lo
+        code = self._codes[employee_name]
+        if np is not None:
+            rows = (np.flatnonzero(self._column(self._employees, lo, hi) == code) + lo).tolist()
+        else:
+            rows = [i for i in range(lo, hi) if self._employees[i] == code]
+        return [self._view(i) for i in rows]
+
+    def _column(self, column, lo, hi):
+        if np is not None:
+            return np.frombuffer(column, dtype=column.typecode)[lo:hi]
+        return column[lo:hi]
+
+    def _ranked(self, codes, top_n):
+        # Як Counter.most_common: за спаданням кількості, при рівності - хто раніше трапився
+        if np is None:
+            return Counter(codes).most_common(top_n)
+        if not len(codes):
+            return []
+        uniq, first, counts = np.unique(codes, return_index=True, return_counts=True)
+        order = np.lexsort((first, -counts))[:top_n]
+        return [(int(uniq[i]), int(counts[i])) for i in order]
+
+    def _book_counts(self, lo, hi):
+        # Counter id книг (без NO_BOOK) у порядку першої появи в періоді
+        book_ids = self._column(self._book_ids, lo, hi)
+        if np is None:
+            counter = Counter(book_ids)
+            counter.pop(NO_BOOK, None)
+            return counter
+        book_ids = book_ids[book_ids != NO_BOOK]
+        if not len(book_ids):
+            return Counter()
+        uniq, first, counts = np.unique(book_ids, return_index=True, return_counts=True)
+        order = np.argsort(first, kind="stable")
+        return Counter({int(uniq[i]): int(counts[i]) for i in order})
+
+    def _period_totals(self, start_date, end_date):
+        # Повний агрегат періоду (місячні підсумки approx_top, звіти мережі магазинів)
+        total = DayBucket()
+        bounds = self._period_bounds(start_date, end_date)
+        if bounds is None:
+            return total
+        total.books = self._book_counts(*bounds)
+        ranked = self._ranked(self._column(self._employees, *bounds), None)
+        total.employees = Counter({self._names[code]: count for code, count in ranked})
+        total.book_revenue, total.revenue = self._book_revenue(*bounds)
+        return total
+
+    def _book_revenue(self, lo, hi):
+        # ({id книги: виручка}, виручка разом з продажами без книги)
+        book_ids = self._column(self._book_ids, lo, hi)
+        prices = self._column(self._prices, lo, hi)
+        if np is None:
+            revenue = {}
+            for book_id, price in zip(book_ids, prices):
+                if book_id != NO_BOOK:
+                    revenue[book_id] = revenue.get(book_id, 0) + price
+            return revenue, sum(prices)
+        if not len(book_ids):
+            return {}, 0
+        uniq, inverse = np.unique(book_ids, return_inverse=True)
+        sums = np.bincount(inverse, weights=prices, minlength=len(uniq))
+        revenue = {book_id: total for book_id, total in zip(uniq.tolist(), sums.tolist()) if book_id != NO_BOOK}
+        return revenue, float(prices.sum())
+
+    def most_sold_book(self, start_date, end_date, top_n=None):
+        bounds = self._period_bounds(start_date, end_date)
+        if bounds is None:
+            return None if top_n is None else []
+        return self._top(self._book_counts(*bounds), top_n)
+
+    def best_employee(self, start_date, end_date, top_n=None):
+        bounds = self._period_bounds(start_date, end_date)
+        if bounds is None:
+            return None if top_n is None else []
+        return self._employee_top(*bounds, top_n)
+
+    def _employee_top(self, lo, hi, top_n):
+        ranked = self._ranked(self._column(self._employees, lo, hi), 1 if top_n is None else top_n)
+        ranked = [(self._names[code], count) for code, count in ranked]
+        if top_n is None:
+            return ranked[0] if ranked else None
+        return ranked
+
+    def _profit(self, lo, hi, book_manager):
+        book_ids = self._column(self._book_ids, lo, hi)
+        prices = self._column(self._prices, lo, hi)
+        if np is None:
+            profit = 0
+            for book_id, price in zip(book_ids, prices):
+                book = book_manager.find_book(book_id)
+                if book is not None:
+                    profit += price - book.cost_price
+            return profit
+        if not len(book_ids):
+            return 0
+        uniq, inverse = np.unique(book_ids, return_inverse=True)
+        costs = np.full(len(uniq), np.nan)
+        for i, book_id in enumerate(uniq.tolist()):
+            book = book_manager.find_book(book_id)
+            if book is not None:
+                costs[i] = book.cost_price
+        row_costs = costs[inverse]
+        found = ~np.isnan(row_costs)
+        return float((prices[found] - row_costs[found]).sum())
+
+    def total_profit(self, start_date, end_date, book_manager):
+        bounds = self._period_bounds(start_date, end_date)
+        if bounds is None:
+            return 0
+        return self._profit(*bounds, book_manager)
+
+    def most_sold_author(self, start_date, end_date, book_manager, top_n=None):
+        bounds = self._period_bounds(start_date, end_date)
+        if bounds is None:
+            return None if top_n is None else []
+        return self._top(self._grouped(self._book_counts(*bounds), book_manager, "author"), top_n)
+
+    def most_sold_genre(self, start_date, end_date, book_manager, top_n=None):
+        bounds = self._period_bounds(start_date, end_date)
+        if bounds is None:
+            return None if top_n is None else []
+        return self._top(self._grouped(self._book_counts(*bounds), book_manager, "genre"), top_n)
+
+    def period_report(self, start_date, end_date, book_manager, top_n=None):
+        bounds = self._period_bounds(start_date, end_date) or (0, 0)
+        books = self._book_counts(*bounds)
+        return {
+            "most_sold_book": self._top(books, top_n),
+            "best_employee": self._employee_top(*bounds, top_n),
+            "total_profit": self._profit(*bounds, book_manager),
+            "most_sold_author": self._top(self._grouped(books, book_manager, "author"), top_n),
+            "most_sold_genre": self._top(self._grouped(books, book_manager, "genre"), top_n)
+        }
+
+    # ---------------------- Динаміка ----------------------
+
+    def _day_buckets(self, first_key, last_key):
+        bounds = self._period_bounds(date.fromordinal(first_key).isoformat(),
+                                     date.fromordinal(last_key).isoformat())
+        return self._bucket_days(self._view(i) for i in range(*bounds))
+
+    def time_series(self, start_date, end_date, book_manager, granularity="month"):
+        if np is None:
+            return super().time_series(start_date, end_date, book_manager, granularity)
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Невідомий крок динаміки: {granularity}")
+        bounds = self._period_bounds(start_date, end_date)
+        if bounds is None or bounds[0] == bounds[1]:
+            return []
+        keys = self._column(self._keys, *bounds).astype(np.int64)
+        book_ids = self._column(self._book_ids, *bounds)
+        prices = self._column(self._prices, *bounds)
+        if granularity == "day":
+            starts = keys
+        elif granularity == "week":
+            starts = keys - (keys - 1) % 7
+        else:
+            months = (keys - EPOCH).astype("datetime64[D]").astype("datetime64[M]")
+            starts = months.astype("datetime64[D]").astype(np.int64) + EPOCH
+        # Рядки відсортовані за датою, тож кожен крок - суцільний відрізок
+        edges = np.concatenate(([0], np.flatnonzero(np.diff(starts)) + 1))
+        units = np.diff(np.append(edges, len(keys)))
+        revenue = np.add.reduceat(prices, edges)
+
+        uniq, inverse = np.unique(book_ids, return_inverse=True)
+        costs = np.full(len(uniq), np.nan)
+        for i, book_id in enumerate(uniq.tolist()):
+            book = book_manager.find_book(book_id)
+            if book is not None:
+                costs[i] = book.cost_price
+        row_costs = costs[inverse]
+        profit = np.add.reduceat(np.where(np.isnan(row_costs), 0.0, prices - row_costs), edges)
+
+        # Найпопулярніша книга кроку: лічильники пар (крок, книга); при рівності - та,
+        # що трапилась раніше, як у Counter.most_common
+        tops = {}
+        has_book = book_ids != NO_BOOK
+        if has_book.any():
+            step = np.repeat(np.arange(len(edges)), units)
+            pairs = step[has_book] * len(uniq) + inverse[has_book]
+            pair_ids, first, counts = np.unique(pairs, return_index=True, return_counts=True)
+            pair_steps = pair_ids // len(uniq)
+            order = np.lexsort((first, -counts, pair_steps))
+            winners = order[np.concatenate(([True], np.diff(pair_steps[order]) != 0))]
+            tops = {int(pair_steps[i]): (int(uniq[pair_ids[i] % len(uniq)]), int(counts[i])) for i in winners}
+
+        return [series_row(int(starts[edge]), float(revenue[i]), float(profit[i]), int(units[i]), tops.get(i))
+                for i, edge in enumerate(edges.tolist())]
+
+    # ---------------------- Серіалізація ----------------------
+
+    def iter_dicts(self):
+        for i in range(len(self._keys)):
+            yield self._view(i).to_dict()
+        for s in self.invalid_sales:
+            yield s.to_dict()
+
+    def snapshot_dicts(self):
+        # Копії колонок для фонового збереження - кілька memcpy замість мільйонів об'єктів
+        copy = ColumnarSaleManager.__new__(ColumnarSaleManager)
+        copy._keys, copy._book_ids = self._keys[:], self._book_ids[:]
+        copy._employees, copy._prices = self._employees[:], self._prices[:]
+        copy._names = list(self._names)
+        copy.invalid_sales = list(self.invalid_sales)
+        return copy.iter_dicts()
+
+    def to_dict(self):
+        return list(self.iter_dicts())
@@ -0,0 +1,143 @@
+# Інструментування гарячих шляхів (вмикається явно, --instrument): обгортки над
+# методами менеджерів і load_data/save_data рахують виклики, гістограму часу
+# і кількість переглянутих рядків. Без увімкнення нічого не обгортається, тож
+# накладних витрат немає.
+# Окремо - запуск однієї дії меню під cProfile або tracemalloc із записом результатів у файл.
+import cProfile
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+BUCKETS = 25  # кошики гістограми: <1 мкс, [1, 2), [2, 4), ... мкс, останній - решта
+
+EMPLOYEE_METHODS = ("add_employee", "remove_employee", "find_employee", "set_employees")
+BOOK_METHODS = ("add_book", "remove_book", "update_book", "find_book", "find_book_by_title", "search_books",
+                "set_books")
+SALE_METHODS = ("add_sale", "add_sales", "remove_sale", "remove_sales", "set_sales", "sales_by_period",
+                "most_sold_book", "best_employee", "total_profit", "most_sold_author", "most_sold_genre",
+                "period_report", "approx_top", "sales_by_employee", "employee_leaderboard",
+                "time_series")
+FUNCTIONS = ("load_data", "save_data")
+
+
+class CallStats:
+    __slots__ = ("calls", "total", "max", "rows", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.histogram = [0] * BUCKETS
+
+    def record(self, elapsed, rows):
+        self.calls += 1
+        self.total += elapsed
+        self.rows += rows
+        if elapsed > self.max:
+            self.max = elapsed
+        self.histogram[min(int(elapsed * 1e6).bit_length(), BUCKETS - 1)] += 1
+
+    def percentile(self, q):
+        # Верхня межа кошика, в який потрапляє q-та частка викликів (секунди)
+        rank = q * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= rank:
+                return min((1 << bucket) / 1e6, self.max)
+        return self.max
+
+
+class Instrumentation:
+    def __init__(self):
+        self.stats = {}  # назва виклику -> CallStats
+
+    def wrap(self, name, fn, owner=None):
+        # Рядки беруться з лічильника owner.rows_scanned, якщо він є, інакше - довжина списку-результату
+        stats = self.stats.setdefault(name, CallStats())
+        counted = owner is not None and hasattr(owner, "rows_scanned")
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            before = owner.rows_scanned if counted else 0
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            if counted:
+                rows = owner.rows_scanned - before
+            else:
+                rows = len(result) if isinstance(result, list) else 0
+            stats.record(elapsed, rows)
+            return result
+        return wrapper
+
+    def instrument_managers(self, employee_mgr, book_mgr, sale_mgr):
+        # Обгортки ставляться на екземпляри, класи лишаються без змін
+        for mgr, methods in ((employee_mgr, EMPLOYEE_METHODS), (book_mgr, BOOK_METHODS), (sale_mgr, SALE_METHODS)):
+            prefix = type(mgr).__name__
+            for method in methods:
+                if hasattr(mgr, method):
+                    setattr(mgr, method, self.wrap(f"{prefix}.{method}", getattr(mgr, method), mgr))
+
+    @contextmanager
+    def instrument_functions(self, namespace, names=FUNCTIONS):
+        # namespace - globals() модуля, з якого ці функції викликаються; після виходу
+        # з блоку with повертаються оригінали (якщо обгортку тим часом ніхто не замінив)
+        originals = {name: namespace[name] for name in names}
+        wrappers = {name: self.wrap(name, fn) for name, fn in originals.items()}
+        namespace.update(wrappers)
+        try:
+            yield self
+        finally:
+            for name, fn in originals.items():
+                if namespace.get(name) is wrappers[name]:
+                    namespace[name] = fn
+
+    def reset(self):
+        for name in self.stats:
+            self.stats[name] = CallStats()
+
+    def print_stats(self):
+        used = [(name, s) for name, s in self.stats.items() if s.calls]
+        if not used:
+            print("Викликів ще не було.")
+            return
+        print(f"{'Виклик':<36}{'к-сть':>8}{'сума, с':>10}{'p50, мс':>10}{'p99, мс':>10}"
+              f"{'макс, мс':>10}{'рядків/виклик':>15}")
+        for name, s in sorted(used, key=lambda item: -item[1].total):
+            print(f"{name:<36}{s.calls:>8}{s.total:>10.3f}{s.percentile(0.5) * 1e3:>10.3f}"
+                  f"{s.percentile(0.99) * 1e3:>10.3f}{s.max * 1e3:>10.3f}{s.rows / s.calls:>15.1f}")
+
+
+# ---------------------- Профілювання дії ----------------------
+
+def _stamp():
+    return datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+def run_profiled(action, mode="cpu", top=15):
+    # mode="cpu" - cProfile (файл .prof для snakeviz/pstats), "mem" - tracemalloc (файл .snap)
+    if mode == "cpu":
+        profiler = cProfile.Profile()
+        profiler.runcall(action)
+        filename = f"profile-{_stamp()}.prof"
+        profiler.dump_stats(filename)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
+    else:
+        tracemalloc.start()
+        try:
+            action()
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        filename = f"tracemalloc-{_stamp()}.snap"
+        snapshot.dump(filename)
+        print(f"Пам'ять: зараз {current / 2 ** 20:.2f} МБ, пік {peak / 2 ** 20:.2f} МБ")
+        for stat in snapshot.statistics("lineno")[:top]:
+            print(stat)
+    print(f"Результати записано у {filename}")
@@ -0,0 +1,207 @@
+# Потокове читання і запис data.json без побудови всього словника в пам'яті.
+# Формат файлу той самий: {"employees": [...], "books": [...], "sales": [...]}
+# Файл може бути стиснений gzip або lzma: при читанні це визначається за вмістом,
+# запис іде в тимчасовий файл, який після fsync атомарно підміняє старий.
+import gzip
+import io
+import json
+import lzma
+import os
+import tempfile
+from contextlib import contextmanager
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+COMPRESSIONS = ("gzip", "lzma")
+_MAGIC = ((b"\x1f\x8b", "gzip"), (b"\xfd7zXZ\x00", "lzma"))
+_EXTENSIONS = {".gz": "gzip", ".xz": "lzma", ".lzma": "lzma"}
+GZIP_LEVEL = 6  # типовий 9 помітно повільніший при майже тому ж розмірі
+
+
+class _Reader:
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        more = self.f.read(self.chunk_size)
+        if not more:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + more
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("Неочікуваний кінець JSON-файлу")
+
+    def expect(self, chars):
+        ch = self.peek()
+        if ch not in chars:
+            raise ValueError(f"Некоректний JSON: очікувалось '{chars}', знайдено '{ch}'")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Число в кінці буфера може продовжуватись у наступному блоці
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_records(f, extras=None, chunk_size=1 << 16):
+    # Повертає пари (розділ, запис) для кожного елемента масивів верхнього рівня.
+    # Інші значення верхнього рівня складаються у словник extras, якщо його передано.
+    reader = _Reader(f, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if reader.peek() == "[":
+            reader.pos += 1
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield key, reader.value()
+                    if reader.expect(",]") == "]":
+                        break
+        else:
+            value = reader.value()
+            if extras is not None:
+                extras[key] = value
+        if reader.expect(",}") == "}":
+            return
+
+
+def write_records(f, sections, extras=None, indent=None, ensure_ascii=False):
+    # sections - пари (розділ, ітерабельні записи), записи серіалізуються по одному.
+    # Вихід збігається з json.dump(..., indent=indent) для того самого словника.
+    if indent is None:
+        sep, nl, pad, inner = ", ", "", "", ""
+    else:
+        sep, nl, pad, inner = ",", "\n", " " * indent, " " * indent * 2
+    f.write("{")
+    first_key = True
+    for key, records in sections:
+        f.write(("" if first_key else sep) + nl + pad + json.dumps(key, ensure_ascii=ensure_ascii) + ": [")
+        first_key = False
+        empty = True
+        for record in records:
+            text = json.dumps(record, ensure_ascii=ensure_ascii, indent=indent)
+            if indent is not None:
+                text = text.replace("\n", "\n" + inner)
+            f.write(("" if empty else sep) + nl + inner + text)
+            empty = False
+        f.write(("" if empty else nl + pad) + "]")
+    for key, value in (extras or {}).items():
+        text = json.dumps(value, ensure_ascii=ensure_ascii, indent=indent)
+        if indent is not None:
+            text = text.replace("\n", "\n" + pad)
+        f.write(("" if first_key else sep) + nl + pad + json.dumps(key, ensure_ascii=ensure_ascii) + ": " + text)
+        first_key = False
+    f.write(("" if first_key else nl) + "}")
+
+
+# ---------------------- Файли ----------------------
+
+def detect_compression(filename):
+    # "gzip", "lzma" або None - за першими байтами файлу, а не за розширенням
+    with open(filename, "rb") as f:
+        head = f.read(6)
+    for magic, name in _MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def compression_for(filename):
+    # Стиснення за розширенням (data.json.gz, data.json.xz) для запису
+    return _EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+
+
+def open_data(filename):
+    # Текстовий потік для читання, стиснений файл розпаковується на льоту
+    compression = detect_compression(filename)
+    if compression == "gzip":
+        return gzip.open(filename, "rt", encoding="utf-8")
+    if compression == "lzma":
+        return lzma.open(filename, "rt", encoding="utf-8")
+    return open(filename, "r", encoding="utf-8")
+
+
+def _fsync_dir(directory):
+    # Щоб перейменування пережило збій живлення; на Windows каталог так не відкрити
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(filename, compression=None, fsync=True):
+    # Текстовий потік у тимчасовий файл поруч; після успішного запису - fsync і
+    # os.replace, тож збій посеред запису лишає попередній файл цілим
+    if compression not in (None,) + COMPRESSIONS:
+        raise ValueError(f"Невідоме стиснення: {compression}")
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(filename) + ".", suffix=".tmp")
+    try:
+        with open(fd, "wb") as raw:
+            if compression == "gzip":
+                stream = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=GZIP_LEVEL)
+            elif compression == "lzma":
+                stream = lzma.LZMAFile(raw, "wb")
+            else:
+                stream = raw
+            text = io.TextIOWrapper(stream, encoding="utf-8")
+            yield text
+            # detach, а не close: файл ще потрібен відкритим для fsync
+            text.flush()
+            text.detach()
+            if stream is not raw:
+                stream.close()
+            raw.flush()
+            if fsync:
+                os.fsync(raw.fileno())
+        # mkstemp створює файл лише для власника - права беруться зі старого файлу
+        try:
+            mode = os.stat(filename).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tmp, mode)
+        os.replace(tmp, filename)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    if fsync:
+        _fsync_dir(directory)
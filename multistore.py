@@ -0,0 +1,218 @@
+# Звіти по мережі магазинів: кожен магазин має власний data.json (з журналом змін),
+# файли відкриваються як окремі частини і за потреби завантажуються паралельно в
+# процесах. Звіт рахується з часткових агрегатів кожного магазину (DayBucket за
+# період), які зливаються в підсумок мережі.
+#
+# id книг у магазинах незалежні, тож книги зводяться в спільний каталог мережі за
+# (назва, автор, рік) без урахування регістру; у звітах - id з цього каталогу.
+# Прибуток рахується за собівартістю кожного магазину окремо і потім додається.
+#
+#   python multistore.py kyiv.json lviv.json --start 2024-01-01 --end 2024-12-31 [--top-n 5] [--workers 4]
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import fsum
+
+from var2_2 import (Book, BookManager, DayBucket, EmployeeManager, Journal, SaleManager, create_sale_manager,
+                    journal_path, load_data)
+
+REPORTS = ("most_sold_book", "best_employee", "total_profit", "most_sold_author", "most_sold_genre")
+
+
+def book_key(book):
+    return book.title.strip().casefold(), book.author.strip().casefold(), book.year
+
+
+def _load_shard(filename, sales_backend="list"):
+    # Знімок плюс журнал; журнал лише читається, тож від менеджерів його відчіплюємо
+    managers = EmployeeManager(), BookManager(), create_sale_manager(sales_backend)
+    load_data(*managers, filename, journal=Journal(journal_path(filename)))
+    for mgr in managers:
+        mgr.journal = None
+    return managers
+
+
+def _store_names(filenames):
+    # Ім'я файлу без розширення, а якщо вони збігаються (shops/*/data.json) - шлях
+    names = [os.path.splitext(os.path.basename(f))[0] for f in filenames]
+    return names if len(set(names)) == len(names) else list(filenames)
+
+
+class Shard:
+    def __init__(self, name, employee_mgr, book_mgr, sale_mgr):
+        self.name = name
+        self.employee_mgr = employee_mgr
+        self.book_mgr = book_mgr
+        self.sale_mgr = sale_mgr
+        self.chain_ids = {}  # id книги в магазині -> id у каталозі мережі
+
+
+class ChainStore:
+    def __init__(self, shards):
+        self.shards = list(shards)
+        self.catalog = BookManager()
+        self._reconcile()
+
+    @classmethod
+    def open(cls, filenames, sales_backend=None, workers=1):
+        # Менеджери з процесів повертаються через pickle: колонкові масиви передаються
+        # майже даром, а мільйони об'єктів Sale - довше, ніж їх розбір з JSON.
+        # Тому без явного вибору паралельне завантаження бере колонкове сховище
+        parallel = workers > 1 and len(filenames) > 1
+        if sales_backend is None:
+            sales_backend = "columnar" if parallel else "list"
+        missing = [f for f in filenames if not os.path.exists(f)]
+        if missing:
+            raise FileNotFoundError(f"Немає файлів магазинів: {', '.join(missing)}")
+        backends = [sales_backend] * len(filenames)
+        if parallel:
+            # Розбір JSON - основна вартість завантаження, тож магазини читаються в окремих процесах
+            with ProcessPoolExecutor(min(workers, len(filenames))) as executor:
+                loaded = list(executor.map(_load_shard, filenames, backends))
+        else:
+            loaded = [_load_shard(f, b) for f, b in zip(filenames, backends)]
+        return cls(Shard(name, *managers) for name, managers in zip(_store_names(filenames), loaded))
+
+    def _reconcile(self):
+        # Перша зустрінута книга з ключем стає записом каталогу (жанр, ціни - з неї)
+        by_key = {}
+        books = []
+        for shard in self.shards:
+            shard.chain_ids = {}
+            for book in shard.book_mgr.books:
+                key = book_key(book)
+                chain_book = by_key.get(key)
+                if chain_book is None:
+                    chain_book = by_key[key] = Book.from_dict({**book.to_dict(), "id": len(books) + 1})
+                    books.append(chain_book)
+                shard.chain_ids[book.id] = chain_book.id
+        self.catalog.set_books(books)
+
+    def refresh(self):
+        # Після зміни книг у будь-якому магазині
+        self._reconcile()
+
+    @staticmethod
+    def _remapped(bucket, chain_ids):
+        # Агрегат з id каталогу мережі. Продажі видалених книг звести нема з чим -
+        # вони лишаються лише у виручці та лічильниках працівників
+        total = DayBucket()
+        total.employees = bucket.employees.copy()
+        total.revenue = bucket.revenue
+        for book_id, count in bucket.books.items():
+            chain_id = chain_ids.get(book_id)
+            if chain_id is not None:
+                total.books[chain_id] += count
+                total.book_revenue[chain_id] = total.book_revenue.get(chain_id, 0) + bucket.book_revenue[book_id]
+        return total
+
+    def _partials(self, start_date, end_date):
+        # [(магазин, агрегат у id мережі, прибуток)]; некоректні дати - None
+        if SaleManager._period_keys(start_date, end_date) is None:
+            return None
+        partials = []
+        for shard in self.shards:
+            bucket = shard.sale_mgr._period_totals(start_date, end_date)
+            partials.append((shard, self._remapped(bucket, shard.chain_ids), bucket.profit(shard.book_mgr)))
+        return partials
+
+    def _chain_report(self, total, profit, top_n):
+        report = SaleManager._report(total, self.catalog, top_n)
+        report["total_profit"] = profit
+        return report
+
+    def period_report(self, start_date, end_date, top_n=None):
+        # {"stores": {магазин: звіт}, "chain": звіт мережі}; формат звіту - як у SaleManager.period_report
+        partials = self._partials(start_date, end_date)
+        if partials is None:
+            return None
+        stores = {}
+        for shard, bucket, profit in partials:
+            stores[shard.name] = self._chain_report(bucket, profit, top_n)
+        chain = DayBucket.merged(bucket for _, bucket, _ in partials)
+        chain_profit = fsum(profit for _, _, profit in partials)
+        return {"stores": stores, "chain": self._chain_report(chain, chain_profit, top_n)}
+
+    def report(self, name, start_date, end_date, top_n=None):
+        # Один із REPORTS по магазинах і по мережі: {"stores": {магазин: значення}, "chain": значення}
+        if name not in REPORTS:
+            raise ValueError(f"Невідомий звіт: {name}")
+        full = self.period_report(start_date, end_date, top_n)
+        if full is None:
+            return None
+        return {"stores": {store: report[name] for store, report in full["stores"].items()},
+                "chain": full["chain"][name]}
+
+    def employee_leaderboard(self, start_date, end_date, top_n=None):
+        # Працівник, що працює в кількох магазинах, рахується в мережі один раз за сумою
+        stores = {}
+        chain = {}
+        for shard in self.shards:
+            board = shard.sale_mgr.employee_leaderboard(start_date, end_date)
+            stores[shard.name] = board if top_n is None else board[:top_n]
+            for employee, count in board:
+                chain[employee] = chain.get(employee, 0) + count
+        board = sorted(chain.items(), key=lambda item: (-item[1], item[0]))
+        return {"stores": stores, "chain": board if top_n is None else board[:top_n]}
+
+
+# ---------------------- Вивід ----------------------
+
+def _describe(value, catalog, kind):
+    # Пара (елемент, кількість) або список пар; книги показуються назвою з каталогу
+    if value is None:
+        return "-"
+    pairs = value if isinstance(value, list) else [value]
+    parts = []
+    for item, count in pairs:
+        if kind == "most_sold_book":
+            book = catalog.find_book(item)
+            item = f"[{item}] {book.title}" if book else f"[{item}]"
+        parts.append(f"{item} ({count})")
+    return ", ".join(parts) or "-"
+
+
+def print_chain_report(result, catalog):
+    titles = {
+        "total_profit": "Прибуток",
+        "most_sold_book": "Книга",
+        "best_employee": "Працівник",
+        "most_sold_author": "Автор",
+        "most_sold_genre": "Жанр",
+    }
+    sections = list(result["stores"].items()) + [("Уся мережа", result["chain"])]
+    for name, report in sections:
+        print(f"\n== {name} ==")
+        for key, title in titles.items():
+            value = report[key]
+            text = f"{value:.2f}$" if key == "total_profit" else _describe(value, catalog, key)
+            print(f"  {title + ':':<12}{text}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Звіти по мережі магазинів")
+    parser.add_argument("files", nargs="+", help="data.json кожного магазину")
+    parser.add_argument("--start", required=True, help="початок періоду, YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="кінець періоду включно, YYYY-MM-DD")
+    parser.add_argument("--top-n", type=int, help="списки з N лідерів замість одного")
+    parser.add_argument("--workers", type=int, default=1, help="процесів для завантаження магазинів")
+    parser.add_argument("--sales-backend", choices=["list", "columnar"],
+                        help="сховище продажів (типово list, з --workers - columnar)")
+    parser.add_argument("--json", metavar="FILE", help="записати звіт у JSON")
+    args = parser.parse_args()
+
+    try:
+        chain = ChainStore.open(args.files, args.sales_backend, args.workers)
+    except FileNotFoundError as e:
+        raise SystemExit(str(e))
+    print(f"Магазинів: {len(chain.shards)}, книг у каталозі мережі: {len(chain.catalog.books)}")
+    result = chain.period_report(args.start, args.end, args.top_n)
+    if result is None:
+        raise SystemExit(1)
+    print_chain_report(result, chain.catalog)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\nЗвіт записано у {args.json}")
@@ -0,0 +1,131 @@
+# Паралельні звіти для довгих періодів: період ділиться на місяці, кожен місяць
+# рахується в окремому процесі (часткові Counter і виручка), результати зливаються
+# у хронологічному порядку, тож збігаються з однопроцесними до рівності лідерів.
+# Короткі періоди (менше threshold продажів) рахуються в поточному процесі.
+# Пул процесів один на весь час роботи і зупиняється в close().
+#
+# Має сенс там, де звіт - це прохід по продажах: знімок у mmap. Списковий
+# SaleManager зливає денні агрегати за O(днів), колонковий рахує векторно,
+# SQLite - запитом, тож для них звіти завжди виконуються в поточному процесі.
+import multiprocessing
+import os
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+from snapshot_bin import MappedSaleManager
+from var2_2 import DayBucket, SaleManager, month_partitions
+
+DEFAULT_THRESHOLD = 200_000
+
+_MANAGER = None  # менеджер продажів, успадкований робочими процесами через fork
+
+
+def _init_worker(sale_mgr):
+    global _MANAGER
+    _MANAGER = sale_mgr
+
+
+def _count_range(lo, hi, removed):
+    # Видалені після запуску пулу записи передаються явно: копія менеджера в процесі застаріла
+    snapshot = _MANAGER.snapshot
+    return DayBucket.from_sales(snapshot.sale(i) for i in range(lo, hi) if i not in removed)
+
+
+def _count_rows(sales):
+    return DayBucket.from_sales(sales)
+
+
+class ParallelReports:
+    def __init__(self, sale_mgr, workers=None, threshold=DEFAULT_THRESHOLD):
+        self.sale_mgr = sale_mgr
+        self.workers = workers or os.cpu_count() or 1
+        self.threshold = threshold
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            if "fork" in multiprocessing.get_all_start_methods():
+                # Дочірні процеси бачать знімок без копіювання - передаються лише межі
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("fork"),
+                    initializer=_init_worker, initargs=(self.sale_mgr,))
+            else:
+                self._executor = ProcessPoolExecutor(self.workers)
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _supported(self):
+        return isinstance(self.sale_mgr, MappedSaleManager)
+
+    def _bounds(self, start_date, end_date):
+        mgr = self.sale_mgr
+        keys = mgr._period_keys(start_date, end_date)
+        if keys is None:
+            return None
+        lo = bisect_left(mgr._keys, keys[0], 0, mgr._visible)
+        return lo, bisect_right(mgr._keys, keys[1], lo, mgr._visible)
+
+    def _period_totals(self, start_date, end_date):
+        mgr = self.sale_mgr
+        bounds = self._bounds(start_date, end_date)
+        if bounds is None:
+            return DayBucket()
+        lo, hi = bounds
+        ranges, parts = [], []
+        if lo < hi:
+            for first, last in month_partitions(mgr._keys[lo], mgr._keys[hi - 1]):
+                part_lo = bisect_left(mgr._keys, first, lo, hi)
+                part_hi = bisect_right(mgr._keys, last, part_lo, hi)
+                if part_lo < part_hi:
+                    ranges.append((part_lo, part_hi))
+
+        if ranges and "fork" in multiprocessing.get_all_start_methods():
+            removed = [frozenset(i for i in mgr._removed if a <= i < b) for a, b in ranges]
+            parts += self._pool().map(_count_range, *zip(*ranges), removed)
+        elif ranges:
+            parts += self._pool().map(_count_rows, (mgr._rows(a, b) for a, b in ranges))
+        # Продажі, додані поверх знімка, лежать у пам'яті - їх мало
+        parts.append(mgr._added._period_totals(start_date, end_date))
+        return DayBucket.merged(parts)
+
+    def _use_pool(self, start_date, end_date):
+        if not self._supported() or self.workers < 2:
+            return False
+        bounds = self._bounds(start_date, end_date)
+        return bounds is not None and bounds[1] - bounds[0] >= self.threshold
+
+    def period_report(self, start_date, end_date, book_manager, top_n=None):
+        if not self._use_pool(start_date, end_date):
+            return self.sale_mgr.period_report(start_date, end_date, book_manager, top_n)
+        return SaleManager._report(self._period_totals(start_date, end_date), book_manager, top_n)
+
+    def most_sold_book(self, start_date, end_date, top_n=None):
+        if not self._use_pool(start_date, end_date):
+            return self.sale_mgr.most_sold_book(start_date, end_date, top_n)
+        return SaleManager._top(self._period_totals(start_date, end_date).books, top_n)
+
+    def best_employee(self, start_date, end_date, top_n=None):
+        if not self._use_pool(start_date, end_date):
+            return self.sale_mgr.best_employee(start_date, end_date, top_n)
+        return SaleManager._top(self._period_totals(start_date, end_date).employees, top_n)
+
+    def total_profit(self, start_date, end_date, book_manager):
+        if not self._use_pool(start_date, end_date):
+            return self.sale_mgr.total_profit(start_date, end_date, book_manager)
+        return self._period_totals(start_date, end_date).profit(book_manager)
+
+    def most_sold_author(self, start_date, end_date, book_manager, top_n=None):
+        if not self._use_pool(start_date, end_date):
+            return self.sale_mgr.most_sold_author(start_date, end_date, book_manager, top_n)
+        books = self._period_totals(start_date, end_date).books
+        return SaleManager._top(SaleManager._grouped(books, book_manager, "author"), top_n)
+
+    def most_sold_genre(self, start_date, end_date, book_manager, top_n=None):
+        if not self._use_pool(start_date, end_date):
+            return self.sale_mgr.most_sold_genre(start_date, end_date, book_manager, top_n)
+        books = self._period_totals(start_date, end_date).books
+        return SaleManager._top(SaleManager._grouped(books, book_manager, "genre"), top_n)
@@ -0,0 +1,114 @@
+# LRU-кеш звітів за період перед методами звітів менеджера продажів.
+# Ключ - (звіт, початкова дата, кінцева дата, top_n). Запис скидається лише тоді,
+# коли змінився продаж з датою всередині його періоду, або коли в книги, проданої
+# за цей період, змінились собівартість, автор чи жанр (або її додали/видалили).
+from bisect import bisect_left
+from collections import OrderedDict
+
+from var2_2 import date_key
+
+DEFAULT_MAXSIZE = 128
+
+# Звіти, що залежать від даних книг, а не лише від продажів
+BOOK_REPORTS = ("period_report", "total_profit", "most_sold_author", "most_sold_genre")
+
+
+class ReportCache:
+    def __init__(self, sale_mgr, reports=None, maxsize=DEFAULT_MAXSIZE):
+        self.sale_mgr = sale_mgr
+        self.reports = reports if reports is not None else sale_mgr  # або ParallelReports
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # ключ -> (ординал початку, ординал кінця, результат)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def attach(self, book_mgr):
+        # Менеджери повідомляють кеш про зміни так само, як журнал
+        self.sale_mgr.report_cache = self
+        book_mgr.report_cache = self
+
+    def _cached(self, name, start_date, end_date, compute, top_n=None):
+        key = (name, start_date, end_date, top_n)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+        self.misses += 1
+        value = compute()
+        start, end = date_key(start_date), date_key(end_date)
+        # Некоректний період не кешується: повідомлення про формат має з'являтись щоразу
+        if start is not None and end is not None and self.maxsize > 0:
+            self._entries[key] = (start, end, value)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    # ---------------------- Скидання ----------------------
+
+    def _drop(self, keys):
+        for key in keys:
+            del self._entries[key]
+        self.invalidations += len(keys)
+
+    def sales_changed(self, day_keys):
+        days = sorted({day for day in day_keys if day is not None})
+        if not days:
+            return
+        stale = []
+        for key, (start, end, _) in self._entries.items():
+            i = bisect_left(days, start)
+            if i < len(days) and days[i] <= end:
+                stale.append(key)
+        self._drop(stale)
+
+    def book_changed(self, book_id):
+        self._drop([key for key in self._entries
+                    if key[0] in BOOK_REPORTS and self.sale_mgr.sells_book(book_id, key[1], key[2])])
+
+    def clear(self):
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def close(self):
+        # Зупинити процеси звітів, якщо кеш стоїть перед ParallelReports
+        if hasattr(self.reports, "close"):
+            self.reports.close()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "maxsize": self.maxsize
+        }
+
+    # ---------------------- Звіти ----------------------
+
+    def period_report(self, start_date, end_date, book_manager, top_n=None):
+        return self._cached("period_report", start_date, end_date,
+                            lambda: self.reports.period_report(start_date, end_date, book_manager, top_n), top_n)
+
+    def most_sold_book(self, start_date, end_date, top_n=None):
+        return self._cached("most_sold_book", start_date, end_date,
+                            lambda: self.reports.most_sold_book(start_date, end_date, top_n), top_n)
+
+    def best_employee(self, start_date, end_date, top_n=None):
+        return self._cached("best_employee", start_date, end_date,
+                            lambda: self.reports.best_employee(start_date, end_date, top_n), top_n)
+
+    def total_profit(self, start_date, end_date, book_manager):
+        return self._cached("total_profit", start_date, end_date,
+                            lambda: self.reports.total_profit(start_date, end_date, book_manager))
+
+    def most_sold_author(self, start_date, end_date, book_manager, top_n=None):
+        return self._cached("most_sold_author", start_date, end_date,
+                            lambda: self.reports.most_sold_author(start_date, end_date, book_manager, top_n), top_n)
+
+    def most_sold_genre(self, start_date, end_date, book_manager, top_n=None):
+        return self._cached("most_sold_genre", start_date, end_date,
+                            lambda: self.reports.most_sold_genre(start_date, end_date, book_manager, top_n), top_n)
@@ -0,0 +1,476 @@
+# HTTP/JSON-сервіс над менеджерами для кількох кас одночасно (лише стандартна бібліотека).
+# Дані завантажуються один раз; читання виконуються одразу в циклі подій, а всі зміни
+# проходять через чергу до єдиного завдання-записувача, тож журнал і індекси
+# змінюються строго по черзі.
+#
+#   python server.py [--host 127.0.0.1] [--port 8080] [--backend json|binary|sqlite] [--data data.json]
+#
+#   GET    /employees[?limit=&offset=]   POST /employees      DELETE /employees/<ПІБ>
+#   GET    /employees/<ПІБ>/sales?start=&end=                 GET /leaderboard?start=&end=[&top_n=]
+#   GET    /books[?author=][&genre=][&limit=&offset=]         POST /books
+#   GET    /books?q=<слова>[&limit=10]   (пошук за назвою, автором і жанром)
+#   GET    /books/<id>                   PATCH /books/<id>    DELETE /books/<id>
+#   GET    /sales[?start=][&end=][&employee=][&book_id=][&limit=&offset=]
+#   POST   /sales (об'єкт або список)
+#   DELETE /sales?book_id=&date=         DELETE /sales?[book_id=][&employee=][&start=][&end=]
+#   GET    /reports?start=&end=[&top_n=] GET /reports/<звіт>?start=&end=[&top_n=]
+#   GET    /reports/series?start=&end=[&granularity=day|week|month]
+#   GET    /top/<book|employee|author|genre>?start=&end=[&top_n=10][&approx=1]
+#   GET    /stats
+import asyncio
+import json
+import re
+import signal
+from http import HTTPStatus
+from itertools import chain, islice
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from book_search import DEFAULT_LIMIT
+from bulk_import import book_from_row, employee_from_row, parse_float, parse_year, required
+from var2_2 import GRANULARITIES, Sale, Store, create_reports, date_key
+
+MAX_BODY = 16 * 1024 * 1024
+NAMED_REPORTS = ("most_sold_book", "best_employee", "total_profit", "most_sold_author", "most_sold_genre")
+BOOK_REPORTS = ("total_profit", "most_sold_author", "most_sold_genre")
+TOP_REPORTS = {"book": "most_sold_book", "employee": "best_employee",
+               "author": "most_sold_author", "genre": "most_sold_genre"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"Некоректне значення {name}: {value!r}")
+
+
+def _object(body):
+    if not isinstance(body, dict):
+        raise HTTPError(400, "Тіло запиту має бути JSON-об'єктом.")
+    return body
+
+
+def _top_n(query, default=None):
+    if "top_n" not in query:
+        return default
+    top_n = _int(query["top_n"], "top_n")
+    if top_n < 1:
+        raise HTTPError(400, "top_n має бути не менше 1.")
+    return top_n
+
+
+def _page(query, items):
+    # Сторінка лінивого переліку: offset пропускається, далі не більше limit елементів
+    offset = _int(query.get("offset", 0), "offset")
+    limit = _int(query["limit"], "limit") if "limit" in query else None
+    if offset < 0 or (limit is not None and limit < 0):
+        raise HTTPError(400, "limit і offset не можуть бути від'ємними.")
+    return [item.to_dict() for item in islice(items, offset, None if limit is None else offset + limit)]
+
+
+def _period(query):
+    start, end = query.get("start"), query.get("end")
+    if date_key(start) is None or date_key(end) is None:
+        raise HTTPError(400, "Невірний формат дати! Використовуйте YYYY-MM-DD.")
+    return start, end
+
+
+class BookstoreService:
+    def __init__(self, store, workers=1, report_cache=128):
+        self.store = store
+        self.employee_mgr, self.book_mgr, self.sale_mgr = store.managers()
+        self.reports = create_reports(self.sale_mgr, self.book_mgr, workers, report_cache)
+        self.requests = 0
+        self._writes = asyncio.Queue()
+        self._routes = [
+            ("GET", r"/employees", self.list_employees),
+            ("POST", r"/employees", self.add_employee),
+            ("DELETE", r"/employees/(?P<name>[^/]+)", self.remove_employee),
+            ("GET", r"/employees/(?P<name>[^/]+)/sales", self.employee_sales),
+            ("GET", r"/leaderboard", self.leaderboard),
+            ("GET", r"/books", self.list_books),
+            ("POST", r"/books", self.add_book),
+            ("GET", r"/books/(?P<book_id>\d+)", self.get_book),
+            ("PATCH", r"/books/(?P<book_id>\d+)", self.update_book),
+            ("DELETE", r"/books/(?P<book_id>\d+)", self.remove_book),
+            ("GET", r"/sales", self.list_sales),
+            ("POST", r"/sales", self.add_sales),
+            ("DELETE", r"/sales", self.remove_sale),
+            ("GET", r"/reports", self.period_report),
+            ("GET", r"/reports/series", self.time_series),
+            ("GET", r"/reports/(?P<name>\w+)", self.named_report),
+            ("GET", r"/top/(?P<kind>\w+)", self.top),
+            ("GET", r"/stats", self.stats),
+        ]
+        self._routes = [(method, re.compile(pattern + "$"), handler) for method, pattern, handler in self._routes]
+
+    # ---------------------- Записувач ----------------------
+
+    async def write(self, change):
+        # change - функція без аргументів; виконується записувачем, результат повертається сюди
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((change, future))
+        return await future
+
+    async def writer(self):
+        while True:
+            change, future = await self._writes.get()
+            try:
+                with self.store.changing():
+                    result = change()
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+            finally:
+                # Між змінами стан узгоджений - тут можна почати фонове збереження
+                self.store.autosave()
+                self._writes.task_done()
+
+    async def drain(self):
+        await self._writes.join()
+
+    # ---------------------- Працівники ----------------------
+
+    async def list_employees(self, query, body):
+        return _page(query, self.employee_mgr.iter_employees())
+
+    async def add_employee(self, query, body):
+        employee = employee_from_row(_object(body))
+        await self.write(lambda: self.employee_mgr.add_employee(employee))
+        return 201, employee.to_dict()
+
+    async def remove_employee(self, query, body, name):
+        name = unquote(name)
+
+        def change():
+            if self.employee_mgr.find_employee(name) is None:
+                raise HTTPError(404, f"Працівник '{name}' не знайдений.")
+            self.employee_mgr.remove_employee(name)
+        await self.write(change)
+        return {"removed": name}
+
+    async def employee_sales(self, query, body, name):
+        employee = self.employee_mgr.find_employee(unquote(name))
+        if employee is None:
+            raise HTTPError(404, f"Працівник '{unquote(name)}' не знайдений.")
+        sales = self.sale_mgr.sales_by_employee(employee.full_name, *_period(query))
+        return [s.to_dict() for s in sales]
+
+    async def leaderboard(self, query, body):
+        board = self.sale_mgr.employee_leaderboard(*_period(query), _top_n(query))
+        return [{"employee": name, "sales": count} for name, count in board]
+
+    # ---------------------- Книги ----------------------
+
+    async def list_books(self, query, body):
+        if "q" in query:
+            limit = _int(query.get("limit", DEFAULT_LIMIT), "limit")
+            return [b.to_dict() for b in self.book_mgr.search_books(query["q"], max(limit, 0))]
+        return _page(query, self.book_mgr.iter_books(query.get("author"), query.get("genre")))
+
+    async def get_book(self, query, body, book_id):
+        book = self.book_mgr.find_book(int(book_id))
+        if book is None:
+            raise HTTPError(404, f"Книга з ID {book_id} не знайдена.")
+        return book.to_dict()
+
+    async def add_book(self, query, body):
+        def change():
+            book = book_from_row(_object(body), self.book_mgr)
+            self.book_mgr.add_book(book)
+            return book
+        book = await self.write(change)
+        return 201, book.to_dict()
+
+    async def update_book(self, query, body, book_id):
+        changes = {}
+        for field, value in _object(body).items():
+            if field == "year":
+                value = parse_year(value)
+            elif field in ("cost_price", "sale_price"):
+                value = parse_float(value)
+            changes[field] = value
+
+        def change():
+            if not self.book_mgr.update_book(int(book_id), **changes):
+                raise HTTPError(404, f"Книга з ID {book_id} не знайдена.")
+            return self.book_mgr.find_book(int(book_id))
+        return (await self.write(change)).to_dict()
+
+    async def remove_book(self, query, body, book_id):
+        def change():
+            if not self.book_mgr.remove_book(int(book_id)):
+                raise HTTPError(404, f"Книга з ID {book_id} не знайдена.")
+        await self.write(change)
+        return {"removed": int(book_id)}
+
+    # ---------------------- Продажі ----------------------
+
+    async def list_sales(self, query, body):
+        start, end = query.get("start"), query.get("end")
+        for value in (start, end):
+            if value is not None and date_key(value) is None:
+                raise HTTPError(400, "Невірний формат дати! Використовуйте YYYY-MM-DD.")
+        employee = query.get("employee")
+        book_id = _int(query["book_id"], "book_id") if "book_id" in query else None
+        sales = self.sale_mgr.iter_sales(start, end, employee, book_id)
+        if start is None and end is None:
+            # Як і раніше, без періоду в кінці йдуть продажі з некоректною датою
+            sales = chain(sales, self.sale_mgr.iter_invalid_sales(employee, book_id))
+        return _page(query, sales)
+
+    def _sale(self, row):
+        # Перевірки як у меню: працівник і книга існують, дата коректна
+        if not isinstance(row, dict):
+            raise ValueError("продаж має бути об'єктом")
+        name = str(required(row, "employee_name"))
+        employee = self.employee_mgr.find_employee(name)
+        if employee is None:
+            raise ValueError(f"працівник '{name}' не знайдений")
+        book_id = _int(required(row, "book_id"), "book_id")
+        if self.book_mgr.find_book(book_id) is None:
+            raise ValueError(f"книга з ID {book_id} не знайдена")
+        sale = Sale(employee.full_name, book_id, required(row, "sale_date"), parse_float(required(row, "real_price")))
+        if sale.date_key is None:
+            raise ValueError(f"невірний формат дати (YYYY-MM-DD): {sale.sale_date!r}")
+        return sale
+
+    async def add_sales(self, query, body):
+        rows = body if isinstance(body, list) else [body]
+
+        def change():
+            # Усі продажі запиту приймаються разом або жоден
+            sales = []
+            for i, row in enumerate(rows):
+                try:
+                    sales.append(self._sale(row))
+                except ValueError as e:
+                    raise HTTPError(400, f"продаж {i}: {e}")
+            if len(sales) == 1:
+                self.sale_mgr.add_sale(sales[0])
+            else:
+                self.sale_mgr.add_sales(sales)
+            return sales
+        sales = await self.write(change)
+        return 201, {"added": len(sales)}
+
+    async def remove_sale(self, query, body):
+        if "date" not in query:
+            return await self.remove_sales(query)
+        book_id = _int(query.get("book_id"), "book_id")
+        sale_date = query.get("date", "")
+
+        def change():
+            removed = self.sale_mgr.remove_sale(book_id, sale_date)
+            if not removed:
+                raise HTTPError(404, f"Продаж книги {book_id} за {sale_date} не знайдено.")
+            return removed
+        removed = await self.write(change)
+        return {"removed": {"book_id": book_id, "sale_date": sale_date, "count": removed}}
+
+    async def remove_sales(self, query):
+        # Пакетне видалення: book_id, employee, start, end (межі включно) - будь-які з них
+        filters = {
+            "book_id": _int(query["book_id"], "book_id") if "book_id" in query else None,
+            "employee_name": query.get("employee"),
+            "start_date": query.get("start"),
+            "end_date": query.get("end"),
+        }
+        if all(value is None for value in filters.values()):
+            raise HTTPError(400, "Потрібна хоча б одна умова: book_id, employee, start або end.")
+        for name in ("start_date", "end_date"):
+            if filters[name] is not None and date_key(filters[name]) is None:
+                raise HTTPError(400, "Невірний формат дати! Використовуйте YYYY-MM-DD.")
+        removed = await self.write(lambda: self.sale_mgr.remove_sales(**filters))
+        return {"removed": removed}
+
+    # ---------------------- Звіти ----------------------
+
+    async def period_report(self, query, body):
+        start, end = _period(query)
+        return self.reports.period_report(start, end, self.book_mgr, _top_n(query))
+
+    async def named_report(self, query, body, name):
+        if name not in NAMED_REPORTS:
+            raise HTTPError(404, f"Невідомий звіт: {name}")
+        start, end = _period(query)
+        method = getattr(self.reports, name)
+        if name == "total_profit":
+            return {name: method(start, end, self.book_mgr)}
+        if name in BOOK_REPORTS:
+            return {name: method(start, end, self.book_mgr, _top_n(query))}
+        return {name: method(start, end, _top_n(query))}
+
+    async def time_series(self, query, body):
+        # Динаміка: granularity=day|week|month (типово month)
+        granularity = query.get("granularity", "month")
+        if granularity not in GRANULARITIES:
+            raise HTTPError(400, f"Невідомий крок динаміки: {granularity}")
+        return self.sale_mgr.time_series(*_period(query), self.book_mgr, granularity)
+
+    async def top(self, query, body, kind):
+        # Рейтинг top_n; approx=1 - з місячних підсумків, з похибкою кожної оцінки
+        if kind not in TOP_REPORTS:
+            raise HTTPError(404, f"Невідомий рейтинг: {kind}")
+        start, end = _period(query)
+        top_n = _top_n(query, 10)
+        if query.get("approx") in ("1", "true"):
+            # Місячні підсумки живуть у менеджері продажів (SQLite їх не має)
+            if not hasattr(self.sale_mgr, "approx_top"):
+                raise HTTPError(400, "Наближений режим недоступний для цього сховища.")
+            ranked = self.sale_mgr.approx_top(kind, start, end, self.book_mgr, top_n)
+            return {"approx": True, "top": [{"item": item, "count": count, "error": error}
+                                             for item, count, error in ranked]}
+        method = getattr(self.reports, TOP_REPORTS[kind])
+        if kind in ("author", "genre"):
+            ranked = method(start, end, self.book_mgr, top_n)
+        else:
+            ranked = method(start, end, top_n)
+        return {"approx": False, "top": [{"item": item, "count": count, "error": 0} for item, count in ranked]}
+
+    async def stats(self, query, body):
+        stats = {"requests": self.requests, "pending_writes": self._writes.qsize()}
+        if hasattr(self.reports, "stats"):
+            stats["report_cache"] = self.reports.stats()
+        return stats
+
+    # ---------------------- HTTP ----------------------
+
+    async def dispatch(self, method, target, body):
+        parts = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        path = parts.path.rstrip("/") or "/"
+        allowed = False
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            try:
+                result = await handler(query, body, **match.groupdict())
+            except ValueError as e:
+                raise HTTPError(400, str(e))
+            return result if isinstance(result, tuple) else (200, result)
+        if allowed:
+            raise HTTPError(405, f"Метод {method} не підтримується для {path}")
+        raise HTTPError(404, f"Невідомий шлях: {path}")
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers, raw = request
+                self.requests += 1
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and (version == "HTTP/1.1" or headers.get("connection", "").lower() == "keep-alive"))
+                try:
+                    body = json.loads(raw) if raw else {}
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": e.message}
+                except ValueError:
+                    status, payload = 400, {"error": "Тіло запиту не є коректним JSON."}
+                except Exception as e:
+                    status, payload = 500, {"error": f"Внутрішня помилка: {e}"}
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HTTPError as e:
+            writer.write(_response(e.status, {"error": e.message}, False))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Некоректний рядок запиту.")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = _int(headers.get("content-length", 0), "Content-Length")
+    if length > MAX_BODY:
+        raise HTTPError(413, "Завеликий запит.")
+    raw = await reader.readexactly(length) if length else b""
+    return method.upper(), target, version, headers, raw
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def serve(store, host="127.0.0.1", port=8080, workers=1, report_cache=128):
+    service = BookstoreService(store, workers, report_cache)
+    writer_task = asyncio.create_task(service.writer())
+    server = await asyncio.start_server(service.handle, host, port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    print(f"Сервіс працює на http://{host}:{port}")
+    async with server:
+        await stop.wait()
+    # Спочатку дописуємо зміни з черги, потім закриваємо сховище
+    await service.drain()
+    writer_task.cancel()
+    if hasattr(service.reports, "close"):
+        service.reports.close()
+    store.close()
+    print("Дані збережено. Сервіс зупинено.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="HTTP-сервіс книжкового магазину")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--backend", choices=["json", "binary", "sqlite"], default="json")
+    parser.add_argument("--sales-backend", choices=["list", "columnar"], default="list")
+    parser.add_argument("--data", default="data.json", help="файл знімка даних (JSON або двійковий)")
+    parser.add_argument("--db", default="bookstore.db", help="файл бази SQLite")
+    parser.add_argument("--no-journal", action="store_true", help="без журналу змін: зберігати весь файл при зупинці")
+    parser.add_argument("--workers", type=int, default=1, help="процесів для звітів за довгі періоди")
+    parser.add_argument("--report-cache", type=int, default=128, metavar="N", help="розмір кешу звітів")
+    parser.add_argument("--autosave-changes", type=int, default=0, metavar="N",
+                        help="зберігати знімок у фоні кожні N змін (сховище json)")
+    parser.add_argument("--autosave-seconds", type=float, default=0, metavar="S",
+                        help="зберігати знімок у фоні, якщо з останнього минуло S секунд і були зміни")
+    parser.add_argument("--compress", choices=["gzip", "lzma"], help="стискати знімок data.json")
+    args = parser.parse_args()
+    store = Store(args.backend, args.sales_backend, args.data, args.db, not args.no_journal,
+                  autosave_changes=args.autosave_changes, autosave_seconds=args.autosave_seconds,
+                  compress=args.compress)
+    asyncio.run(serve(store, args.host, args.port, args.workers, args.report_cache))
@@ -0,0 +1,110 @@
+# Space-Saving (Metwally та ін.) для наближених рейтингів за довгі періоди.
+# Підсумок тримає не більше capacity лічильників: елемент -> [кількість, похибка].
+# Кількість - оцінка згори, кількість - похибка - гарантована нижня межа. Якщо
+# підсумок заповнений, будь-який відсутній елемент зустрічався не частіше за
+# найменший лічильник. Підсумки об'єднуються (місяці -> роки) з тими самими гарантіями.
+from heapq import heapify, heappop, heappush
+
+DEFAULT_CAPACITY = 1000
+
+
+class SpaceSaving:
+    __slots__ = ("capacity", "counters", "total", "_floor", "_heap")
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        # capacity=None - точний підсумок без витіснення
+        self.capacity = capacity
+        self.counters = {}  # елемент -> [оцінка кількості, похибка]
+        self.total = 0
+        self._floor = 0     # межа для відсутніх елементів, успадкована при об'єднанні
+        self._heap = None   # (оцінка, id лічильника, елемент); застарілі записи пропускаються
+
+    @classmethod
+    def from_counts(cls, counts, capacity=DEFAULT_CAPACITY):
+        summary = cls(capacity)
+        for item, count in counts.items():
+            summary.add(item, count)
+        return summary
+
+    def _full(self):
+        return self.capacity is not None and len(self.counters) >= self.capacity
+
+    @property
+    def floor(self):
+        # Найбільша можлива кількість елемента, якого немає в підсумку
+        if not self._full() or not self.counters:
+            return self._floor
+        return max(self._floor, self._min()[1])
+
+    def _min(self):
+        # Лічильники тільки зростають, тож запис у купі застарів, якщо оцінка вже більша
+        heap = self._heap
+        if heap is None:
+            heap = self._heap = [(c[0], id(c), item) for item, c in self.counters.items()]
+            heapify(heap)
+        while True:
+            count, _, item = heap[0]
+            counter = self.counters.get(item)
+            if counter is not None and counter[0] == count:
+                return item, count
+            heappop(heap)
+            if counter is not None:
+                heappush(heap, (counter[0], id(counter), item))
+
+    def add(self, item, weight=1):
+        self.total += weight
+        counter = self.counters.get(item)
+        if counter is not None:
+            counter[0] += weight
+            return
+        if self._full():
+            # Витісняємо найменший лічильник: новий елемент успадковує його кількість як похибку
+            victim, floor = self._min()
+            del self.counters[victim]
+            heappop(self._heap)
+            counter = [floor + weight, floor]
+        else:
+            counter = [weight, 0]
+        self.counters[item] = counter
+        if self._heap is not None:
+            heappush(self._heap, (counter[0], id(counter), item))
+
+    @classmethod
+    def merged(cls, parts, capacity=DEFAULT_CAPACITY):
+        summary = cls(capacity)
+        for part in parts:
+            summary = summary._merge(part)
+        return summary
+
+    def _merge(self, other):
+        # Елемент, відсутній в одному з підсумків, міг зустрітись там до floor цього
+        # підсумку разів: ця межа додається і до оцінки, і до похибки. Потім лишаються
+        # capacity найбільших лічильників, а найбільший відкинутий стає межею для відсутніх.
+        result = type(self)(self.capacity)
+        own_floor, other_floor = self.floor, other.floor
+        counters = result.counters
+        for item, (count, error) in self.counters.items():
+            counter = other.counters.get(item)
+            if counter is None:
+                counters[item] = [count + other_floor, error + other_floor]
+            else:
+                counters[item] = [count + counter[0], error + counter[1]]
+        for item, (count, error) in other.counters.items():
+            if item not in counters:
+                counters[item] = [count + own_floor, error + own_floor]
+        result.total = self.total + other.total
+        result._floor = own_floor + other_floor
+        if self.capacity is not None and len(counters) > self.capacity:
+            ranked = sorted(counters.items(), key=lambda pair: -pair[1][0])
+            result._floor = max(result._floor, ranked[self.capacity][1][0])
+            result.counters = dict(ranked[:self.capacity])
+        return result
+
+    def top(self, n=10):
+        # [(елемент, оцінка, похибка)]: справжня кількість у [оцінка - похибка, оцінка];
+        # при рівних оцінках вище той, у кого менша похибка
+        ranked = sorted(self.counters.items(), key=lambda pair: (-pair[1][0], pair[1][1]))[:n]
+        return [(item, count, error) for item, (count, error) in ranked]
+
+    def __len__(self):
+        return len(self.counters)
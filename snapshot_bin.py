@@ -0,0 +1,390 @@
+# Двійковий знімок даних: таблиця рядків (імена, назви, автори, жанри) і
+# записи фіксованої ширини. Таблиця продажів відкривається через mmap, тож при
+# запуску читається лише заголовок, а запит за період торкається лише потрібних сторінок.
+#
+#   python snapshot_bin.py to-bin data.json data.bin
+#   python snapshot_bin.py to-json data.bin data.json
+import heapq
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from var2_2 import (Book, BookManager, DayBucket, Employee, EmployeeManager, Sale, SaleManager,
+                    date_key, load_data, save_data)
+
+MAGIC = b"BKSNAP\x00\x01"
+VERSION = 1
+# magic, версія, резерв, journal_seq, потім (кількість, зсув) для рядків,
+# працівників, книг, продажів і продажів з некоректною датою
+HEADER = struct.Struct("<8sIIQ10Q")
+EMPLOYEE = struct.Struct("<4I")        # ПІБ, посада, телефон, email
+BOOK = struct.Struct("<qIiIIdd")       # id, назва, рік, автор, жанр, собівартість, ціна
+SALE = struct.Struct("<iIqd")          # ординал дати, продавець, id книги, ціна
+INVALID_SALE = struct.Struct("<IqId")  # продавець, id книги, рядок дати, ціна
+OFFSET = struct.Struct("<Q")
+SALE_KEY = struct.Struct("<i")         # перше поле SALE
+
+NO_STRING = 0xFFFFFFFF
+NO_BOOK = -1
+
+
+# ---------------------- Запис ----------------------
+
+class _Strings:
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def __call__(self, value):
+        if value is None:
+            return NO_STRING
+        value = str(value)
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return sid
+
+
+def write_snapshot(filename, employee_mgr, book_mgr, sale_mgr, journal_seq=0):
+    strings = _Strings()
+    counts = {}
+    offsets = {}
+    tmp = filename + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+
+        offsets["employees"] = f.tell()
+        counts["employees"] = 0
+        for e in employee_mgr.employees:
+            f.write(EMPLOYEE.pack(strings(e.full_name), strings(e.position), strings(e.phone), strings(e.email)))
+            counts["employees"] += 1
+
+        offsets["books"] = f.tell()
+        counts["books"] = 0
+        for b in book_mgr.books:
+            f.write(BOOK.pack(b.id, strings(b.title), b.year, strings(b.author), strings(b.genre),
+                              b.cost_price, b.sale_price))
+            counts["books"] += 1
+
+        # Продажі вже відсортовані за датою в усіх менеджерах
+        offsets["sales"] = f.tell()
+        counts["sales"] = 0
+        for s in sale_mgr.sales:
+            f.write(SALE.pack(s.date_key, strings(s.employee_name),
+                              NO_BOOK if s.book_id is None else s.book_id, s.real_price))
+            counts["sales"] += 1
+
+        offsets["invalid"] = f.tell()
+        counts["invalid"] = 0
+        for s in sale_mgr.invalid_sales:
+            f.write(INVALID_SALE.pack(strings(s.employee_name), NO_BOOK if s.book_id is None else s.book_id,
+                                      strings(s.sale_date), s.real_price))
+            counts["invalid"] += 1
+
+        # Таблиця рядків: n+1 зсувів, далі всі рядки підряд у UTF-8
+        offsets["strings"] = f.tell()
+        counts["strings"] = len(strings.values)
+        encoded = [v.encode("utf-8") for v in strings.values]
+        position = 0
+        for data in encoded:
+            f.write(OFFSET.pack(position))
+            position += len(data)
+        f.write(OFFSET.pack(position))
+        for data in encoded:
+            f.write(data)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, 0, journal_seq,
+                            counts["strings"], offsets["strings"],
+                            counts["employees"], offsets["employees"],
+                            counts["books"], offsets["books"],
+                            counts["sales"], offsets["sales"],
+                            counts["invalid"], offsets["invalid"]))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filename)
+
+
+# ---------------------- Читання ----------------------
+
+class Snapshot:
+    def __init__(self, filename):
+        self._file = open(filename, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.journal_seq,
+         self.n_strings, self._strings_at,
+         self.n_employees, self._employees_at,
+         self.n_books, self._books_at,
+         self.n_sales, self._sales_at,
+         self.n_invalid, self._invalid_at) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{filename}: не є знімком книжкового магазину")
+        self._blob_at = self._strings_at + OFFSET.size * (self.n_strings + 1)
+        self._cache = {}
+
+    def string(self, sid):
+        if sid == NO_STRING:
+            return None
+        value = self._cache.get(sid)
+        if value is None:
+            at = self._strings_at + OFFSET.size * sid
+            start, = OFFSET.unpack_from(self._mm, at)
+            end, = OFFSET.unpack_from(self._mm, at + OFFSET.size)
+            value = self._cache[sid] = self._mm[self._blob_at + start:self._blob_at + end].decode("utf-8")
+        return value
+
+    def employees(self):
+        string = self.string
+        return [Employee(*map(string, EMPLOYEE.unpack_from(self._mm, self._employees_at + i * EMPLOYEE.size)))
+                for i in range(self.n_employees)]
+
+    def books(self):
+        books = []
+        for i in range(self.n_books):
+            book_id, title, year, author, genre, cost, price = BOOK.unpack_from(self._mm, self._books_at + i * BOOK.size)
+            # Без конструктора, щоб не зсувати лічильник id
+            book = Book.__new__(Book)
+            book.id, book.year, book.cost_price, book.sale_price = book_id, year, cost, price
+            book.title, book.author, book.genre = self.string(title), self.string(author), self.string(genre)
+            books.append(book)
+        return books
+
+    def sale_key(self, i):
+        return SALE_KEY.unpack_from(self._mm, self._sales_at + i * SALE.size)[0]
+
+    def sale(self, i):
+        key, employee, book_id, price = SALE.unpack_from(self._mm, self._sales_at + i * SALE.size)
+        sale = Sale.__new__(Sale)
+        sale.employee_name = self.string(employee)
+        sale.book_id = None if book_id == NO_BOOK else book_id
+        sale.date_key = key
+        sale.sale_date = date.fromordinal(key).isoformat()
+        sale.real_price = price
+        return sale
+
+    def invalid_sales(self):
+        sales = []
+        for i in range(self.n_invalid):
+            employee, book_id, sale_date, price = INVALID_SALE.unpack_from(
+                self._mm, self._invalid_at + i * INVALID_SALE.size)
+            sales.append(Sale(self.string(employee), None if book_id == NO_BOOK else book_id,
+                              self.string(sale_date), price))
+        return sales
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+class _SaleKeys:
+    # Ординали дат просто з mmap - для bisect без читання всієї таблиці
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __len__(self):
+        return self.snapshot.n_sales
+
+    def __getitem__(self, i):
+        return self.snapshot.sale_key(i)
+
+
+class MappedSaleManager(SaleManager):
+    # Продажі зі знімка читаються з mmap на вимогу; нові продажі лежать у
+    # звичайному SaleManager поверх знімка, видалені записи знімка позначаються
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self._keys = _SaleKeys(snapshot)
+        self._visible = snapshot.n_sales  # 0 після set_sales: знімок більше не видно
+        self._removed = set()
+        self._removed_invalid = set()
+        self._added = SaleManager()
+        self.journal = None
+        self.report_cache = None
+        self._month_tops = {}
+        self.rows_scanned = 0
+
+    def _rows(self, lo, hi):
+        return self._mapped(lo, hi)
+
+    def _mapped(self, lo, hi):
+        return [self.snapshot.sale(i) for i in range(lo, hi) if i not in self._removed]
+
+    @property
+    def sales(self):
+        return list(heapq.merge(self._mapped(0, self._visible), self._added.sales, key=lambda s: s.date_key))
+
+    @property
+    def invalid_sales(self):
+        mapped = [] if not self._visible else [
+            s for i, s in enumerate(self.snapshot.invalid_sales()) if i not in self._removed_invalid]
+        return mapped + self._added.invalid_sales
+
+    def add_sale(self, sale):
+        if self.journal is not None:
+            self.journal.append("add_sale", sale.to_dict())
+        self._added.add_sale(sale)
+        self._changed([sale.date_key])
+
+    def add_sales(self, sales):
+        sales = list(sales)
+        if self.journal is not None:
+            self.journal.append("add_sales", [s.to_dict() for s in sales])
+        self._added.add_sales(sales)
+        self._changed(s.date_key for s in sales)
+
+    def set_sales(self, sales):
+        self._visible = 0
+        self._removed = set()
+        self._added.set_sales(sales)
+        self._reset()
+
+    def remove_sale(self, book_id, sale_date):
+        if self.journal is not None:
+            self.journal.append("remove_sale", {"book_id": book_id, "sale_date": sale_date})
+        key = date_key(sale_date)
+        removed = 0
+        if key is None:
+            if self._visible:
+                for i, s in enumerate(self.snapshot.invalid_sales()):
+                    if i not in self._removed_invalid and s.book_id == book_id and s.sale_date == sale_date:
+                        self._removed_invalid.add(i)
+                        removed += 1
+        else:
+            lo = bisect_left(self._keys, key, 0, self._visible)
+            hi = bisect_right(self._keys, key, lo, self._visible)
+            for i in range(lo, hi):
+                if i not in self._removed and self.snapshot.sale(i).book_id == book_id:
+                    self._removed.add(i)
+                    removed += 1
+        removed += self._added.remove_sale(book_id, sale_date)
+        self._changed([key])
+        return removed
+
+    def remove_sales(self, book_id=None, employee_name=None, start_date=None, end_date=None):
+        if book_id is None and employee_name is None and start_date is None and end_date is None:
+            raise ValueError("Потрібна хоча б одна умова видалення продажів.")
+        if self.journal is not None:
+            self.journal.append("remove_sales", {"book_id": book_id, "employee_name": employee_name,
+                                                 "start_date": start_date, "end_date": end_date})
+        keys = self._open_period_keys(start_date, end_date)
+        if keys is None:
+            return 0
+
+        def match(s):
+            return ((book_id is None or s.book_id == book_id)
+                    and (employee_name is None or s.employee_name == employee_name))
+        removed = 0
+        if self._visible and start_date is None and end_date is None:
+            for i, s in enumerate(self.snapshot.invalid_sales()):
+                if i not in self._removed_invalid and match(s):
+                    self._removed_invalid.add(i)
+                    removed += 1
+        lo = bisect_left(self._keys, keys[0], 0, self._visible)
+        hi = bisect_right(self._keys, keys[1], lo, self._visible)
+        self.rows_scanned += hi - lo
+        days = set()
+        for i in range(lo, hi):
+            if i not in self._removed:
+                s = self.snapshot.sale(i)
+                if match(s):
+                    self._removed.add(i)
+                    days.add(s.date_key)
+                    removed += 1
+        # Продажі поверх знімка (їх мало): дні для кешу звітів, потім видалення
+        days.update(s.date_key for s in self._added.sales if keys[0] <= s.date_key <= keys[1] and match(s))
+        removed += self._added.remove_sales(book_id, employee_name, start_date, end_date)
+        self._changed(days)
+        return removed
+
+    def iter_sales(self, start_date=None, end_date=None, employee_name=None, book_id=None):
+        # Сторінки знімка читаються з mmap по мірі перегляду
+        keys = self._open_period_keys(start_date, end_date)
+        if keys is None:
+            return
+        lo = bisect_left(self._keys, keys[0], 0, self._visible)
+        hi = bisect_right(self._keys, keys[1], lo, self._visible)
+        mapped = (s for s in (self.snapshot.sale(i) for i in range(lo, hi) if i not in self._removed)
+                  if (employee_name is None or s.employee_name == employee_name)
+                  and (book_id is None or s.book_id == book_id))
+        yield from heapq.merge(mapped, self._added.iter_sales(start_date, end_date, employee_name, book_id),
+                               key=lambda s: s.date_key)
+
+    def sells_book(self, book_id, start_date, end_date):
+        return any(s.book_id == book_id for s in self.sales_by_period(start_date, end_date))
+
+    def sales_by_employee(self, employee_name, start_date, end_date):
+        # Індексу працівників для знімка немає - фільтруємо сторінки періоду
+        return [s for s in self.sales_by_period(start_date, end_date) if s.employee_name == employee_name]
+
+    def employee_leaderboard(self, start_date, end_date, top_n=None):
+        employees = self._period_totals(start_date, end_date).employees
+        board = sorted(employees.items(), key=lambda item: (-item[1], item[0]))
+        return board if top_n is None else board[:top_n]
+
+    def _period_totals(self, start_date, end_date):
+        # Денних агрегатів для знімка немає - рахуємо лише по сторінках періоду,
+        # по днях, щоб суми збігались зі списковим SaleManager
+        return DayBucket.merged(bucket for _, bucket in self._bucket_days(self.sales_by_period(start_date, end_date)))
+
+    def _day_buckets(self, first_key, last_key):
+        return self._bucket_days(self.sales_by_period(date.fromordinal(first_key).isoformat(),
+                                                      date.fromordinal(last_key).isoformat()))
+
+    def sales_by_period(self, start_date, end_date):
+        start = date_key(start_date)
+        end = date_key(end_date)
+        if start is None or end is None:
+            print("Невірний формат дати! Використовуйте YYYY-MM-DD.")
+            return []
+        lo = bisect_left(self._keys, start, 0, self._visible)
+        hi = bisect_right(self._keys, end, lo, self._visible)
+        self.rows_scanned += hi - lo
+        return list(heapq.merge(self._mapped(lo, hi), self._added.sales_by_period(start_date, end_date),
+                                key=lambda s: s.date_key))
+
+
+def load_snapshot(filename, journal=None):
+    # Працівники й книги читаються одразу (їх мало), продажі - лише заголовок
+    snapshot = Snapshot(filename)
+    employee_mgr = EmployeeManager()
+    book_mgr = BookManager()
+    employee_mgr.set_employees(snapshot.employees())
+    book_mgr.set_books(snapshot.books())
+    for b in book_mgr.books:
+        if b.id >= Book._id_counter:
+            Book._id_counter = b.id + 1
+    sale_mgr = MappedSaleManager(snapshot)
+    if journal is not None:
+        journal.replay(employee_mgr, book_mgr, sale_mgr, after_seq=snapshot.journal_seq)
+        journal.attach(employee_mgr, book_mgr, sale_mgr)
+    return employee_mgr, book_mgr, sale_mgr
+
+
+# ---------------------- Конвертація ----------------------
+
+def json_to_bin(json_file, bin_file):
+    employee_mgr, book_mgr, sale_mgr = EmployeeManager(), BookManager(), SaleManager()
+    load_data(employee_mgr, book_mgr, sale_mgr, json_file)
+    write_snapshot(bin_file, employee_mgr, book_mgr, sale_mgr)
+
+
+def bin_to_json(bin_file, json_file, indent=4):
+    employee_mgr, book_mgr, sale_mgr = load_snapshot(bin_file)
+    save_data(employee_mgr, book_mgr, sale_mgr, json_file, indent=indent)
+    sale_mgr.snapshot.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("to-bin", "to-json"):
+        print("Використання: python snapshot_bin.py to-bin|to-json ВХІДНИЙ ВИХІДНИЙ")
+        sys.exit(1)
+    if sys.argv[1] == "to-bin":
+        json_to_bin(sys.argv[2], sys.argv[3])
+    else:
+        bin_to_json(sys.argv[2], sys.argv[3])
+    print(f"{sys.argv[2]} -> {sys.argv[3]}")
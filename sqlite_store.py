@@ -0,0 +1,557 @@
+# Сховище на SQLite: ті самі менеджери, але дані лежать у базі, а звіти -
+# окремі SQL-запити з JOIN і GROUP BY замість списків у пам'яті.
+import sqlite3
+from datetime import date
+from itertools import chain
+
+from book_search import DEFAULT_LIMIT, book_score, ranked, search_words
+from var2_2 import Book, Employee, Sale, date_key, series_row, show_pages
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    full_name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    position TEXT,
+    phone TEXT,
+    email TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_employees_name_key ON employees(name_key);
+
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    title TEXT,
+    year INTEGER,
+    author TEXT,
+    genre TEXT,
+    cost_price REAL,
+    sale_price REAL
+);
+CREATE INDEX IF NOT EXISTS idx_books_title ON books(title);
+CREATE INDEX IF NOT EXISTS idx_books_author ON books(author);
+CREATE INDEX IF NOT EXISTS idx_books_genre ON books(genre);
+
+CREATE TABLE IF NOT EXISTS sales (
+    id INTEGER PRIMARY KEY,
+    employee_name TEXT,
+    book_id INTEGER,
+    sale_date TEXT NOT NULL,
+    date_key INTEGER NOT NULL,
+    real_price REAL
+);
+CREATE INDEX IF NOT EXISTS idx_sales_sale_date ON sales(sale_date);
+CREATE INDEX IF NOT EXISTS idx_sales_book_id ON sales(book_id);
+CREATE INDEX IF NOT EXISTS idx_sales_employee_date ON sales(employee_name, sale_date);
+
+CREATE TABLE IF NOT EXISTS invalid_sales (
+    id INTEGER PRIMARY KEY,
+    employee_name TEXT,
+    book_id INTEGER,
+    sale_date TEXT,
+    real_price REAL
+);
+"""
+
+# Порядок першої появи продажу: дата, потім порядок додавання.
+# Потрібен, щоб при рівній кількості переможець збігався з Counter.most_common
+FIRST_SEEN = "MIN(s.date_key * 4294967296 + s.id)"
+
+
+# Перший день кроку динаміки з sale_date (YYYY-MM-DD); тиждень починається з понеділка
+SERIES_BUCKETS = {
+    "day": "sale_date",
+    "week": "date(sale_date, 'weekday 0', '-6 days')",
+    "month": "strftime('%Y-%m-01', sale_date)",
+}
+
+
+def connect(filename="bookstore.db"):
+    conn = sqlite3.connect(filename)
+    conn.executescript(SCHEMA)
+    # lower() у SQLite змінює лише ASCII, а пошуку книг потрібна і кирилиця
+    conn.create_function("casefold", 1, lambda text: text.casefold() if isinstance(text, str) else text,
+                         deterministic=True)
+    # Бази, де name_key рахувався через lower(), переводяться на casefold, як у EmployeeManager
+    with conn:
+        conn.execute("UPDATE employees SET name_key = casefold(full_name) WHERE name_key != casefold(full_name)")
+    return conn
+
+
+def _iso(date_str):
+    # Коректна дата -> (YYYY-MM-DD, ординал), щоб рядкове порівняння в SQL було правильним
+    key = date_key(date_str)
+    if key is None:
+        return None, None
+    return date.fromordinal(key).isoformat(), key
+
+
+# ---------------------- Менеджери ----------------------
+
+class SqliteEmployeeManager:
+    def __init__(self, conn):
+        self.conn = conn
+        self.journal = None
+
+    @staticmethod
+    def _row(row):
+        return Employee(*row)
+
+    @property
+    def employees(self):
+        rows = self.conn.execute("SELECT full_name, position, phone, email FROM employees ORDER BY id")
+        return [self._row(r) for r in rows]
+
+    def add_employee(self, emp: Employee):
+        with self.conn:
+            self._insert(emp)
+
+    def _insert(self, emp):
+        self.conn.execute(
+            "INSERT INTO employees (full_name, name_key, position, phone, email) VALUES (?, ?, ?, ?, ?)",
+            (emp.full_name, emp.full_name.casefold(), emp.position, emp.phone, emp.email)
+        )
+
+    def remove_employee(self, full_name):
+        with self.conn:
+            self.conn.execute("DELETE FROM employees WHERE name_key = ? AND full_name = ?",
+                              (full_name.casefold(), full_name))
+
+    def iter_employees(self):
+        # Курсор SQLite читає рядки по мірі перегляду
+        rows = self.conn.execute("SELECT full_name, position, phone, email FROM employees ORDER BY id")
+        return (self._row(r) for r in rows)
+
+    def list_employees(self, page_size=None):
+        show_pages(self.iter_employees(), page_size, "Список працівників порожній.")
+
+    def find_employee(self, full_name):
+        row = self.conn.execute(
+            "SELECT full_name, position, phone, email FROM employees WHERE name_key = ? ORDER BY id LIMIT 1",
+            (full_name.casefold(),)
+        ).fetchone()
+        return self._row(row) if row else None
+
+    def iter_dicts(self):
+        for e in self.employees:
+            yield e.to_dict()
+
+    def to_dict(self):
+        return list(self.iter_dicts())
+
+    def set_employees(self, employees):
+        with self.conn:
+            self.conn.execute("DELETE FROM employees")
+            for emp in employees:
+                self._insert(emp)
+
+    def from_dict(self, data):
+        self.set_employees(Employee.from_dict(d) for d in data)
+
+
+class SqliteBookManager:
+    COLUMNS = "id, title, year, author, genre, cost_price, sale_price"
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.journal = None
+        self.report_cache = None
+        self._sync_id_counter()
+
+    def _sync_id_counter(self, cls=Book):
+        max_id = self.conn.execute("SELECT MAX(id) FROM books").fetchone()[0]
+        if max_id is not None and max_id >= cls._id_counter:
+            cls._id_counter = max_id + 1
+
+    @staticmethod
+    def _row(row):
+        # Без конструктора, щоб не зсувати лічильник id
+        book = Book.__new__(Book)
+        book.id, book.title, book.year, book.author, book.genre, book.cost_price, book.sale_price = row
+        return book
+
+    @property
+    def books(self):
+        return [self._row(r) for r in self.conn.execute(f"SELECT {self.COLUMNS} FROM books ORDER BY id")]
+
+    def add_book(self, book: Book):
+        # Лічильник id у пам'яті може відставати від бази (її змінив інший процес) -
+        # тоді id видає SQLite (наступний після найбільшого) і він записується в книгу
+        with self.conn:
+            try:
+                self._insert(book, "INSERT")
+            except sqlite3.IntegrityError:
+                book.id = self.conn.execute(
+                    "INSERT INTO books (title, year, author, genre, cost_price, sale_price) VALUES (?, ?, ?, ?, ?, ?)",
+                    (book.title, book.year, book.author, book.genre, book.cost_price, book.sale_price)
+                ).lastrowid
+        self._sync_id_counter(type(book))
+        if self.report_cache is not None:
+            self.report_cache.book_changed(book.id)
+
+    def _insert(self, book, verb="INSERT OR IGNORE"):
+        # Для імпорту як у BookManager: при повторному id лишається перша книга
+        self.conn.execute(
+            f"{verb} INTO books ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (book.id, book.title, book.year, book.author, book.genre, book.cost_price, book.sale_price)
+        )
+
+    def remove_book(self, book_id):
+        with self.conn:
+            removed = self.conn.execute("DELETE FROM books WHERE id = ?", (book_id,)).rowcount > 0
+        if removed and self.report_cache is not None:
+            self.report_cache.book_changed(book_id)
+        return removed
+
+    def update_book(self, book_id, **changes):
+        Book.check_changes(changes)
+        if not changes:
+            return self.find_book(book_id) is not None
+        # Назви стовпців беруться лише з Book.EDITABLE
+        assignments = ", ".join(f"{field} = ?" for field in changes)
+        with self.conn:
+            updated = self.conn.execute(f"UPDATE books SET {assignments} WHERE id = ?",
+                                        (*changes.values(), book_id)).rowcount > 0
+        if updated and self.report_cache is not None and set(changes) & set(Book.REPORT_FIELDS):
+            self.report_cache.book_changed(book_id)
+        return updated
+
+    def iter_books(self, author=None, genre=None):
+        where, params = [], []
+        for column, value in (("author", author), ("genre", genre)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(where)}" if where else ""
+        rows = self.conn.execute(f"SELECT {self.COLUMNS} FROM books {where} ORDER BY id", params)
+        return (self._row(r) for r in rows)
+
+    def list_books(self, page_size=None, author=None, genre=None):
+        empty = "Список книг порожній." if author is None and genre is None else "Книг не знайдено."
+        show_pages(self.iter_books(author, genre), page_size, empty)
+
+    def find_book(self, book_id):
+        row = self.conn.execute(f"SELECT {self.COLUMNS} FROM books WHERE id = ?", (book_id,)).fetchone()
+        return self._row(row) if row else None
+
+    def find_book_by_title(self, title):
+        row = self.conn.execute(
+            f"SELECT {self.COLUMNS} FROM books WHERE title = ? ORDER BY rowid LIMIT 1", (title,)
+        ).fetchone()
+        return self._row(row) if row else None
+
+    def search_books(self, query, limit=DEFAULT_LIMIT):
+        # Індексу в пам'яті тут немає: SQL відсіює книги, де якогось слова запиту немає
+        # в жодному полі, решта ранжується так само, як у BookManager
+        tokens = list(dict.fromkeys(search_words(query)))
+        if not tokens:
+            return []
+        where = " AND ".join(["instr(casefold(title || ' ' || author || ' ' || genre), ?) > 0"] * len(tokens))
+        rows = self.conn.execute(f"SELECT {self.COLUMNS} FROM books WHERE {where}", tokens)
+        scored = ((book, book_score(tokens, book)) for book in map(self._row, rows))
+        return ranked(((book, score) for book, score in scored if score), limit)
+
+    def iter_dicts(self):
+        for b in self.books:
+            yield b.to_dict()
+
+    def to_dict(self):
+        return list(self.iter_dicts())
+
+    def set_books(self, books):
+        with self.conn:
+            self.conn.execute("DELETE FROM books")
+            for book in books:
+                self._insert(book)
+        self._sync_id_counter()
+        if self.report_cache is not None:
+            self.report_cache.clear()
+
+    def from_dict(self, data):
+        self.set_books(Book.from_dict(d) for d in data)
+
+
+class SqliteSaleManager:
+    def __init__(self, conn):
+        self.conn = conn
+        self.journal = None
+        self.report_cache = None
+
+    @staticmethod
+    def _row(row):
+        sale = Sale.__new__(Sale)
+        sale.employee_name, sale.book_id, sale.sale_date, sale.date_key, sale.real_price = row
+        return sale
+
+    def _select(self, where="", params=()):
+        rows = self.conn.execute(
+            "SELECT employee_name, book_id, sale_date, date_key, real_price FROM sales "
+            f"{where} ORDER BY date_key, id", params
+        )
+        return [self._row(r) for r in rows]
+
+    @property
+    def sales(self):
+        return self._select()
+
+    @property
+    def invalid_sales(self):
+        rows = self.conn.execute(
+            "SELECT employee_name, book_id, sale_date, real_price FROM invalid_sales ORDER BY id"
+        )
+        return [Sale(*r) for r in rows]
+
+    def _insert(self, sale):
+        # Повертає ординал дати; продаж з некоректною датою відкладається (None)
+        sale_date, key = _iso(sale.sale_date)
+        if key is None:
+            self.conn.execute(
+                "INSERT INTO invalid_sales (employee_name, book_id, sale_date, real_price) VALUES (?, ?, ?, ?)",
+                (sale.employee_name, sale.book_id, sale.sale_date, sale.real_price)
+            )
+        else:
+            self.conn.execute(
+                "INSERT INTO sales (employee_name, book_id, sale_date, date_key, real_price) VALUES (?, ?, ?, ?, ?)",
+                (sale.employee_name, sale.book_id, sale_date, key, sale.real_price)
+            )
+        return key
+
+    def add_sale(self, sale):
+        with self.conn:
+            key = self._insert(sale)
+        if key is None:
+            print(f"Продаж {sale.book_id} має некоректну дату: {sale.sale_date}")
+        if self.report_cache is not None:
+            self.report_cache.sales_changed([key])
+
+    def add_sales(self, sales):
+        with self.conn:
+            keys = [self._insert(sale) for sale in sales]
+        self._report_invalid(keys.count(None))
+        if self.report_cache is not None:
+            self.report_cache.sales_changed(keys)
+
+    def set_sales(self, sales):
+        with self.conn:
+            self.conn.execute("DELETE FROM sales")
+            self.conn.execute("DELETE FROM invalid_sales")
+            keys = [self._insert(sale) for sale in sales]
+        self._report_invalid(keys.count(None))
+        if self.report_cache is not None:
+            self.report_cache.clear()
+
+    @staticmethod
+    def _report_invalid(count):
+        if count:
+            print(f"Відкладено продажів з некоректною датою: {count}")
+
+    def remove_sale(self, book_id, sale_date):
+        sale_iso, key = _iso(sale_date)
+        with self.conn:
+            # IS, а не =: book_id None має знайти продажі без книги, як у SaleManager
+            if key is None:
+                removed = self.conn.execute("DELETE FROM invalid_sales WHERE book_id IS ? AND sale_date = ?",
+                                            (book_id, sale_date)).rowcount
+            else:
+                removed = self.conn.execute("DELETE FROM sales WHERE book_id IS ? AND sale_date = ?",
+                                            (book_id, sale_iso)).rowcount
+        if key is not None and removed and self.report_cache is not None:
+            self.report_cache.sales_changed([key])
+        return removed
+
+    def remove_sales(self, book_id=None, employee_name=None, start_date=None, end_date=None):
+        # Один DELETE з умовами; межі періоду включно, будь-яку можна пропустити
+        if book_id is None and employee_name is None and start_date is None and end_date is None:
+            raise ValueError("Потрібна хоча б одна умова видалення продажів.")
+        where, params = [], []
+        if book_id is not None:
+            where.append("book_id = ?")
+            params.append(book_id)
+        if employee_name is not None:
+            where.append("employee_name = ?")
+            params.append(employee_name)
+        invalid_where = " AND ".join(where)
+        for bound, op in ((start_date, ">="), (end_date, "<=")):
+            if bound is not None:
+                iso, _ = _iso(bound)
+                if iso is None:
+                    print("Невірний формат дати! Використовуйте YYYY-MM-DD.")
+                    return 0
+                where.append(f"sale_date {op} ?")
+                params.append(iso)
+        where = " AND ".join(where)
+        with self.conn:
+            keys = [row[0] for row in self.conn.execute(f"SELECT DISTINCT date_key FROM sales WHERE {where}", params)]
+            removed = self.conn.execute(f"DELETE FROM sales WHERE {where}", params).rowcount
+            if start_date is None and end_date is None:
+                removed += self.conn.execute(f"DELETE FROM invalid_sales WHERE {invalid_where}", params).rowcount
+        if keys and self.report_cache is not None:
+            self.report_cache.sales_changed(keys)
+        return removed
+
+    def iter_sales(self, start_date=None, end_date=None, employee_name=None, book_id=None):
+        where, params = [], []
+        for column, op, value in (("sale_date", ">=", start_date), ("sale_date", "<=", end_date)):
+            if value is not None:
+                iso, _ = _iso(value)
+                if iso is None:
+                    print("Невірний формат дати! Використовуйте YYYY-MM-DD.")
+                    return iter(())
+                where.append(f"{column} {op} ?")
+                params.append(iso)
+        for column, value in (("employee_name", employee_name), ("book_id", book_id)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(where)}" if where else ""
+        rows = self.conn.execute(
+            f"SELECT employee_name, book_id, sale_date, date_key, real_price FROM sales {where} ORDER BY date_key, id",
+            params
+        )
+        return (self._row(r) for r in rows)
+
+    def iter_invalid_sales(self, employee_name=None, book_id=None):
+        return (s for s in self.invalid_sales
+                if (employee_name is None or s.employee_name == employee_name)
+                and (book_id is None or s.book_id == book_id))
+
+    def list_sales(self, page_size=None, start_date=None, end_date=None, employee_name=None, book_id=None):
+        sales = self.iter_sales(start_date, end_date, employee_name, book_id)
+        if start_date is None and end_date is None:
+            invalid = (f"{s} (некоректна дата)" for s in self.iter_invalid_sales(employee_name, book_id))
+            sales = chain(sales, invalid)
+        filtered = any(f is not None for f in (start_date, end_date, employee_name, book_id))
+        show_pages(sales, page_size, "Продажів не знайдено." if filtered else "Список продажів порожній.")
+
+    # ---------------------- Звіти ----------------------
+
+    @staticmethod
+    def _period(start_date, end_date):
+        start, _ = _iso(start_date)
+        end, _ = _iso(end_date)
+        if start is None or end is None:
+            print("Невірний формат дати! Використовуйте YYYY-MM-DD.")
+            return None
+        return start, end
+
+    def sales_by_period(self, start_date, end_date):
+        period = self._period(start_date, end_date)
+        if period is None:
+            return []
+        return self._select("WHERE sale_date BETWEEN ? AND ?", period)
+
+    def sells_book(self, book_id, start_date, end_date):
+        period = self._period(start_date, end_date)
+        return period is not None and self.conn.execute(
+            "SELECT 1 FROM sales WHERE book_id = ? AND sale_date BETWEEN ? AND ? LIMIT 1", (book_id, *period)
+        ).fetchone() is not None
+
+    def sales_by_employee(self, employee_name, start_date, end_date):
+        period = self._period(start_date, end_date)
+        if period is None:
+            return []
+        return self._select("WHERE employee_name = ? AND sale_date BETWEEN ? AND ?", (employee_name, *period))
+
+    def employee_leaderboard(self, start_date, end_date, top_n=None):
+        period = self._period(start_date, end_date)
+        if period is None:
+            return []
+        return self.conn.execute(
+            "SELECT employee_name, COUNT(*) AS cnt FROM sales WHERE sale_date BETWEEN ? AND ? "
+            "GROUP BY employee_name ORDER BY cnt DESC, employee_name LIMIT ?",
+            (*period, -1 if top_n is None else top_n)
+        ).fetchall()
+
+    def _ranked(self, column, period, top_n, join=False):
+        joined = "JOIN books b ON b.id = s.book_id" if join else ""
+        not_null = "" if join or column == "s.employee_name" else f"AND {column} IS NOT NULL"
+        rows = self.conn.execute(
+            f"SELECT {column}, COUNT(*) AS cnt FROM sales s {joined} "
+            f"WHERE s.sale_date BETWEEN ? AND ? {not_null} "
+            f"GROUP BY {column} ORDER BY cnt DESC, {FIRST_SEEN} LIMIT ?",
+            (*period, 1 if top_n is None else top_n)
+        ).fetchall()
+        if top_n is None:
+            return rows[0] if rows else None
+        return rows
+
+    def _profit(self, period):
+        profit = self.conn.execute(
+            "SELECT SUM(s.real_price - b.cost_price) FROM sales s JOIN books b ON b.id = s.book_id "
+            "WHERE s.sale_date BETWEEN ? AND ?", period
+        ).fetchone()[0]
+        return profit or 0
+
+    def most_sold_book(self, start_date, end_date, top_n=None):
+        period = self._period(start_date, end_date)
+        return self._ranked("s.book_id", period, top_n) if period else self._empty(top_n)
+
+    def best_employee(self, start_date, end_date, top_n=None):
+        period = self._period(start_date, end_date)
+        return self._ranked("s.employee_name", period, top_n) if period else self._empty(top_n)
+
+    def total_profit(self, start_date, end_date, book_manager=None):
+        period = self._period(start_date, end_date)
+        return self._profit(period) if period else 0
+
+    def most_sold_author(self, start_date, end_date, book_manager=None, top_n=None):
+        period = self._period(start_date, end_date)
+        return self._ranked("b.author", period, top_n, join=True) if period else self._empty(top_n)
+
+    def most_sold_genre(self, start_date, end_date, book_manager=None, top_n=None):
+        period = self._period(start_date, end_date)
+        return self._ranked("b.genre", period, top_n, join=True) if period else self._empty(top_n)
+
+    def time_series(self, start_date, end_date, book_manager=None, granularity="month"):
+        if granularity not in SERIES_BUCKETS:
+            raise ValueError(f"Невідомий крок динаміки: {granularity}")
+        period = self._period(start_date, end_date)
+        if period is None:
+            return []
+        rows = self.conn.execute(
+            f"WITH p AS (SELECT {SERIES_BUCKETS[granularity]} AS period, * FROM sales "
+            "            WHERE sale_date BETWEEN ? AND ?), "
+            "totals AS (SELECT p.period, SUM(p.real_price) AS revenue, SUM(p.real_price - b.cost_price) AS profit, "
+            "           COUNT(*) AS units FROM p LEFT JOIN books b ON b.id = p.book_id GROUP BY p.period), "
+            "ranked AS (SELECT period, book_id, COUNT(*) AS cnt, ROW_NUMBER() OVER ("
+            "               PARTITION BY period ORDER BY COUNT(*) DESC, MIN(date_key * 4294967296 + id)) AS place "
+            "           FROM p WHERE book_id IS NOT NULL GROUP BY period, book_id) "
+            "SELECT t.period, t.revenue, t.profit, t.units, r.book_id, r.cnt FROM totals t "
+            "LEFT JOIN ranked r ON r.period = t.period AND r.place = 1 ORDER BY t.period", period
+        )
+        return [series_row(date_key(start), revenue, profit or 0, units, None if book_id is None else (book_id, cnt))
+                for start, revenue, profit, units, book_id, cnt in rows]
+
+    @staticmethod
+    def _empty(top_n):
+        return None if top_n is None else []
+
+    def period_report(self, start_date, end_date, book_manager=None, top_n=None):
+        period = self._period(start_date, end_date)
+        if period is None:
+            empty = self._empty(top_n)
+            return {"most_sold_book": empty, "best_employee": empty, "total_profit": 0,
+                    "most_sold_author": empty, "most_sold_genre": empty}
+        return {
+            "most_sold_book": self._ranked("s.book_id", period, top_n),
+            "best_employee": self._ranked("s.employee_name", period, top_n),
+            "total_profit": self._profit(period),
+            "most_sold_author": self._ranked("b.author", period, top_n, join=True),
+            "most_sold_genre": self._ranked("b.genre", period, top_n, join=True)
+        }
+
+    def iter_dicts(self):
+        for s in self.sales:
+            yield s.to_dict()
+        for s in self.invalid_sales:
+            yield s.to_dict()
+
+    def to_dict(self):
+        return list(self.iter_dicts())
+
+    def from_dict(self, data):
+        self.set_sales(Sale.from_dict(d) for d in data)
+
+
+def create_managers(conn):
+    return SqliteEmployeeManager(conn), SqliteBookManager(conn), SqliteSaleManager(conn)
+
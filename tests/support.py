@@ -0,0 +1,93 @@
+# Спільні дані для тестів: невеликий магазин з граничними випадками (кілька
+# продажів за день, продаж без книги, продаж неіснуючої книги, некоректна дата)
+# і знімок результатів запитів, за яким порівнюються сховища продажів.
+import random
+
+from var2_2 import Book, Employee, Sale
+
+EMPLOYEES = ("Іваненко Іван", "Петренко Петро", "Сидоренко Олена", "Коваль Марія")
+AUTHORS = ("Шевченко", "Франко", "Українка")
+GENRES = ("Поезія", "Роман", "Драма")
+PERIODS = (
+    ("2024-01-01", "2024-12-31"),
+    ("2024-02-10", "2024-02-10"),
+    ("2024-03-15", "2024-06-20"),
+    ("2023-01-01", "2023-12-31"),
+    ("2024-13-01", "2024-12-31"),
+)
+
+
+def make_employees():
+    return [Employee(name, "Продавець", f"+38050000000{i}", f"e{i}@shop.ua") for i, name in enumerate(EMPLOYEES)]
+
+
+def make_books(n=12):
+    return [Book.from_dict({"id": i, "title": f"Книга {i}", "year": 2000 + i, "author": AUTHORS[i % 3],
+                            "genre": GENRES[i // 4 % 3], "cost_price": 10.0 + i * 0.35, "sale_price": 30.0})
+            for i in range(1, n + 1)]
+
+
+def make_sales(n=400, n_books=12, seed=1):
+    rnd = random.Random(seed)
+    sales = []
+    for _ in range(n):
+        day = f"2024-{rnd.randint(1, 6):02d}-{rnd.randint(1, 28):02d}"
+        sales.append(Sale(rnd.choice(EMPLOYEES), rnd.randint(1, n_books), day, round(rnd.uniform(15, 40), 2)))
+    sales += [
+        Sale(EMPLOYEES[0], None, "2024-02-10", 12.5),
+        Sale(EMPLOYEES[1], 999, "2024-02-10", 17.25),
+        Sale(EMPLOYEES[2], 1, "2024-02-10", 31.1),
+        Sale(EMPLOYEES[3], 2, "10.02.2024", 20.0),
+    ]
+    return sales
+
+
+def copy_sales(sales):
+    return [Sale.from_dict(s.to_dict()) for s in sales]
+
+
+def rows(sales):
+    # Продажі як відсортовані кортежі: порядок продажів одного дня у сховищ різний
+    return sorted((s.employee_name, -1 if s.book_id is None else s.book_id, s.sale_date, s.real_price)
+                  for s in sales)
+
+
+def rounded(value):
+    # Сума грошей до копійок з запасом: сховища додають у різному порядку
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, dict):
+        return {k: rounded(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(rounded(v) for v in value)
+    return value
+
+
+def report_snapshot(sale_mgr, book_mgr):
+    # Результати всіх запитів звітів по PERIODS - однакові для будь-якого сховища
+    result = {"sales": rows(sale_mgr.sales)}
+    for start, end in PERIODS:
+        result[start, end] = rounded({
+            "period": rows(sale_mgr.sales_by_period(start, end)),
+            "employee": rows(sale_mgr.sales_by_employee(EMPLOYEES[1], start, end)),
+            "leaderboard": sale_mgr.employee_leaderboard(start, end),
+            "most_sold_book": sale_mgr.most_sold_book(start, end),
+            "best_employee": sale_mgr.best_employee(start, end, top_n=3),
+            "total_profit": sale_mgr.total_profit(start, end, book_mgr),
+            "most_sold_author": sale_mgr.most_sold_author(start, end, book_mgr, top_n=2),
+            "most_sold_genre": sale_mgr.most_sold_genre(start, end, book_mgr),
+            "report": sale_mgr.period_report(start, end, book_mgr, top_n=3),
+            "series": sale_mgr.time_series(start, end, book_mgr, "week"),
+        })
+    return result
+
+
+def apply_changes(sale_mgr):
+    # Однакова послідовність змін для порівняння сховищ після змін
+    sale_mgr.add_sale(Sale(EMPLOYEES[0], 3, "2024-02-10", 25.0))
+    sale_mgr.add_sales([Sale(EMPLOYEES[2], 4, "2024-06-30", 19.99), Sale(EMPLOYEES[3], 5, "2023-05-05", 33.0)])
+    sale_mgr.remove_sale(None, "2024-02-10")
+    sale_mgr.remove_sale(1, "2024-02-10")
+    sale_mgr.remove_sale(2, "10.02.2024")
+    sale_mgr.remove_sales(book_id=7, end_date="2024-03-31")
+    sale_mgr.remove_sales(employee_name=EMPLOYEES[1], start_date="2024-05-01", end_date="2024-05-31")
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from support import make_books
+from var2_2 import Book, BookManager, EmployeeManager, SaleManager, Store, journal_path, load_data
+
+
+def add_book(store, title):
+    with store.changing():
+        store.book_mgr.add_book(Book(title, 2024, "Франко", "Роман", 10.0, 20.0))
+    store.autosave()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    filename = str(tmp_path / "data.json")
+    store = Store(filename=filename, use_journal=False)
+    store.book_mgr.set_books(make_books())
+    store.close()
+    return filename
+
+
+def saved_titles(filename):
+    book_mgr = BookManager()
+    load_data(EmployeeManager(), book_mgr, SaleManager(), filename)
+    return [b.title for b in book_mgr.books]
+
+
+def test_idle_store_is_saved_by_timer(data_file):
+    store = Store(filename=data_file, autosave_seconds=0.2)
+    add_book(store, "Нова")
+    # Після зміни нічого не відбувається - знімок пише потік автозбереження сам
+    assert wait_for(lambda: store.autosaver.saves == 1)
+    store.autosaver.wait()
+    assert saved_titles(data_file)[-1] == "Нова"
+    with open(journal_path(data_file), encoding="utf-8") as f:
+        assert f.read() == ""
+    store.close()
+
+
+def test_every_changes_triggers_save(data_file):
+    store = Store(filename=data_file, autosave_changes=3)
+    for i in range(3):
+        add_book(store, f"Нова {i}")
+    assert wait_for(lambda: store.autosaver.saves == 1)
+    store.close()
+    assert saved_titles(data_file)[-3:] == ["Нова 0", "Нова 1", "Нова 2"]
+
+
+def test_failed_save_keeps_thread_alive(data_file, tmp_path, capsys):
+    store = Store(filename=data_file, autosave_seconds=0.1)
+    autosaver = store.autosaver
+    autosaver.filename = str(tmp_path / "missing" / "data.json")
+    add_book(store, "Нова")
+    assert wait_for(lambda: autosaver.error is not None)
+    autosaver.wait()
+    assert "Автозбереження не вдалося" in capsys.readouterr().out
+    assert autosaver._thread.is_alive()
+    assert autosaver.changes == 1  # незбережена зміна не загубилась
+
+    autosaver.filename = data_file
+    add_book(store, "Ще одна")
+    assert wait_for(lambda: autosaver.saves == 1)
+    store.close()
+    assert not autosaver._thread.is_alive()
+    assert saved_titles(data_file)[-2:] == ["Нова", "Ще одна"]
+
+
+def test_snapshot_does_not_compact(data_file):
+    # Копія для фонового запису не чіпає індексів, які в цей час читають інші потоки
+    store = Store(filename=data_file, use_journal=False)
+    book_mgr, sale_mgr = store.book_mgr, store.sale_mgr
+    for book_id in range(1, 9):
+        book_mgr.remove_book(book_id)
+    sale_mgr.remove_sales(book_id=10)
+    dead = book_mgr._dead, sale_mgr._dead
+    assert book_mgr._dead == 8
+    books = list(book_mgr.snapshot_dicts())
+    sales = list(sale_mgr.snapshot_dicts())
+    assert (book_mgr._dead, sale_mgr._dead) == dead
+    assert [b["id"] for b in books] == [9, 10, 11, 12]
+    assert len(sales) == len(sale_mgr.sales) + len(sale_mgr.invalid_sales)
+    store.close()
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from support import make_books
+from var2_2 import Book, BookManager, EmployeeManager, SaleManager, load_data
+
+
+@pytest.fixture
+def book_mgr():
+    book_mgr = BookManager()
+    book_mgr.set_books(make_books())
+    return book_mgr
+
+
+def assert_indexes_rebuilt(book_mgr):
+    # Індекси після змін - ті самі, що у свіжо заповненого менеджера
+    fresh = BookManager()
+    fresh.set_books(book_mgr.books)
+    for name in ("_by_title", "_by_author", "_by_genre"):
+        assert {k: set(v) for k, v in getattr(book_mgr, name).items()} == \
+            {k: set(v) for k, v in getattr(fresh, name).items()}
+    for query in ("книга", "франко", "роман", "новий", "1"):
+        assert book_mgr.search_books(query, limit=50) == fresh.search_books(query, limit=50)
+
+
+def test_update_moves_book_between_indexes(book_mgr):
+    assert book_mgr.update_book(2, title="Кобзар", author="Новий автор", year=1840)
+    assert book_mgr.find_book_by_title("Кобзар").id == 2
+    assert book_mgr.find_book_by_title("Книга 2") is None
+    assert [b.id for b in book_mgr.iter_books(author="Новий автор")] == [2]
+    assert 2 not in [b.id for b in book_mgr.iter_books(author="Українка")]
+    assert [b.id for b in book_mgr.search_books("кобзар")] == [2]
+    assert_indexes_rebuilt(book_mgr)
+
+
+def test_remove_and_compaction_keep_indexes(book_mgr):
+    for book_id in (1, 4, 5, 6, 7, 8, 9):
+        assert book_mgr.remove_book(book_id)
+    assert not book_mgr.remove_book(1)
+    assert [b.id for b in book_mgr.iter_books(genre="Поезія")] == [2, 3, 12]
+    assert [b.id for b in book_mgr.iter_books(author="Франко", genre="Драма")] == [10]
+    assert [b.id for b in book_mgr.books] == [2, 3, 10, 11, 12]
+    assert_indexes_rebuilt(book_mgr)
+
+
+def test_duplicate_ids_are_indexed_separately(book_mgr):
+    duplicate = Book.from_dict({**book_mgr.find_book(3).to_dict(), "title": "Дублікат"})
+    book_mgr.add_book(duplicate)
+    assert book_mgr.find_book(3).title == "Книга 3"
+    assert book_mgr.find_book_by_title("Дублікат") is duplicate
+    book_mgr.remove_book(3)
+    assert book_mgr.find_book_by_title("Дублікат") is None
+    assert book_mgr.find_book_by_title("Книга 3") is None
+    assert_indexes_rebuilt(book_mgr)
+
+
+@pytest.mark.parametrize("changes", [{"title": None}, {"genre": 5}, {"author": " "}, {"publisher": "x"},
+                                     {"id": 99}, {"year": True}, {"sale_price": "20"}])
+def test_update_rejects_invalid_changes(book_mgr, changes):
+    before = book_mgr.find_book(2).to_dict()
+    with pytest.raises(ValueError):
+        book_mgr.update_book(2, **changes)
+    assert book_mgr.find_book(2).to_dict() == before
+    assert_indexes_rebuilt(book_mgr)
+
+
+def test_bulk_removal_compacts_tombstones(monkeypatch):
+    monkeypatch.setattr("var2_2.COMPACT_MIN", 10)
+    book_mgr = BookManager()
+    book_mgr.set_books(make_books(60))
+    for book_id in range(1, 31, 2):
+        assert book_mgr.remove_book(book_id)
+    # 15 надгробків із 60 - ще не чверть, список не зсувається
+    assert book_mgr._dead == 15 and len(book_mgr._books) == 60
+    assert book_mgr.remove_book(31)
+    assert book_mgr._dead == 0 and len(book_mgr._books) == 44
+    assert all(book_mgr.find_book(i) is None for i in range(1, 32, 2))
+    assert all(book_mgr.find_book(i).id == i for i in range(2, 61, 2))
+    assert [b.id for b in book_mgr.books] == [i for i in range(1, 61) if i % 2 == 0 or i > 31]
+    assert_indexes_rebuilt(book_mgr)
+
+
+def test_removed_id_can_be_added_again(book_mgr):
+    book = book_mgr.find_book(4)
+    assert book_mgr.remove_book(4)
+    book_mgr.add_book(book)
+    assert book_mgr.find_book(4) is book
+    assert book_mgr.find_book_by_title("Книга 4") is book
+    assert [b.id for b in book_mgr.books][-1] == 4
+    assert_indexes_rebuilt(book_mgr)
+
+
+def test_from_dict_replaces_indexes(book_mgr):
+    book_mgr.from_dict([{"id": 40, "title": "Інша", "year": 2001, "author": "Франко", "genre": "Роман",
+                         "cost_price": 1.0, "sale_price": 2.0}])
+    assert book_mgr.find_book(1) is None and book_mgr.find_book_by_title("Книга 1") is None
+    assert book_mgr.find_book(40).title == "Інша"
+    assert [b.id for b in book_mgr.iter_books(author="Франко")] == [40]
+    assert_indexes_rebuilt(book_mgr)
+
+
+def test_legacy_sales_resolve_titles(tmp_path):
+    filename = str(tmp_path / "data.json")
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump({"employees": [], "books": [b.to_dict() for b in make_books()],
+                   "sales": [{"employee_name": "Іван", "book_title": "Книга 7", "sale_date": "2024-01-02",
+                              "real_price": 30.0},
+                             {"employee_name": "Іван", "book_title": "Немає", "sale_date": "2024-01-03",
+                              "real_price": 30.0}]}, f, ensure_ascii=False)
+    book_mgr, sale_mgr = BookManager(), SaleManager()
+    load_data(EmployeeManager(), book_mgr, sale_mgr, filename)
+    assert [s.book_id for s in sale_mgr.sales] == [7, None]
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from book_search import SearchIndex, book_score, ranked, search_words
+from sqlite_store import connect, create_managers
+from var2_2 import Book, BookManager
+
+WORDS = ("кобзар", "заповіт", "лісова", "пісня", "зів'яле", "листя", "Мойсей", "каменярі", "сон", "мавка",
+         "поезії", "роман", "драма", "вибране", "том", "книга", "ab", "abc", "abcd", "xabc")
+AUTHORS = ("Шевченко", "Франко", "Українка", "Коцюбинський", "Стефаник Василь")
+GENRES = ("Поезія", "Роман", "Драма", "Новела")
+QUERIES = ("кобзар", "КОБЗАР", "коб", "ко", "к", "зар", "франко", "франко пісня", "пісня франко", "поезія том",
+           "abc", "ab", "bc", "xab", "василь стефаник", "том том", "книга 7", "нічого", "", "  ", "шевченко ро",
+           "а", "драма мавка українка")
+
+
+def make_catalog(n=300, seed=3):
+    rnd = random.Random(seed)
+    return [Book.from_dict({"id": i, "title": " ".join(rnd.sample(WORDS, rnd.randint(1, 3))) + f" {i % 9}",
+                            "year": 1900 + i % 100, "author": rnd.choice(AUTHORS), "genre": rnd.choice(GENRES),
+                            "cost_price": 10.0, "sale_price": 20.0})
+            for i in range(1, n + 1)]
+
+
+def scan(books, query, limit):
+    # Еталон: бал кожної книги повним перебором
+    tokens = list(dict.fromkeys(search_words(query)))
+    if not tokens:
+        return []
+    return ranked(((b, s) for b in books for s in [book_score(tokens, b)] if s), limit)
+
+
+@pytest.fixture
+def catalog():
+    books = make_catalog()
+    index = SearchIndex()
+    for book in books:
+        index.add(book)
+    return books, index
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("limit", [1, 10, 1000])
+def test_index_matches_scan(catalog, query, limit):
+    books, index = catalog
+    assert index.search(query, limit) == scan(books, query, limit)
+
+
+def test_index_follows_discards(catalog):
+    books, index = catalog
+    for book in books[::3]:
+        index.discard(book)
+    index.discard(books[0])
+    kept = [b for i, b in enumerate(books) if i % 3]
+    assert len(index) == len(kept)
+    for query in QUERIES:
+        assert index.search(query, 50) == scan(kept, query, 50)
+    for book in kept:
+        index.discard(book)
+    assert len(index) == 0 and index._postings == {} and index._grams == {}
+
+
+def test_book_manager_and_sqlite_agree(catalog, tmp_path):
+    books, _ = catalog
+    book_mgr = BookManager()
+    book_mgr.set_books(books)
+    conn = connect(str(tmp_path / "bookstore.db"))
+    sqlite_books = create_managers(conn)[1]
+    sqlite_books.set_books(books)
+    book_mgr.update_book(5, title="Кобзар особливий", author="Франко")
+    sqlite_books.update_book(5, title="Кобзар особливий", author="Франко")
+    book_mgr.remove_book(6)
+    sqlite_books.remove_book(6)
+    for query in QUERIES + ("особливий", "особ"):
+        assert [b.id for b in book_mgr.search_books(query, 20)] == \
+            [b.id for b in sqlite_books.search_books(query, 20)]
+    assert [b.id for b in book_mgr.search_books("особливий")] == [5]
+    conn.close()
+
+
+def test_field_weights_and_match_quality():
+    index = SearchIndex()
+    books = [Book.from_dict({"id": i, "title": title, "year": 2000, "author": author, "genre": "Роман",
+                             "cost_price": 1.0, "sale_price": 2.0})
+             for i, (title, author) in enumerate([("Роман", "Хтось"), ("Книга", "Романенко"),
+                                                  ("Романтика", "Хтось"), ("Антироман", "Хтось")], 1)]
+    for book in books:
+        index.add(book)
+    # Бал - вага поля на якість збігу: назва цілком 9, початок слова назви 6,
+    # початок слова автора 4, частина слова назви 3 (як і жанр цілком)
+    assert [b.id for b in index.search("роман", 10)] == [1, 3, 2, 4]
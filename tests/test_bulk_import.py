@@ -0,0 +1,84 @@
+import csv
+import json
+
+import pytest
+
+from bulk_import import import_file, write_rejects
+from support import EMPLOYEES, make_books, make_employees
+from var2_2 import BookManager, EmployeeManager, SaleManager
+
+
+@pytest.fixture
+def managers():
+    employee_mgr, book_mgr, sale_mgr = EmployeeManager(), BookManager(), SaleManager()
+    employee_mgr.set_employees(make_employees())
+    book_mgr.set_books(make_books())
+    return employee_mgr, book_mgr, sale_mgr
+
+
+def write_csv(path, fields, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+SALE_FIELDS = ["employee_name", "book_id", "book_title", "sale_date", "real_price"]
+
+
+def test_sales_rejects_are_reported_with_line_numbers(managers, tmp_path):
+    employee_mgr, book_mgr, sale_mgr = managers
+    path = write_csv(tmp_path / "sales.csv", SALE_FIELDS, [
+        {"employee_name": EMPLOYEES[0].upper(), "book_id": 3, "sale_date": "2024-01-05", "real_price": "25.5"},
+        {"employee_name": "Ніхто", "book_id": 3, "sale_date": "2024-01-05", "real_price": "25"},
+        {"employee_name": EMPLOYEES[1], "book_id": 99, "sale_date": "2024-01-05", "real_price": "25"},
+        {"employee_name": EMPLOYEES[1], "book_id": "три", "sale_date": "2024-01-05", "real_price": "25"},
+        {"employee_name": EMPLOYEES[1], "book_title": "Книга 7", "sale_date": "2024-01-06", "real_price": "30"},
+        {"employee_name": EMPLOYEES[1], "book_title": "Немає", "sale_date": "2024-01-06", "real_price": "30"},
+        {"employee_name": EMPLOYEES[2], "book_id": 4, "sale_date": "06.01.2024", "real_price": "30"},
+        {"employee_name": EMPLOYEES[2], "book_id": 4, "sale_date": "2024-01-07", "real_price": "дорого"},
+        {"employee_name": "", "book_id": 4, "sale_date": "2024-01-07", "real_price": "30"},
+    ])
+    result = import_file(path, "sales", employee_mgr, book_mgr, sale_mgr, batch_size=1)
+    assert (result.accepted, result.rejected) == (2, 7)
+    assert [line for line, _ in result.rejects] == [3, 4, 5, 7, 8, 9, 10]
+    assert "Ніхто" in result.rejects[0][1] and "99" in result.rejects[1][1]
+    assert [(s.employee_name, s.book_id) for s in sale_mgr.sales] == [(EMPLOYEES[0], 3), (EMPLOYEES[1], 7)]
+
+    rejects = str(tmp_path / "rejects.csv")
+    write_rejects(result, rejects)
+    with open(rejects, encoding="utf-8", newline="") as f:
+        assert [row[0] for row in csv.reader(f)] == ["line", "3", "4", "5", "7", "8", "9", "10"]
+
+
+def test_books_see_rows_imported_earlier(managers, tmp_path):
+    employee_mgr, book_mgr, sale_mgr = managers
+    fields = ["id", "title", "year", "author", "genre", "cost_price", "sale_price"]
+    path = write_csv(tmp_path / "books.csv", fields, [
+        {"id": 50, "title": "Нова", "year": 2020, "author": "Франко", "genre": "Роман",
+         "cost_price": 10, "sale_price": 20},
+        {"id": 50, "title": "Дубль", "year": 2020, "author": "Франко", "genre": "Роман",
+         "cost_price": 10, "sale_price": 20},
+        {"id": 3, "title": "Існуюча", "year": 2020, "cost_price": 10, "sale_price": 20},
+        {"title": "Без id", "year": 1200, "cost_price": 10, "sale_price": 20},
+        {"title": "Без ціни", "year": 2020, "cost_price": 10},
+        {"title": "Без id", "year": 2021, "cost_price": 1, "sale_price": 2},
+    ])
+    result = import_file(path, "books", employee_mgr, book_mgr, sale_mgr)
+    assert (result.accepted, result.rejected) == (2, 4)
+    assert book_mgr.find_book(50).title == "Нова"
+    assert book_mgr.find_book_by_title("Без id").year == 2021
+
+
+def test_jsonl_bad_lines_and_reject_cap(managers, tmp_path, monkeypatch):
+    employee_mgr, book_mgr, sale_mgr = managers
+    monkeypatch.setattr("bulk_import.MAX_REJECTS_KEPT", 2)
+    path = tmp_path / "employees.jsonl"
+    lines = [json.dumps({"full_name": "Нова Ольга", "position": "Касир"}, ensure_ascii=False),
+             "{не json", "", json.dumps(["список"]), json.dumps({"position": "без імені"})]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    result = import_file(str(path), "employees", employee_mgr, book_mgr, sale_mgr)
+    assert (result.accepted, result.rejected) == (1, 3)
+    assert [line for line, _ in result.rejects] == [2, 4]
+    assert employee_mgr.find_employee("нова ольга").position == "Касир"
@@ -0,0 +1,48 @@
+import pytest
+
+import columnar_store
+from columnar_store import ColumnarSaleManager
+from support import apply_changes, copy_sales, make_books, make_sales, report_snapshot
+from var2_2 import BookManager, SaleManager
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def vectorized(request, monkeypatch):
+    # Обидві гілки агрегацій: з NumPy (якщо встановлено) і без нього
+    if request.param == "numpy" and columnar_store.np is None:
+        pytest.skip("NumPy не встановлено")
+    if request.param == "pure":
+        monkeypatch.setattr(columnar_store, "np", None)
+    return request.param
+
+
+def build(cls, sales):
+    sale_mgr = cls()
+    sale_mgr.set_sales(copy_sales(sales))
+    return sale_mgr
+
+
+def test_reports_match_list_backend(vectorized):
+    book_mgr = BookManager()
+    book_mgr.set_books(make_books())
+    sales = make_sales()
+    assert report_snapshot(build(ColumnarSaleManager, sales), book_mgr) == \
+        report_snapshot(build(SaleManager, sales), book_mgr)
+
+
+def test_changes_match_list_backend(vectorized):
+    book_mgr = BookManager()
+    book_mgr.set_books(make_books())
+    sales = make_sales()
+    columnar, reference = build(ColumnarSaleManager, sales), build(SaleManager, sales)
+    apply_changes(columnar)
+    apply_changes(reference)
+    assert report_snapshot(columnar, book_mgr) == report_snapshot(reference, book_mgr)
+
+
+def test_remove_sale_without_book():
+    columnar = build(ColumnarSaleManager, make_sales())
+    assert [s for s in columnar.sales_by_period("2024-02-10", "2024-02-10") if s.book_id is None]
+    columnar.remove_sale(None, "2024-02-10")
+    assert not [s for s in columnar.sales_by_period("2024-02-10", "2024-02-10") if s.book_id is None]
+    assert [s for s in columnar.sales_by_period("2024-02-10", "2024-02-10") if s.book_id == 999]
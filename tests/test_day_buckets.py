@@ -0,0 +1,68 @@
+from math import fsum
+
+import pytest
+
+from support import EMPLOYEES, PERIODS, make_books, make_sales
+from var2_2 import BookManager, DayBucket, Sale, SaleManager
+
+
+@pytest.fixture
+def store():
+    book_mgr = BookManager()
+    book_mgr.set_books(make_books())
+    sale_mgr = SaleManager()
+    sale_mgr.set_sales(make_sales())
+    return sale_mgr, book_mgr
+
+
+def assert_buckets_rebuilt(sale_mgr):
+    # Денні агрегати після змін - ті самі, що побудовані з продажів кожного дня
+    days = {}
+    for s in sale_mgr.sales:
+        days.setdefault(s.date_key, []).append(s)
+    assert sale_mgr._day_keys == sorted(days)
+    assert set(sale_mgr._days) == set(days)
+    for day, sales in days.items():
+        bucket, fresh = sale_mgr._days[day], DayBucket.from_sales(sales)
+        assert bucket.books == fresh.books and bucket.employees == fresh.employees
+        assert bucket.revenue == pytest.approx(fresh.revenue)
+        assert bucket.book_revenue == pytest.approx(fresh.book_revenue)
+
+
+def scan_profit(sales, book_mgr, start, end):
+    books = {b.id: b for b in book_mgr.books}
+    return fsum(s.real_price - books[s.book_id].cost_price for s in sales
+                if s.book_id in books and s.date_key is not None and start <= s.sale_date <= end)
+
+
+def test_buckets_follow_adds_and_removals(store):
+    sale_mgr, _ = store
+    sale_mgr.add_sale(Sale(EMPLOYEES[0], 3, "2024-07-04", 25.0))
+    sale_mgr.add_sales([Sale(EMPLOYEES[1], 4, "2024-07-04", 21.0), Sale(EMPLOYEES[2], None, "2024-07-05", 9.0)])
+    assert_buckets_rebuilt(sale_mgr)
+    sale_mgr.remove_sale(None, "2024-07-05")
+    sale_mgr.remove_sales(book_id=6)
+    sale_mgr.remove_sales(employee_name=EMPLOYEES[3], start_date="2024-04-01")
+    assert_buckets_rebuilt(sale_mgr)
+    # День без продажів зникає з індексу днів
+    assert sale_mgr.sales_by_period("2024-07-05", "2024-07-05") == []
+    assert all(day in sale_mgr._days for day in sale_mgr._day_keys)
+
+
+def test_profit_follows_cost_changes_and_removed_books(store):
+    sale_mgr, book_mgr = store
+    book_mgr.update_book(2, cost_price=1.0)
+    book_mgr.update_book(7, cost_price=99.0)
+    book_mgr.remove_book(9)
+    for start, end in PERIODS[:4]:
+        expected = scan_profit(sale_mgr.sales, book_mgr, start, end)
+        assert sale_mgr.total_profit(start, end, book_mgr) == pytest.approx(expected)
+
+
+def test_merged_buckets_do_not_depend_on_order(store):
+    sale_mgr, _ = store
+    buckets = [sale_mgr._days[day] for day in sale_mgr._day_keys]
+    forward, backward = DayBucket.merged(buckets), DayBucket.merged(reversed(buckets))
+    assert forward.revenue == backward.revenue
+    assert forward.book_revenue == backward.book_revenue
+    assert forward.books == DayBucket.from_sales(sale_mgr.sales).books
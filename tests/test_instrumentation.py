@@ -0,0 +1,45 @@
+import pytest
+
+import var2_2
+from instrumentation import Instrumentation
+from support import make_books
+from var2_2 import BookManager, Store
+
+
+def test_functions_are_restored_after_block():
+    namespace = {"load_data": lambda: [1, 2], "save_data": lambda: None}
+    original = namespace["load_data"]
+    instrumentation = Instrumentation()
+    with instrumentation.instrument_functions(namespace):
+        assert namespace["load_data"] is not original
+        assert namespace["load_data"]() == [1, 2]
+    assert namespace["load_data"] is original
+    assert instrumentation.stats["load_data"].calls == 1
+    assert instrumentation.stats["load_data"].rows == 2
+
+    with pytest.raises(RuntimeError):
+        with instrumentation.instrument_functions(namespace):
+            raise RuntimeError
+    assert namespace["load_data"] is original
+
+
+def test_main_instruments_only_when_enabled(tmp_path, capsys):
+    filename = str(tmp_path / "data.json")
+    store = Store(filename=filename, use_journal=False)
+    store.book_mgr.set_books(make_books())
+    store.close()
+    load_data, save_data = var2_2.load_data, var2_2.save_data
+    var2_2.main(filename=filename, compact=True, instrument=True, report_cache=0)
+    var2_2.main(filename=filename, compact=True, report_cache=0)
+    assert (var2_2.load_data, var2_2.save_data) == (load_data, save_data)
+    assert "Журнал перенесено у знімок." in capsys.readouterr().out
+
+
+def test_managers_are_wrapped_per_instance():
+    book_mgr = BookManager()
+    book_mgr.set_books(make_books())
+    instrumentation = Instrumentation()
+    instrumentation.instrument_managers(None, book_mgr, None)
+    book_mgr.find_book(3)
+    assert instrumentation.stats["BookManager.find_book"].calls == 1
+    assert "find_book" not in vars(BookManager())
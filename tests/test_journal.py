@@ -0,0 +1,83 @@
+import pytest
+
+from support import EMPLOYEES, apply_changes, make_books, make_employees, make_sales, report_snapshot
+from var2_2 import (Book, BookManager, Employee, EmployeeManager, Journal, SaleManager, journal_path, load_data,
+                    save_data)
+
+
+def state(employee_mgr, book_mgr, sale_mgr):
+    return (employee_mgr.to_dict(), book_mgr.to_dict(), sale_mgr.to_dict(),
+            [s.to_dict() for s in sale_mgr.invalid_sales], report_snapshot(sale_mgr, book_mgr))
+
+
+def change_everything(employee_mgr, book_mgr, sale_mgr):
+    employee_mgr.add_employee(Employee("Новий Працівник", "Касир", "+380501112233", "new@shop.ua"))
+    employee_mgr.remove_employee(EMPLOYEES[3])
+    book_mgr.add_book(Book.from_dict({"id": 50, "title": "Нова", "year": 2024, "author": "Франко",
+                                      "genre": "Роман", "cost_price": 11.0, "sale_price": 25.0}))
+    book_mgr.update_book(3, author="Шевченко", cost_price=12.5)
+    book_mgr.remove_book(6)
+    apply_changes(sale_mgr)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    filename = str(tmp_path / "data.json")
+    managers = EmployeeManager(), BookManager(), SaleManager()
+    managers[0].set_employees(make_employees())
+    managers[1].set_books(make_books())
+    managers[2].set_sales(make_sales())
+    save_data(*managers, filename)
+    return filename
+
+
+def open_store(filename):
+    managers = EmployeeManager(), BookManager(), SaleManager()
+    journal = Journal(journal_path(filename))
+    load_data(*managers, filename, journal=journal)
+    return managers, journal
+
+
+def test_replay_restores_changes(data_file):
+    managers, journal = open_store(data_file)
+    change_everything(*managers)
+    journal.close()
+    expected = state(*managers)
+
+    reopened, journal = open_store(data_file)
+    journal.close()
+    assert state(*reopened) == expected
+
+
+def test_compaction_round_trip(data_file):
+    managers, journal = open_store(data_file)
+    change_everything(*managers)
+    seq = journal.seq
+    save_data(*managers, data_file, journal=journal)
+    with open(journal_path(data_file), encoding="utf-8") as f:
+        assert f.read() == ""
+    # Після стискання нові записи продовжують нумерацію і відтворюються поверх знімка
+    managers[1].update_book(1, cost_price=9.0)
+    journal.close()
+    assert journal.seq == seq + 1
+    expected = state(*managers)
+
+    reopened, journal = open_store(data_file)
+    journal.close()
+    assert journal.seq == seq + 1
+    assert state(*reopened) == expected
+
+
+def test_trim_keeps_newer_records(tmp_path):
+    journal = Journal(str(tmp_path / "data.json.journal.jsonl"))
+    for i in range(5):
+        journal.append("remove_book", i)
+    journal.trim(3)
+    book_mgr = BookManager()
+    book_mgr.set_books(make_books())
+    applied = journal.replay(EmployeeManager(), book_mgr, SaleManager())
+    journal.close()
+    assert applied == 2
+    assert journal.seq == 5
+    assert book_mgr.find_book(2) is not None
+    assert book_mgr.find_book(3) is None and book_mgr.find_book(4) is None
@@ -0,0 +1,115 @@
+import io
+import json
+
+import pytest
+
+from json_stream import atomic_open, compression_for, detect_compression, iter_records, open_data, write_records
+from support import copy_sales, make_books, make_employees, make_sales, rows
+from var2_2 import BookManager, EmployeeManager, SaleManager, load_data, save_data
+
+DATA = {
+    "employees": [{"full_name": "Іваненко Іван", "position": "Продавець"}],
+    "books": [{"id": i, "title": f"Книга \"{i}\"", "cost_price": 10.5 + i, "tags": ["a", {"b": None}]}
+              for i in range(1, 40)],
+    "sales": [],
+    "journal_seq": 17,
+}
+
+
+def records(data):
+    return [(key, value) for key, values in data.items() if isinstance(values, list) for value in values]
+
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_writer_matches_json_dump(indent):
+    f = io.StringIO()
+    sections = [(key, iter(value)) for key, value in DATA.items() if isinstance(value, list)]
+    write_records(f, sections, {"journal_seq": 17}, indent=indent)
+    assert f.getvalue() == json.dumps(DATA, ensure_ascii=False, indent=indent)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_reader_handles_any_chunk_boundary(chunk_size):
+    text = json.dumps(DATA, ensure_ascii=False, indent=4)
+    extras = {}
+    assert list(iter_records(io.StringIO(text), extras, chunk_size=chunk_size)) == records(DATA)
+    assert extras == {"journal_seq": 17}
+
+
+def test_numbers_split_between_chunks():
+    text = json.dumps({"sales": [123456789, 1.25e10, -7], "journal_seq": 123456})
+    extras = {}
+    assert [v for _, v in iter_records(io.StringIO(text), extras, chunk_size=3)] == [123456789, 1.25e10, -7]
+    assert extras["journal_seq"] == 123456
+
+
+@pytest.mark.parametrize("text", ["{}", " { } ", '{"sales": []}', '{"sales": [], "books": []}'])
+def test_empty_documents(text):
+    assert list(iter_records(io.StringIO(text))) == []
+
+
+@pytest.mark.parametrize("text", ["", "[]", '{"sales": [1, 2', '{"sales": [1 2]}', '{"sales" [1]}'])
+def test_broken_documents_raise(text):
+    with pytest.raises(ValueError):
+        list(iter_records(io.StringIO(text)))
+
+
+def test_open_data_reads_plain_file(tmp_path):
+    filename = tmp_path / "data.json"
+    filename.write_text(json.dumps(DATA, ensure_ascii=False), encoding="utf-8")
+    with open_data(str(filename)) as f:
+        assert list(iter_records(f)) == records(DATA)
+
+
+def test_failed_write_keeps_old_file(tmp_path):
+    filename = tmp_path / "data.json"
+    filename.write_text("старий вміст", encoding="utf-8")
+    filename.chmod(0o640)
+    with pytest.raises(RuntimeError):
+        with atomic_open(str(filename)) as f:
+            f.write("новий")
+            raise RuntimeError
+    assert filename.read_text(encoding="utf-8") == "старий вміст"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+    with atomic_open(str(filename)) as f:
+        f.write("новий")
+    assert filename.read_text(encoding="utf-8") == "новий"
+    assert filename.stat().st_mode & 0o777 == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_unknown_compression_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        with atomic_open(str(tmp_path / "data.json"), "zip"):
+            pass
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("name, compression", [("data.json", None), ("data.json.gz", "gzip"),
+                                               ("data.json.XZ", "lzma"), ("data.lzma", "lzma")])
+def test_compression_for_extension(name, compression):
+    assert compression_for(name) == compression
+
+
+@pytest.mark.parametrize("name, compress, expected", [
+    ("data.json", "gzip", "gzip"),
+    ("data.json", "lzma", "lzma"),
+    ("data.json.gz", None, "gzip"),
+    ("data.json", None, None),
+])
+def test_compressed_snapshot_round_trip(tmp_path, name, compress, expected):
+    filename = str(tmp_path / name)
+    employee_mgr, book_mgr, sale_mgr = EmployeeManager(), BookManager(), SaleManager()
+    employee_mgr.set_employees(make_employees())
+    book_mgr.set_books(make_books())
+    sale_mgr.set_sales(copy_sales(make_sales()))
+    save_data(employee_mgr, book_mgr, sale_mgr, filename, compress=compress)
+    assert detect_compression(filename) == expected
+
+    loaded = EmployeeManager(), BookManager(), SaleManager()
+    load_data(*loaded, filename)
+    assert [e.to_dict() for e in loaded[0].employees] == [e.to_dict() for e in employee_mgr.employees]
+    assert [b.to_dict() for b in loaded[1].books] == [b.to_dict() for b in book_mgr.books]
+    assert rows(loaded[2].sales) == rows(sale_mgr.sales)
+    assert rows(loaded[2].invalid_sales) == rows(sale_mgr.invalid_sales)
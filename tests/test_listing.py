@@ -0,0 +1,100 @@
+import pytest
+
+from columnar_store import ColumnarSaleManager
+from snapshot_bin import load_snapshot, write_snapshot
+from sqlite_store import connect, create_managers
+from support import AUTHORS, EMPLOYEES, GENRES, copy_sales, make_books, make_employees, make_sales, rows
+from var2_2 import BookManager, EmployeeManager, SaleManager, date_key, paginate, show_pages
+
+
+@pytest.fixture(params=["list", "columnar", "sqlite", "binary"])
+def managers(request, tmp_path):
+    conn = None
+    if request.param == "sqlite":
+        conn = connect(str(tmp_path / "bookstore.db"))
+        _, book_mgr, sale_mgr = create_managers(conn)
+    else:
+        book_mgr = BookManager()
+        sale_mgr = ColumnarSaleManager() if request.param == "columnar" else SaleManager()
+    book_mgr.set_books(make_books())
+    sale_mgr.set_sales(copy_sales(make_sales()))
+    if request.param == "binary":
+        filename = str(tmp_path / "data.bin")
+        employee_mgr = EmployeeManager()
+        employee_mgr.set_employees(make_employees())
+        write_snapshot(filename, employee_mgr, book_mgr, sale_mgr)
+        _, book_mgr, sale_mgr = load_snapshot(filename)
+    yield book_mgr, sale_mgr
+    if conn is not None:
+        conn.close()
+
+
+def test_paginate_offsets_and_page_sizes():
+    assert list(paginate(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(paginate(range(7), 3, offset=5)) == [[5, 6]]
+    assert list(paginate(range(7), 3, offset=7)) == []
+    assert list(paginate(range(7), 3, offset=100)) == []
+    assert list(paginate(range(7), None)) == [list(range(7))]
+    assert list(paginate(range(7), None, offset=2)) == [list(range(2, 7))]
+    assert list(paginate(iter([]), 3)) == []
+
+
+def test_paginate_reads_lazily():
+    consumed = []
+
+    def items():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+    pages = paginate(items(), 10, offset=20)
+    assert next(pages) == list(range(20, 30))
+    assert len(consumed) == 30
+
+
+def test_show_pages_stops_on_answer(monkeypatch, capsys):
+    answers = iter(["", "q"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    show_pages(range(1, 13), 4)
+    assert capsys.readouterr().out.split() == [str(i) for i in range(1, 9)]
+
+    show_pages(range(1, 13))
+    assert capsys.readouterr().out.split() == [str(i) for i in range(1, 13)]
+    show_pages([], 4, empty="Порожньо.")
+    assert capsys.readouterr().out == "Порожньо.\n"
+
+
+@pytest.mark.parametrize("author, genre", [(None, None), (AUTHORS[1], None), (None, GENRES[0]),
+                                           (AUTHORS[0], GENRES[2]), ("Невідомий", None), (AUTHORS[2], "Есе")])
+def test_book_filters(managers, author, genre):
+    book_mgr, _ = managers
+    expected = [b.id for b in make_books()
+                if (author is None or b.author == author) and (genre is None or b.genre == genre)]
+    assert sorted(b.id for b in book_mgr.iter_books(author, genre)) == expected
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"start_date": "2024-03-01"},
+    {"end_date": "2024-02-10"},
+    {"start_date": "2024-02-10", "end_date": "2024-02-10"},
+    {"employee_name": EMPLOYEES[2], "start_date": "2024-02-01", "end_date": "2024-04-30"},
+    {"book_id": 1, "end_date": "2024-03-31"},
+    {"book_id": 7, "employee_name": EMPLOYEES[0]},
+    {"employee_name": "Ніхто"},
+    {"start_date": "2024-07-01"},
+])
+def test_sale_filters(managers, filters):
+    _, sale_mgr = managers
+    lo, hi = date_key(filters.get("start_date", "0001-01-01")), date_key(filters.get("end_date", "9999-12-31"))
+    expected = [s for s in make_sales() if s.date_key is not None and lo <= s.date_key <= hi
+                and filters.get("employee_name", s.employee_name) == s.employee_name
+                and filters.get("book_id", s.book_id) == s.book_id]
+    listed = list(sale_mgr.iter_sales(**filters))
+    assert rows(listed) == rows(expected)
+    assert [s.date_key for s in listed] == sorted(s.date_key for s in listed)
+
+
+def test_invalid_sale_filter_date(managers, capsys):
+    _, sale_mgr = managers
+    assert list(sale_mgr.iter_sales(start_date="01.02.2024")) == []
+    assert "Невірний формат дати" in capsys.readouterr().out
@@ -0,0 +1,105 @@
+import pytest
+
+from multistore import ChainStore, Shard, book_key
+from support import EMPLOYEES, PERIODS, copy_sales, make_books, make_employees, make_sales, rounded
+from var2_2 import Book, BookManager, EmployeeManager, Sale, SaleManager, save_data
+
+
+def shop_b_books():
+    # Ті самі книги під іншими id, з іншим регістром і пробілами, плюс власна книга
+    books = []
+    for b in make_books():
+        data = b.to_dict()
+        data.update(id=b.id + 100, title=f" {b.title.upper()} ", cost_price=b.cost_price + 1)
+        books.append(Book.from_dict(data))
+    books.append(Book.from_dict({"id": 500, "title": "Лише у Львові", "year": 2020, "author": "Франко",
+                                 "genre": "Роман", "cost_price": 5.0, "sale_price": 9.0}))
+    return books
+
+
+def shop_b_sales():
+    sales = copy_sales(make_sales(n=300, seed=2))
+    for s in sales:
+        if s.book_id is not None and s.book_id <= 12:
+            s.book_id += 100
+    return sales + [Sale(EMPLOYEES[0], 500, "2024-03-03", 9.0)] * 40
+
+
+def managers(books, sales):
+    employee_mgr, book_mgr, sale_mgr = EmployeeManager(), BookManager(), SaleManager()
+    employee_mgr.set_employees(make_employees())
+    book_mgr.set_books(books)
+    sale_mgr.set_sales(sales)
+    return employee_mgr, book_mgr, sale_mgr
+
+
+@pytest.fixture
+def shops():
+    return [managers(make_books(), copy_sales(make_sales())), managers(shop_b_books(), shop_b_sales())]
+
+
+def combined(shops, chain):
+    # Еталон: усі продажі мережі в одному менеджері з id каталогу
+    sale_mgr = SaleManager()
+    sales = []
+    for (_, book_mgr, shop_sales), shard in zip(shops, chain.shards):
+        for s in shop_sales.sales + shop_sales.invalid_sales:
+            sales.append(Sale(s.employee_name, shard.chain_ids.get(s.book_id), s.sale_date, s.real_price))
+    sale_mgr.set_sales(sales)
+    return sale_mgr
+
+
+def test_books_are_reconciled_by_key(shops):
+    chain = ChainStore(Shard(name, *m) for name, m in zip(("kyiv", "lviv"), shops))
+    kyiv, lviv = chain.shards
+    assert len(chain.catalog.books) == 13
+    assert all(kyiv.chain_ids[i] == lviv.chain_ids[i + 100] for i in range(1, 13))
+    assert chain.catalog.find_book(lviv.chain_ids[500]).title == "Лише у Львові"
+    assert book_key(make_books()[0]) == book_key(shop_b_books()[0])
+
+
+@pytest.mark.parametrize("top_n", [None, 3])
+def test_chain_report_matches_combined_sales(shops, top_n):
+    chain = ChainStore(Shard(name, *m) for name, m in zip(("kyiv", "lviv"), shops))
+    reference = combined(shops, chain)
+    for start, end in PERIODS[:4]:
+        result = chain.period_report(start, end, top_n)
+        expected = reference.period_report(start, end, chain.catalog, top_n)
+        profit = sum(sale_mgr.total_profit(start, end, book_mgr) for _, book_mgr, sale_mgr in shops)
+        assert result["chain"]["total_profit"] == pytest.approx(profit)
+        expected["total_profit"] = result["chain"]["total_profit"]
+        assert rounded(result["chain"]) == rounded(expected)
+        assert result["stores"]["kyiv"]["best_employee"] == shops[0][2].best_employee(start, end, top_n)
+    assert chain.period_report("2024-13-01", "2024-12-31") is None
+    with pytest.raises(ValueError):
+        chain.report("unknown", "2024-01-01", "2024-12-31")
+
+
+def test_leaderboard_sums_stores(shops):
+    chain = ChainStore(Shard(name, *m) for name, m in zip(("kyiv", "lviv"), shops))
+    board = chain.employee_leaderboard("2024-01-01", "2024-12-31")
+    reference = combined(shops, chain)
+    assert board["chain"] == reference.employee_leaderboard("2024-01-01", "2024-12-31")
+    assert chain.employee_leaderboard("2024-01-01", "2024-12-31", top_n=2)["chain"] == board["chain"][:2]
+
+
+def test_refresh_picks_up_new_books(shops):
+    chain = ChainStore(Shard(name, *m) for name, m in zip(("kyiv", "lviv"), shops))
+    shops[0][1].add_book(Book.from_dict({**shop_b_books()[-1].to_dict(), "id": 77}))
+    chain.refresh()
+    assert chain.shards[0].chain_ids[77] == chain.shards[1].chain_ids[500]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_open_files(shops, tmp_path, workers):
+    filenames = []
+    for name, m in zip(("kyiv", "lviv"), shops):
+        filenames.append(str(tmp_path / f"{name}.json"))
+        save_data(*m, filenames[-1])
+    chain = ChainStore.open(filenames, workers=workers)
+    expected = ChainStore(Shard(name, *m) for name, m in zip(("kyiv", "lviv"), shops))
+    assert [s.name for s in chain.shards] == ["kyiv", "lviv"]
+    assert rounded(chain.period_report("2024-01-01", "2024-12-31", 3)) == \
+        rounded(expected.period_report("2024-01-01", "2024-12-31", 3))
+    with pytest.raises(FileNotFoundError):
+        ChainStore.open(filenames + [str(tmp_path / "missing.json")])
@@ -0,0 +1,46 @@
+import pytest
+
+from parallel_reports import ParallelReports
+from snapshot_bin import load_snapshot, write_snapshot
+from support import EMPLOYEES, PERIODS, copy_sales, make_books, make_employees, make_sales, rounded
+from var2_2 import BookManager, EmployeeManager, Sale, SaleManager
+
+
+@pytest.fixture
+def managers(tmp_path):
+    employee_mgr, book_mgr, sale_mgr = EmployeeManager(), BookManager(), SaleManager()
+    employee_mgr.set_employees(make_employees())
+    book_mgr.set_books(make_books())
+    sale_mgr.set_sales(copy_sales(make_sales()))
+    filename = str(tmp_path / "data.bin")
+    write_snapshot(filename, employee_mgr, book_mgr, sale_mgr)
+    _, book_mgr, sale_mgr = load_snapshot(filename)
+    return book_mgr, sale_mgr
+
+
+def reports(source, book_mgr):
+    return rounded({(start, end): (source.period_report(start, end, book_mgr, top_n=3),
+                                   source.most_sold_book(start, end, top_n=3),
+                                   source.best_employee(start, end),
+                                   source.total_profit(start, end, book_mgr),
+                                   source.most_sold_author(start, end, book_mgr, top_n=2),
+                                   source.most_sold_genre(start, end, book_mgr))
+                    for start, end in PERIODS})
+
+
+def test_parallel_reports_match_serial(managers):
+    book_mgr, sale_mgr = managers
+    parallel = ParallelReports(sale_mgr, workers=2, threshold=0)
+    assert reports(parallel, book_mgr) == reports(sale_mgr, book_mgr)
+    executor = parallel._executor
+    assert executor is not None
+
+    # Той самий пул бачить зміни після свого запуску
+    sale_mgr.remove_sales(book_id=5, start_date="2024-01-01")
+    sale_mgr.remove_sale(3, sale_mgr.sales[10].sale_date)
+    sale_mgr.add_sales([Sale(EMPLOYEES[0], 7, "2024-02-10", 25.0)] * 20)
+    assert reports(parallel, book_mgr) == reports(sale_mgr, book_mgr)
+    assert parallel._executor is executor
+
+    parallel.close()
+    assert parallel._executor is None
@@ -0,0 +1,75 @@
+import pytest
+
+from columnar_store import ColumnarSaleManager
+from snapshot_bin import load_snapshot, write_snapshot
+from sqlite_store import connect, create_managers
+from support import EMPLOYEES, PERIODS, copy_sales, make_books, make_employees, make_sales, rounded, rows
+from var2_2 import BookManager, EmployeeManager, SaleManager, date_key
+
+
+@pytest.fixture(params=["list", "columnar", "sqlite", "binary"])
+def managers(request, tmp_path):
+    conn = None
+    if request.param == "sqlite":
+        conn = connect(str(tmp_path / "bookstore.db"))
+        _, book_mgr, sale_mgr = create_managers(conn)
+    else:
+        book_mgr = BookManager()
+        sale_mgr = ColumnarSaleManager() if request.param == "columnar" else SaleManager()
+    book_mgr.set_books(make_books())
+    sale_mgr.set_sales(copy_sales(make_sales()))
+    if request.param == "binary":
+        filename = str(tmp_path / "data.bin")
+        employee_mgr = EmployeeManager()
+        employee_mgr.set_employees(make_employees())
+        write_snapshot(filename, employee_mgr, book_mgr, sale_mgr)
+        _, book_mgr, sale_mgr = load_snapshot(filename)
+    yield book_mgr, sale_mgr
+    if conn is not None:
+        conn.close()
+
+
+def matches(s, book_id=None, employee_name=None, start_date=None, end_date=None):
+    # Еталон умови пакетного видалення; продажі з некоректною датою - лише без меж періоду
+    if s.date_key is None:
+        in_period = start_date is None and end_date is None
+    else:
+        in_period = ((start_date is None or date_key(start_date) <= s.date_key)
+                     and (end_date is None or s.date_key <= date_key(end_date)))
+    return (in_period and (book_id is None or s.book_id == book_id)
+            and (employee_name is None or s.employee_name == employee_name))
+
+
+@pytest.mark.parametrize("conditions", [
+    {"book_id": 5, "end_date": "2024-03-31"},
+    {"employee_name": EMPLOYEES[1], "start_date": "2024-02-01", "end_date": "2024-04-30"},
+    {"book_id": 2, "employee_name": EMPLOYEES[3]},
+    {"book_id": None, "start_date": "2024-05-01"},
+    {"start_date": "2024-02-10", "end_date": "2024-02-10"},
+    {"book_id": 999},
+    {"book_id": 77},
+])
+def test_batch_delete_matches_filter(managers, conditions):
+    book_mgr, sale_mgr = managers
+    sales = make_sales()
+    expected = [s for s in sales if not matches(s, **conditions)]
+    assert sale_mgr.remove_sales(**conditions) == len(sales) - len(expected)
+    assert rows(sale_mgr.sales) == rows(s for s in expected if s.date_key is not None)
+    assert rows(sale_mgr.invalid_sales) == rows(s for s in expected if s.date_key is None)
+
+    # Звіти після видалення - як у менеджера, заповненого лише рештою продажів
+    fresh = SaleManager()
+    fresh.set_sales(copy_sales(expected))
+    for start, end in PERIODS:
+        assert rounded(sale_mgr.period_report(start, end, book_mgr, top_n=3)) == \
+            rounded(fresh.period_report(start, end, book_mgr, top_n=3))
+    assert sale_mgr.remove_sales(**conditions) == 0
+
+
+def test_batch_delete_needs_a_condition(managers, capsys):
+    _, sale_mgr = managers
+    with pytest.raises(ValueError):
+        sale_mgr.remove_sales()
+    assert sale_mgr.remove_sales(book_id=1, start_date="2024-13-01") == 0
+    assert "Невірний формат дати" in capsys.readouterr().out
+    assert len(sale_mgr.sales) + len(sale_mgr.invalid_sales) == len(make_sales())
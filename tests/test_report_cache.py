@@ -0,0 +1,82 @@
+import pytest
+
+from columnar_store import ColumnarSaleManager
+from report_cache import ReportCache
+from sqlite_store import connect, create_managers
+from support import EMPLOYEES, PERIODS, copy_sales, make_books, make_sales, rounded
+from var2_2 import Book, BookManager, Sale, SaleManager
+
+
+@pytest.fixture(params=["list", "columnar", "sqlite"])
+def managers(request, tmp_path):
+    if request.param == "sqlite":
+        conn = connect(str(tmp_path / "bookstore.db"))
+        _, book_mgr, sale_mgr = create_managers(conn)
+    else:
+        book_mgr = BookManager()
+        sale_mgr = ColumnarSaleManager() if request.param == "columnar" else SaleManager()
+    book_mgr.set_books(make_books())
+    sale_mgr.set_sales(copy_sales(make_sales()))
+    yield book_mgr, sale_mgr
+    if request.param == "sqlite":
+        conn.close()
+
+
+def reports(source, book_mgr):
+    return rounded({(start, end): (source.period_report(start, end, book_mgr, top_n=3),
+                                   source.most_sold_book(start, end),
+                                   source.best_employee(start, end, top_n=2),
+                                   source.total_profit(start, end, book_mgr),
+                                   source.most_sold_author(start, end, book_mgr),
+                                   source.most_sold_genre(start, end, book_mgr, top_n=2))
+                    for start, end in PERIODS})
+
+
+CHANGES = [
+    lambda book_mgr, sale_mgr: sale_mgr.add_sale(Sale(EMPLOYEES[0], 3, "2024-02-10", 25.0)),
+    lambda book_mgr, sale_mgr: sale_mgr.add_sales([Sale(EMPLOYEES[1], 9, "2024-06-01", 40.0)] * 30),
+    lambda book_mgr, sale_mgr: sale_mgr.remove_sale(1, "2024-02-10"),
+    lambda book_mgr, sale_mgr: sale_mgr.remove_sales(book_id=5, start_date="2024-03-01"),
+    lambda book_mgr, sale_mgr: book_mgr.update_book(2, cost_price=1.0, author="Новий автор"),
+    lambda book_mgr, sale_mgr: book_mgr.update_book(4, genre="Есе"),
+    lambda book_mgr, sale_mgr: book_mgr.remove_book(5),
+    lambda book_mgr, sale_mgr: book_mgr.add_book(Book.from_dict(
+        {"id": 999, "title": "Знайдена", "year": 2020, "author": "Франко", "genre": "Роман",
+         "cost_price": 5.0, "sale_price": 9.0})),
+]
+
+
+def test_cached_reports_follow_every_change(managers):
+    book_mgr, sale_mgr = managers
+    cache = ReportCache(sale_mgr)
+    cache.attach(book_mgr)
+    assert reports(cache, book_mgr) == reports(sale_mgr, book_mgr)
+    for change in CHANGES:
+        change(book_mgr, sale_mgr)
+        assert reports(cache, book_mgr) == reports(sale_mgr, book_mgr)
+    assert cache.hits > 0 and cache.invalidations > 0
+
+
+def test_only_overlapping_periods_are_dropped(managers):
+    book_mgr, sale_mgr = managers
+    cache = ReportCache(sale_mgr)
+    cache.attach(book_mgr)
+    cache.period_report("2023-01-01", "2023-12-31", book_mgr)
+    cache.period_report("2024-01-01", "2024-12-31", book_mgr)
+    sale_mgr.add_sale(Sale(EMPLOYEES[0], 3, "2024-02-10", 25.0))
+    assert cache.stats()["size"] == 1
+    cache.period_report("2023-01-01", "2023-12-31", book_mgr)
+    assert cache.hits == 1
+
+
+def test_lru_evicts_oldest_and_skips_invalid_periods(managers):
+    book_mgr, sale_mgr = managers
+    cache = ReportCache(sale_mgr, maxsize=2)
+    for start, end in PERIODS:
+        cache.total_profit(start, end, book_mgr)
+    assert cache.stats()["size"] == 2
+    cache.total_profit(*PERIODS[2], book_mgr)
+    cache.total_profit(*PERIODS[3], book_mgr)
+    assert cache.hits == 2
+    cache.total_profit(*PERIODS[0], book_mgr)
+    assert cache.hits == 2
@@ -0,0 +1,82 @@
+from collections import Counter
+
+import pytest
+
+from support import EMPLOYEES, PERIODS, make_books, make_sales, rows
+from var2_2 import BookManager, Sale, SaleManager, date_key
+
+
+@pytest.fixture
+def store():
+    book_mgr = BookManager()
+    book_mgr.set_books(make_books())
+    sale_mgr = SaleManager()
+    sale_mgr.set_sales(make_sales())
+    return sale_mgr, book_mgr
+
+
+def scan(sales, start, end):
+    # Еталон: повний перебір продажів, як до індексів
+    lo, hi = date_key(start), date_key(end)
+    if lo is None or hi is None:
+        return []
+    return [s for s in sales if s.date_key is not None and lo <= s.date_key <= hi]
+
+
+@pytest.mark.parametrize("start, end", PERIODS)
+def test_period_queries_match_full_scan(store, start, end):
+    sale_mgr, book_mgr = store
+    expected = scan(make_sales(), start, end)
+    assert rows(sale_mgr.sales_by_period(start, end)) == rows(expected)
+    assert rows(sale_mgr.sales_by_employee(EMPLOYEES[1], start, end)) == \
+        rows(s for s in expected if s.employee_name == EMPLOYEES[1])
+
+    profit = sum(s.real_price - book_mgr.find_book(s.book_id).cost_price
+                 for s in expected if book_mgr.find_book(s.book_id) is not None)
+    assert sale_mgr.total_profit(start, end, book_mgr) == pytest.approx(profit)
+
+    books = Counter(s.book_id for s in expected if s.book_id is not None)
+    top = sale_mgr.most_sold_book(start, end)
+    assert (top is None) == (not books)
+    if top is not None:
+        assert top[1] == books[top[0]] == max(books.values())
+    employees = Counter(s.employee_name for s in expected)
+    assert sale_mgr.employee_leaderboard(start, end) == sorted(employees.items(), key=lambda i: (-i[1], i[0]))
+
+
+def test_invalid_dates_are_kept_aside(store):
+    sale_mgr, _ = store
+    assert [(s.book_id, s.sale_date) for s in sale_mgr.invalid_sales] == [(2, "10.02.2024")]
+    assert all(s.date_key is not None for s in sale_mgr.sales)
+
+
+def test_sales_stay_sorted_after_changes(store):
+    sale_mgr, book_mgr = store
+    sale_mgr.add_sale(Sale(EMPLOYEES[0], 3, "2024-01-01", 20.0))
+    sale_mgr.add_sales([Sale(EMPLOYEES[1], 4, "2024-06-28", 21.0), Sale(EMPLOYEES[2], 5, "2023-12-31", 22.0)])
+    sale_mgr.remove_sale(None, "2024-02-10")
+    removed = sale_mgr.remove_sales(book_id=7, end_date="2024-03-31")
+    assert removed > 0
+    keys = [s.date_key for s in sale_mgr.sales]
+    assert keys == sorted(keys)
+    assert not [s for s in sale_mgr.sales_by_period("2024-01-01", "2024-03-31") if s.book_id == 7]
+    assert not [s for s in sale_mgr.sales_by_period("2024-02-10", "2024-02-10") if s.book_id is None]
+    # Денні агрегати після змін збігаються з агрегатами, побудованими з нуля
+    rebuilt = SaleManager()
+    rebuilt.set_sales(list(sale_mgr.sales))
+    for start, end in PERIODS:
+        assert sale_mgr.period_report(start, end, book_mgr, top_n=3) == \
+            rebuilt.period_report(start, end, book_mgr, top_n=3)
+
+
+@pytest.mark.parametrize("top_n", [None, 1, 3])
+def test_period_report_matches_separate_reports(store, top_n):
+    sale_mgr, book_mgr = store
+    for start, end in PERIODS:
+        assert sale_mgr.period_report(start, end, book_mgr, top_n) == {
+            "most_sold_book": sale_mgr.most_sold_book(start, end, top_n),
+            "best_employee": sale_mgr.best_employee(start, end, top_n),
+            "total_profit": sale_mgr.total_profit(start, end, book_mgr),
+            "most_sold_author": sale_mgr.most_sold_author(start, end, book_mgr, top_n),
+            "most_sold_genre": sale_mgr.most_sold_genre(start, end, book_mgr, top_n),
+        }
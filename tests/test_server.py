@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+
+from server import BookstoreService, HTTPError
+from support import EMPLOYEES, copy_sales, make_books, make_employees, make_sales
+from var2_2 import Store
+
+
+@pytest.fixture
+def service(tmp_path):
+    store = Store(filename=str(tmp_path / "data.json"))
+    store.employee_mgr.set_employees(make_employees())
+    store.book_mgr.set_books(make_books())
+    store.sale_mgr.set_sales(copy_sales(make_sales()))
+    yield BookstoreService(store, report_cache=0)
+    store.close()
+
+
+def call(service, *requests):
+    # Запити виконуються по черзі з працюючим записувачем; помилка - (статус, повідомлення)
+    async def run():
+        writer = asyncio.create_task(service.writer())
+        results = []
+        for method, target, *body in requests:
+            try:
+                results.append(await service.dispatch(method, target, body[0] if body else {}))
+            except HTTPError as e:
+                results.append((e.status, e.message))
+        writer.cancel()
+        return results
+    results = asyncio.run(run())
+    return results if len(results) > 1 else results[0]
+
+
+def test_book_crud_round_trip(service):
+    status, book = call(service, ("POST", "/books", {"title": "Нова", "year": 2020, "author": "Франко",
+                                                     "genre": "Роман", "cost_price": 10, "sale_price": 20}))
+    assert status == 201
+    path = f"/books/{book['id']}"
+    assert call(service, ("GET", path)) == (200, book)
+    status, updated = call(service, ("PATCH", path, {"title": "Перейменована", "cost_price": "12.5"}))
+    assert status == 200 and updated["title"] == "Перейменована" and updated["cost_price"] == 12.5
+    status, found = call(service, ("GET", "/books?q=перейменована"))
+    assert [b["id"] for b in found] == [book["id"]]
+    assert call(service, ("DELETE", path)) == (200, {"removed": book["id"]})
+    assert call(service, ("GET", path))[0] == 404
+    assert call(service, ("DELETE", path))[0] == 404
+
+
+@pytest.mark.parametrize("body", [{"title": None}, {"genre": 5}, {"author": ""}, {"title": "  "},
+                                  {"id": 7}, {"publisher": "x"}, {"year": "давно"}, {"cost_price": "дешево"}])
+def test_invalid_book_update_is_rejected(service, body):
+    before = service.book_mgr.find_book(1).to_dict()
+    status, _ = call(service, ("PATCH", "/books/1", body))
+    assert status == 400
+    assert service.book_mgr.find_book(1).to_dict() == before
+
+
+def test_sale_round_trip_and_missing_sale(service):
+    sale = {"employee_name": EMPLOYEES[0].upper(), "book_id": 3, "sale_date": "2024-07-01", "real_price": 25}
+    assert call(service, ("POST", "/sales", sale)) == (201, {"added": 1})
+    status, sales = call(service, ("GET", "/sales?start=2024-07-01&end=2024-07-01"))
+    assert [s["employee_name"] for s in sales] == [EMPLOYEES[0]]
+    status, removed = call(service, ("DELETE", "/sales?book_id=3&date=2024-07-01"))
+    assert status == 200 and removed["removed"]["count"] == 1
+    assert call(service, ("DELETE", "/sales?book_id=3&date=2024-07-01"))[0] == 404
+    assert call(service, ("GET", "/sales?start=2024-07-01&end=2024-07-01")) == (200, [])
+
+
+def test_validation_and_not_found(service):
+    results = call(service,
+                   ("POST", "/sales", {"employee_name": "Ніхто", "book_id": 1, "sale_date": "2024-01-01",
+                                       "real_price": 1}),
+                   ("POST", "/sales", {"employee_name": EMPLOYEES[0], "book_id": 1, "sale_date": "01.01.2024",
+                                       "real_price": 1}),
+                   ("POST", "/books", {"title": "Без року"}),
+                   ("GET", "/leaderboard?start=2024-01-01&end=2024-12-31&top_n=0"),
+                   ("GET", "/reports?start=2024-01-01&end=2024-13-01"),
+                   ("GET", "/books?limit=-1"),
+                   ("GET", "/books/999"),
+                   ("DELETE", "/employees/Ніхто"),
+                   ("GET", "/reports/unknown?start=2024-01-01&end=2024-12-31"),
+                   ("GET", "/nowhere"),
+                   ("PUT", "/books"))
+    assert [status for status, _ in results] == [400, 400, 400, 400, 400, 400, 404, 404, 404, 404, 405]
+
+
+def test_reports_match_sale_manager(service):
+    status, report = call(service, ("GET", "/reports?start=2024-01-01&end=2024-12-31&top_n=3"))
+    expected = service.sale_mgr.period_report("2024-01-01", "2024-12-31", service.book_mgr, 3)
+    assert status == 200
+    assert json.loads(json.dumps(report)) == json.loads(json.dumps(expected))
+
+
+def test_http_request_over_socket(service):
+    # Повний шлях: розбір запиту, JSON-тіло, статус і заголовки відповіді
+    async def run():
+        writer_task = asyncio.create_task(service.writer())
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        body = json.dumps({"title": None}).encode("utf-8")
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"PATCH /books/1 HTTP/1.1\r\nConnection: close\r\n"
+                     b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        writer_task.cancel()
+        return response
+    head, _, payload = asyncio.run(run()).partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 400 ")
+    assert "title" in json.loads(payload)["error"]
@@ -0,0 +1,98 @@
+import random
+from collections import Counter
+
+import pytest
+
+from sketches import SpaceSaving
+from support import EMPLOYEES, make_books, make_sales
+from var2_2 import BookManager, Sale, SaleManager
+
+
+@pytest.fixture
+def store():
+    book_mgr = BookManager()
+    book_mgr.set_books(make_books())
+    sale_mgr = SaleManager()
+    sale_mgr.set_sales(make_sales())
+    return sale_mgr, book_mgr
+
+
+def skewed_counts(seed, items=200, draws=3000):
+    rnd = random.Random(seed)
+    return Counter(int(rnd.paretovariate(1.2)) % items for _ in range(draws))
+
+
+def assert_bounds(summary, exact, capacity):
+    # Кожна оцінка - верхня межа, оцінка - похибка - нижня; важкі елементи не губляться
+    assert len(summary) <= capacity
+    assert summary.total == sum(exact.values())
+    for item, count, error in summary.top(len(summary)):
+        assert count - error <= exact[item] <= count
+    for item, count in exact.items():
+        if item not in summary.counters:
+            assert count <= summary.floor
+        if count > summary.total / capacity:
+            assert item in summary.counters
+
+
+def test_space_saving_bounds():
+    exact = skewed_counts(1)
+    summary = SpaceSaving.from_counts(exact, 10)
+    assert_bounds(summary, exact, 10)
+    assert any(error for _, _, error in summary.top(10))
+
+
+def test_merged_summaries_keep_bounds():
+    months = [skewed_counts(seed) for seed in range(6)]
+    exact = sum(months, Counter())
+    summary = SpaceSaving.merged([SpaceSaving.from_counts(m, 12) for m in months], 12)
+    assert_bounds(summary, exact, 12)
+    exact_summary = SpaceSaving.merged([SpaceSaving.from_counts(m, None) for m in months], None)
+    assert [(item, count) for item, count, _ in exact_summary.top(5)] == exact.most_common(5)
+
+
+@pytest.mark.parametrize("kind", ["book", "employee", "author", "genre"])
+def test_approx_top_matches_exact_when_capacity_suffices(store, kind):
+    sale_mgr, book_mgr = store
+    start, end = "2023-11-15", "2024-06-10"
+    exact = sale_mgr._counts(kind, *sale_mgr._period_keys(start, end), book_mgr)
+    top = sale_mgr.approx_top(kind, start, end, book_mgr, top_n=None)
+    assert {item: (count, error) for item, count, error in top} == {item: (c, 0) for item, c in exact.items()}
+    assert [count for _, count, _ in top] == sorted(exact.values(), reverse=True)
+
+
+def test_small_sketches_bound_the_error(store):
+    sale_mgr, book_mgr = store
+    sale_mgr.sketch_capacity = 4
+    sale_mgr.add_sales([Sale(EMPLOYEES[0], 5, f"2024-{month:02d}-15", 20.0) for month in range(1, 13)] * 20)
+    start, end = "2023-01-01", "2024-12-31"
+    exact = sale_mgr._counts("book", *sale_mgr._period_keys(start, end), book_mgr)
+    top = sale_mgr.approx_top("book", start, end, book_mgr, top_n=None)
+    assert len(top) == 4
+    for item, count, error in top:
+        assert count - error <= exact[item] <= count
+    heavy = [item for item, count in exact.items() if count > sum(exact.values()) / 4]
+    assert heavy == [5] and 5 in {item for item, _, _ in top}
+
+
+def test_top_n_ties(store):
+    sale_mgr, book_mgr = SaleManager(), store[1]
+    # Книги 1, 2 і 3 продані двічі, книга 4 - один раз: межа top 2 проходить через рівні
+    sale_mgr.set_sales([Sale(EMPLOYEES[i % 3], book_id, f"2024-03-{i + 1:02d}", 20.0)
+                        for i, book_id in enumerate([1, 2, 3, 1, 2, 3, 4])])
+    exact = sale_mgr.most_sold_book("2024-03-01", "2024-03-31", top_n=2)
+    assert [count for _, count in exact] == [2, 2]
+    assert {book_id for book_id, _ in exact} <= {1, 2, 3}
+    approx = sale_mgr.approx_top("book", "2024-01-01", "2024-12-31", book_mgr, top_n=2)
+    assert [(count, error) for _, count, error in approx] == [(2, 0), (2, 0)]
+    assert {book_id for book_id, _, _ in approx} <= {1, 2, 3}
+    assert sale_mgr.most_sold_book("2024-03-01", "2024-03-31", top_n=10)[-1] == (4, 1)
+    assert sale_mgr.approx_top("book", "2024-03-01", "2024-03-31", top_n=10)[-1] == (4, 1, 0)
+
+
+def test_month_summaries_follow_changes(store):
+    sale_mgr, book_mgr = store
+    before = dict((item, count) for item, count, _ in sale_mgr.approx_top("book", "2024-01-01", "2024-12-31"))
+    sale_mgr.add_sales([Sale(EMPLOYEES[0], 12, "2024-02-10", 30.0)] * 500)
+    after = sale_mgr.approx_top("book", "2024-01-01", "2024-12-31")
+    assert after[0][:2] == (12, before.get(12, 0) + 500)
@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from snapshot_bin import load_snapshot, write_snapshot
+from support import apply_changes, copy_sales, make_books, make_employees, make_sales, report_snapshot
+from var2_2 import BookManager, EmployeeManager, Journal, SaleManager, Store, journal_path, save_data
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "var2_2.py")
+
+
+def list_managers():
+    employee_mgr, book_mgr, sale_mgr = EmployeeManager(), BookManager(), SaleManager()
+    employee_mgr.set_employees(make_employees())
+    book_mgr.set_books(make_books())
+    sale_mgr.set_sales(copy_sales(make_sales()))
+    return employee_mgr, book_mgr, sale_mgr
+
+
+@pytest.fixture
+def snapshot_file(tmp_path):
+    filename = str(tmp_path / "data.bin")
+    write_snapshot(filename, *list_managers())
+    return filename
+
+
+def test_reports_match_list_backend(snapshot_file):
+    _, book_mgr, sale_mgr = load_snapshot(snapshot_file)
+    _, ref_books, ref_sales = list_managers()
+    assert [b.to_dict() for b in book_mgr.books] == [b.to_dict() for b in ref_books.books]
+    assert report_snapshot(sale_mgr, book_mgr) == report_snapshot(ref_sales, ref_books)
+
+
+def test_changes_and_journal_replay_match_list_backend(snapshot_file):
+    journal = Journal(journal_path(snapshot_file))
+    _, book_mgr, sale_mgr = load_snapshot(snapshot_file, journal=journal)
+    _, ref_books, ref_sales = list_managers()
+    apply_changes(sale_mgr)
+    apply_changes(ref_sales)
+    journal.close()
+    expected = report_snapshot(ref_sales, ref_books)
+    assert report_snapshot(sale_mgr, book_mgr) == expected
+
+    journal = Journal(journal_path(snapshot_file))
+    _, book_mgr, sale_mgr = load_snapshot(snapshot_file, journal=journal)
+    journal.close()
+    assert report_snapshot(sale_mgr, book_mgr) == expected
+
+
+def test_new_books_continue_snapshot_ids(snapshot_file):
+    # Скрипт запускається як __main__: книга з меню має отримати id після книг знімка
+    menu = "2\n1\nНова\n2024\nФранко\nРоман\n10\n20\n5\n"
+    result = subprocess.run([sys.executable, SCRIPT, "--backend", "binary", "--data", snapshot_file],
+                            input=menu, capture_output=True, text=True, timeout=60)
+    assert "Книгу [13] додано!" in result.stdout
+
+
+def test_json_and_binary_snapshots_keep_separate_journals(tmp_path):
+    json_file, bin_file = str(tmp_path / "data.json"), str(tmp_path / "data.bin")
+    save_data(*list_managers(), json_file)
+    write_snapshot(bin_file, *list_managers())
+    assert journal_path(json_file) != journal_path(bin_file)
+
+    store = Store("json", filename=json_file)
+    store.book_mgr.remove_book(1)
+    store.close()
+    store = Store("binary", filename=bin_file)
+    assert store.book_mgr.find_book(1) is not None
+    store.close()
+
+
+def test_script_classes_pickle_by_module_name(snapshot_file):
+    # Класи скрипта - це var2_2.<клас>: їх можна передати іншому процесу через pickle
+    code = ("import pickle, runpy, sys\n"
+            f"sys.argv = ['var2_2.py', '--backend', 'binary', '--data', {snapshot_file!r}, '--compact']\n"
+            f"script = runpy.run_path({SCRIPT!r}, run_name='__main__')\n"
+            "import var2_2\n"
+            "assert var2_2.Book is script['Book'] and script['Sale'].__module__ == 'var2_2'\n"
+            "sale = pickle.loads(pickle.dumps(script['Sale']('Іван', 1, '2024-01-01', 10.0)))\n"
+            "assert type(sale) is script['Sale']\n"
+            "print('ok')\n")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60,
+                            cwd=os.path.dirname(SCRIPT))
+    assert result.stdout.strip().endswith("ok"), result.stderr
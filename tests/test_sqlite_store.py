@@ -0,0 +1,90 @@
+import pytest
+
+from sqlite_store import connect, create_managers
+from support import EMPLOYEES, apply_changes, copy_sales, make_books, make_employees, make_sales, report_snapshot
+from var2_2 import Book, BookManager, Employee, EmployeeManager, SaleManager
+
+
+@pytest.fixture
+def managers(tmp_path):
+    conn = connect(str(tmp_path / "bookstore.db"))
+    employee_mgr, book_mgr, sale_mgr = create_managers(conn)
+    book_mgr.set_books(make_books())
+    sale_mgr.set_sales(copy_sales(make_sales()))
+    yield employee_mgr, book_mgr, sale_mgr
+    conn.close()
+
+
+def reference():
+    book_mgr = BookManager()
+    book_mgr.set_books(make_books())
+    sale_mgr = SaleManager()
+    sale_mgr.set_sales(copy_sales(make_sales()))
+    return book_mgr, sale_mgr
+
+
+def test_reports_match_list_backend(managers):
+    _, book_mgr, sale_mgr = managers
+    ref_books, ref_sales = reference()
+    assert report_snapshot(sale_mgr, book_mgr) == report_snapshot(ref_sales, ref_books)
+
+
+def test_changes_match_list_backend(managers):
+    _, book_mgr, sale_mgr = managers
+    ref_books, ref_sales = reference()
+    apply_changes(sale_mgr)
+    apply_changes(ref_sales)
+    assert report_snapshot(sale_mgr, book_mgr) == report_snapshot(ref_sales, ref_books)
+    assert [s.to_dict() for s in sale_mgr.invalid_sales] == [s.to_dict() for s in ref_sales.invalid_sales]
+
+
+def test_new_book_gets_free_id_after_reopen(tmp_path, monkeypatch):
+    filename = str(tmp_path / "bookstore.db")
+    conn = connect(filename)
+    create_managers(conn)[1].set_books(make_books())
+    conn.close()
+
+    # Лічильник id у пам'яті відстає від бази (як у другого процесу чи після повторного імпорту модуля)
+    monkeypatch.setattr(Book, "_id_counter", 1)
+    conn = connect(filename)
+    book_mgr = create_managers(conn)[1]
+    book = Book("Нова книга", 2024, "Франко", "Роман", 10.0, 20.0)
+    book_mgr.add_book(book)
+    stale = Book("Ще одна", 2024, "Франко", "Роман", 10.0, 20.0)
+    stale.id = 1
+    book_mgr.add_book(stale)
+    conn.close()
+
+    assert book.id == 13 and stale.id == 14
+    conn = connect(filename)
+    book_mgr = create_managers(conn)[1]
+    assert book_mgr.find_book(1).title == "Книга 1"
+    assert [b.title for b in book_mgr.books[-2:]] == ["Нова книга", "Ще одна"]
+    conn.close()
+
+
+def test_employee_names_match_list_backend(managers):
+    employee_mgr = managers[0]
+    ref = EmployeeManager()
+    employees = make_employees() + [Employee("Straße Ольга", "Касир", "", "")]
+    employee_mgr.set_employees(employees)
+    ref.set_employees(employees)
+    for name in (EMPLOYEES[0].upper(), EMPLOYEES[1].casefold(), "STRASSE ОЛЬГА", "Ніхто"):
+        found, expected = employee_mgr.find_employee(name), ref.find_employee(name)
+        assert (found and found.full_name) == (expected and expected.full_name)
+    employee_mgr.remove_employee(EMPLOYEES[0].upper())
+    assert employee_mgr.find_employee(EMPLOYEES[0]) is not None
+    employee_mgr.remove_employee(EMPLOYEES[0])
+    assert employee_mgr.find_employee(EMPLOYEES[0]) is None
+
+
+def test_lowercase_name_keys_are_migrated(tmp_path):
+    filename = str(tmp_path / "bookstore.db")
+    conn = connect(filename)
+    create_managers(conn)[0].set_employees([Employee("Straße Ольга", "Касир", "", "")])
+    with conn:
+        conn.execute("UPDATE employees SET name_key = lower(full_name)")
+    conn.close()
+    conn = connect(filename)
+    assert create_managers(conn)[0].find_employee("strasse ольга").full_name == "Straße Ольга"
+    conn.close()
@@ -0,0 +1,88 @@
+import csv
+import json
+from collections import Counter
+from datetime import date
+
+import pytest
+
+from support import make_books, make_sales
+from var2_2 import SERIES_FIELDS, BookManager, Sale, SaleManager, export_time_series
+
+
+@pytest.fixture
+def store():
+    book_mgr = BookManager()
+    book_mgr.set_books(make_books())
+    sale_mgr = SaleManager()
+    sale_mgr.set_sales(make_sales())
+    return sale_mgr, book_mgr
+
+
+def period_of(sale_date, granularity):
+    day = date.fromisoformat(sale_date)
+    if granularity == "week":
+        day = date.fromordinal(day.toordinal() - day.weekday())
+    elif granularity == "month":
+        day = day.replace(day=1)
+    return day.isoformat()
+
+
+def scan_series(sales, book_mgr, start, end, granularity):
+    # Еталон: групування сирих продажів за першим днем кроку
+    groups = {}
+    for s in sales:
+        if s.date_key is not None and start <= s.sale_date <= end:
+            groups.setdefault(period_of(s.sale_date, granularity), []).append(s)
+    series = []
+    for period, group in sorted(groups.items()):
+        books = Counter(s.book_id for s in group if s.book_id is not None)
+        profit = sum(s.real_price - book_mgr.find_book(s.book_id).cost_price
+                     for s in group if book_mgr.find_book(s.book_id) is not None)
+        series.append((period, round(sum(s.real_price for s in group), 6), round(profit, 6), len(group),
+                       max(books.values(), default=0)))
+    return series
+
+
+@pytest.mark.parametrize("granularity", ["day", "week", "month"])
+@pytest.mark.parametrize("start, end", [("2024-01-01", "2024-12-31"), ("2024-02-07", "2024-03-12")])
+def test_series_matches_scan(store, granularity, start, end):
+    sale_mgr, book_mgr = store
+    series = sale_mgr.time_series(start, end, book_mgr, granularity)
+    assert [(r["period"], round(r["revenue"], 6), round(r["profit"], 6), r["units"], r["top_book_units"])
+            for r in series] == scan_series(make_sales(), book_mgr, start, end, granularity)
+    for row in series:
+        assert set(row) == set(SERIES_FIELDS)
+
+
+def test_weeks_start_on_monday(store):
+    sale_mgr, book_mgr = store
+    series = sale_mgr.time_series("2024-01-01", "2024-12-31", book_mgr, "week")
+    assert all(date.fromisoformat(r["period"]).weekday() == 0 for r in series)
+
+
+def test_bad_arguments(store):
+    sale_mgr, book_mgr = store
+    with pytest.raises(ValueError):
+        sale_mgr.time_series("2024-01-01", "2024-12-31", book_mgr, "year")
+    assert sale_mgr.time_series("2024-13-01", "2024-12-31", book_mgr) == []
+    assert sale_mgr.time_series("2025-01-01", "2025-12-31", book_mgr) == []
+
+
+def test_export_csv_and_json(store, tmp_path):
+    sale_mgr, book_mgr = store
+    sale_mgr.add_sale(Sale("Іваненко Іван", None, "2024-08-01", 10.0))
+    series = sale_mgr.time_series("2024-05-01", "2024-08-31", book_mgr, "month")
+    assert series[-1]["top_book"] is None and series[-1]["top_book_units"] == 0
+
+    csv_file, json_file = str(tmp_path / "series.CSV"), str(tmp_path / "series.json")
+    export_time_series(series, csv_file)
+    export_time_series(series, json_file)
+    with open(csv_file, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        assert tuple(reader.fieldnames) == SERIES_FIELDS
+        exported = list(reader)
+    assert [r["period"] for r in exported] == [r["period"] for r in series]
+    assert [float(r["revenue"]) for r in exported] == [r["revenue"] for r in series]
+    assert exported[-1]["top_book"] == ""
+    with open(json_file, encoding="utf-8") as f:
+        assert json.load(f) == series
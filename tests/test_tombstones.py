@@ -0,0 +1,78 @@
+import pytest
+
+from support import EMPLOYEES, PERIODS, make_books, make_employees, make_sales, rows
+from var2_2 import BookManager, Employee, EmployeeManager, Sale, SaleManager
+
+
+@pytest.fixture
+def small_compaction(monkeypatch):
+    monkeypatch.setattr("var2_2.COMPACT_MIN", 10)
+
+
+def test_removed_sales_stay_as_tombstones():
+    sale_mgr = SaleManager()
+    sale_mgr.set_sales(make_sales())
+    size = len(sale_mgr._sales)
+    removed = sale_mgr.remove_sales(book_id=4)
+    # Менше за COMPACT_MIN надгробків - список не зсувається, запити їх пропускають
+    assert removed and sale_mgr._dead == removed and len(sale_mgr._sales) == size
+    assert all(s.book_id != 4 for s in sale_mgr.sales_by_period("2024-01-01", "2024-12-31"))
+    assert all(s.book_id != 4 for s in sale_mgr.iter_sales())
+    assert all(d["book_id"] != 4 for d in sale_mgr.snapshot_dicts())
+    assert sale_mgr._dead == removed
+    # Читання sales ущільнює список разом з паралельним списком дат
+    assert len(sale_mgr.sales) == size - removed and sale_mgr._dead == 0
+    assert sale_mgr._keys == [s.date_key for s in sale_mgr._sales]
+
+
+def test_sales_compact_after_quarter_removed(small_compaction):
+    sale_mgr, book_mgr = SaleManager(), BookManager()
+    book_mgr.set_books(make_books())
+    sale_mgr.set_sales(make_sales())
+    reference = SaleManager()
+    reference.set_sales(make_sales())
+    total = len(sale_mgr._sales)
+    for book_id in range(1, 13):
+        sale_mgr.remove_sales(book_id=book_id, end_date="2024-03-31")
+        reference.remove_sales(book_id=book_id, end_date="2024-03-31")
+        assert sale_mgr._dead * 4 <= len(sale_mgr._sales) or sale_mgr._dead <= 10
+    assert len(sale_mgr._sales) < total
+    sale_mgr.add_sale(Sale(EMPLOYEES[0], 3, "2024-02-01", 25.0))
+    reference.add_sale(Sale(EMPLOYEES[0], 3, "2024-02-01", 25.0))
+    assert rows(sale_mgr.sales) == rows(reference.sales)
+    for start, end in PERIODS:
+        assert rows(sale_mgr.sales_by_employee(EMPLOYEES[2], start, end)) == \
+            rows(reference.sales_by_employee(EMPLOYEES[2], start, end))
+        assert sale_mgr.period_report(start, end, book_mgr, 3) == reference.period_report(start, end, book_mgr, 3)
+
+
+def test_remove_sale_by_book_and_date():
+    sale_mgr = SaleManager()
+    sale_mgr.set_sales(make_sales())
+    on_day = [s for s in sale_mgr.sales if s.sale_date == "2024-02-10"]
+    book_id = on_day[-1].book_id
+    expected = [s for s in on_day if s.book_id != book_id]
+    assert sale_mgr.remove_sale(book_id, "2024-02-10") == len(on_day) - len(expected)
+    assert rows(sale_mgr.sales_by_period("2024-02-10", "2024-02-10")) == rows(expected)
+    assert sale_mgr.remove_sale(book_id, "2024-02-10") == 0
+    assert sale_mgr.remove_sale(2, "10.02.2024") == 1
+    assert sale_mgr.invalid_sales == []
+
+
+def test_employee_tombstones_and_duplicates(small_compaction):
+    employee_mgr = EmployeeManager()
+    employee_mgr.set_employees(make_employees())
+    employee_mgr.add_employee(Employee(EMPLOYEES[0].upper(), "Касир", "", ""))
+    employee_mgr.remove_employee(EMPLOYEES[0])
+    # Однакові без регістру імена - різні працівники: видаляється лише точний збіг
+    assert employee_mgr.find_employee(EMPLOYEES[0]).position == "Касир"
+    assert employee_mgr._dead == 1
+    for i in range(40):
+        employee_mgr.add_employee(Employee(f"Тимчасовий {i}", "Стажер", "", ""))
+    for i in range(40):
+        employee_mgr.remove_employee(f"Тимчасовий {i}")
+    assert employee_mgr._dead < 11
+    assert [e.full_name for e in employee_mgr.employees] == list(EMPLOYEES[1:]) + [EMPLOYEES[0].upper()]
+    assert employee_mgr._dead == 0
+    assert all(employee_mgr.find_employee(name) is not None for name in EMPLOYEES)
+    assert employee_mgr.find_employee("Тимчасовий 5") is None
@@ -1,8 +1,9 @@
 #https://github.com/LiuboKu/bookstore_project.git
-import json
 from datetime import datetime
 from collections import Counter
 
+from json_stream import iter_records, write_records
+
 class Employee:
     def __init__(self, full_name, position, phone, email):
         self.full_name = full_name
@@ -167,22 +168,29 @@ class SaleManager:
 
 # ---------------------- Функції для збереження/завантаження ----------------------
 
-def save_data(employee_mgr, book_mgr, sale_mgr, filename="data.json"):
-    data = {
-        "employees": employee_mgr.to_dict(),
-        "books": book_mgr.to_dict(),
-        "sales": sale_mgr.to_dict()
-    }
+def save_data(employee_mgr, book_mgr, sale_mgr, filename="data.json", indent=4):
+    sections = [
+        ("employees", (e.to_dict() for e in employee_mgr.employees)),
+        ("books", (b.to_dict() for b in book_mgr.books)),
+        ("sales", (s.to_dict() for s in sale_mgr.sales))
+    ]
     with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+        write_records(f, sections, indent=indent)
 
 def load_data(employee_mgr, book_mgr, sale_mgr, filename="data.json"):
     try:
+        employees, books, sales = [], [], []
         with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        employee_mgr.from_dict(data.get("employees", []))
-        book_mgr.from_dict(data.get("books", []))
-        sale_mgr.from_dict(data.get("sales", []))
+            for section, record in iter_records(f):
+                if section == "employees":
+                    employees.append(Employee.from_dict(record))
+                elif section == "books":
+                    books.append(Book.from_dict(record))
+                elif section == "sales":
+                    sales.append(Sale.from_dict(record))
+        employee_mgr.employees = employees
+        book_mgr.books = books
+        sale_mgr.sales = sales
     except FileNotFoundError:
         print("Файл даних не знайдено. Створюємо нову базу.")
 
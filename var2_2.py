@@ -1,10 +1,146 @@
+import csv
 import json
-from datetime import datetime
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
 from collections import Counter
+from contextlib import nullcontext
+from itertools import chain, groupby, islice
+from math import fsum
+from operator import attrgetter
+
+from book_search import DEFAULT_LIMIT, SearchIndex
+from json_stream import atomic_open, compression_for, iter_records, open_data, write_records
+from sketches import DEFAULT_CAPACITY, SpaceSaving
+
+
+_DATE_KEYS = {}  # рядок дати -> ординал або None; різних дат у базі небагато
+_DATE_KEYS_MAX = 1 << 16
+
+
+def date_key(date_str):
+    # Дата YYYY-MM-DD -> порядковий номер дня (None, якщо дата некоректна)
+    try:
+        return _DATE_KEYS[date_str]
+    except KeyError:
+        pass
+    except TypeError:
+        return None
+    key = _parse_date(date_str)
+    if len(_DATE_KEYS) >= _DATE_KEYS_MAX:
+        _DATE_KEYS.clear()
+    _DATE_KEYS[date_str] = key
+    return key
+
+
+def _parse_date(date_str):
+    if not isinstance(date_str, str):
+        return None
+    # Швидкий шлях для строгого YYYY-MM-DD; інші записи (2024-1-5 зі старих файлів)
+    # розбирає strptime, як і раніше
+    if len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-":
+        try:
+            return date.fromisoformat(date_str).toordinal()
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").toordinal()
+    except ValueError:
+        return None
+
+
+def month_start(key):
+    return key - date.fromordinal(key).day + 1
+
+
+def month_partitions(start_key, end_key):
+    # Межі місяців [початок, кінець] як ординали днів
+    parts = []
+    day = date.fromordinal(start_key)
+    while day.toordinal() <= end_key:
+        if day.month == 12:
+            next_month = date(day.year + 1, 1, 1)
+        else:
+            next_month = date(day.year, day.month + 1, 1)
+        parts.append((day.toordinal(), min(next_month.toordinal() - 1, end_key)))
+        day = next_month
+    return parts
+
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def bucket_start(key, granularity):
+    # Перший день дня/тижня (понеділок)/місяця, до якого належить ординал key
+    if granularity == "day":
+        return key
+    if granularity == "week":
+        return key - (key - 1) % 7  # ординал 1 (0001-01-01) - понеділок
+    return month_start(key)
+
+
+SERIES_FIELDS = ("period", "revenue", "profit", "units", "top_book", "top_book_units")
+
+
+def series_row(start_key, revenue, profit, units, top):
+    # Рядок динаміки; period - перший день кроку (YYYY-MM-DD), top - (id книги, продажів) або None
+    return {
+        "period": date.fromordinal(start_key).isoformat(),
+        "revenue": revenue,
+        "profit": profit,
+        "units": units,
+        "top_book": top[0] if top else None,
+        "top_book_units": top[1] if top else 0
+    }
+
+
+PAGE_SIZE = 20  # записів на сторінку в меню
+
+
+def paginate(items, page_size=PAGE_SIZE, offset=0):
+    # Сторінки (списки) з ітератора items від offset; кожна читається лише на вимогу
+    items = islice(items, offset, None)
+    while True:
+        page = list(islice(items, page_size))
+        if not page:
+            return
+        yield page
+
+
+def show_pages(items, page_size=None, empty="Нічого не знайдено."):
+    # Друк записів; з page_size - сторінками, з питанням перед кожною наступною
+    if not page_size:
+        pages = iter([list(items)])
+    else:
+        pages = paginate(items, page_size)
+    page = next(pages, None)
+    if not page:
+        print(empty)
+    while page:
+        for item in page:
+            print(item)
+        page = next(pages, None)
+        if page and input("Enter - наступна сторінка, q - досить: ").strip():
+            break
+
+
+COMPACT_MIN = 1024  # менше надгробків не ущільнюємо
+
+
+def needs_compaction(dead, total):
+    # Видалені записи лишаються надгробками (None) і прибираються одним проходом,
+    # коли їх понад чверть: видалення O(1), ущільнення O(n) раз на n/4 видалень
+    return dead > COMPACT_MIN and dead * 4 > total
+
 
 # ---------------------- Класи ----------------------
 
 class Employee:
+    __slots__ = ("full_name", "position", "phone", "email")
+
     def __init__(self, full_name, position, phone, email):
         self.full_name = full_name
         self.position = position
@@ -12,7 +148,12 @@ class Employee:
         self.email = email
 
     def to_dict(self):
-        return self.__dict__
+        return {
+            "full_name": self.full_name,
+            "position": self.position,
+            "phone": self.phone,
+            "email": self.email
+        }
 
     @staticmethod
     def from_dict(data):
@@ -28,6 +169,9 @@ class Employee:
 
 
 class Book:
+    __slots__ = ("id", "title", "year", "author", "genre", "cost_price", "sale_price")
+    EDITABLE = ("title", "year", "author", "genre", "cost_price", "sale_price")
+    REPORT_FIELDS = ("author", "genre", "cost_price")  # поля, від яких залежать звіти
     _id_counter = 1
 
     def __init__(self, title, year, author, genre, cost_price, sale_price):
@@ -41,7 +185,31 @@ class Book:
         self.sale_price = sale_price
 
     def to_dict(self):
-        return self.__dict__
+        return {
+            "id": self.id,
+            "title": self.title,
+            "year": self.year,
+            "author": self.author,
+            "genre": self.genre,
+            "cost_price": self.cost_price,
+            "sale_price": self.sale_price
+        }
+
+    @staticmethod
+    def check_changes(changes):
+        # Перевірка змін для update_book (меню, HTTP, SQLite): текстові поля - непорожні
+        # рядки, бо на них тримаються індекси пошуку і зведення каталогу мережі
+        unknown = set(changes) - set(Book.EDITABLE)
+        if unknown:
+            raise ValueError(f"Поля книги не можна змінити: {', '.join(sorted(unknown))}")
+        for field in ("title", "author", "genre"):
+            if field in changes and not (isinstance(changes[field], str) and changes[field].strip()):
+                raise ValueError(f"Поле {field} має бути непорожнім рядком: {changes[field]!r}")
+        if "year" in changes and (isinstance(changes["year"], bool) or not isinstance(changes["year"], int)):
+            raise ValueError(f"Некоректний рік: {changes['year']!r}")
+        for field in ("cost_price", "sale_price"):
+            if field in changes and (isinstance(changes[field], bool) or not isinstance(changes[field], (int, float))):
+                raise ValueError(f"Поле {field} має бути числом: {changes[field]!r}")
 
     @staticmethod
     def from_dict(data):
@@ -64,14 +232,22 @@ class Book:
 
 
 class Sale:
+    __slots__ = ("employee_name", "book_id", "sale_date", "real_price", "date_key")
+
     def __init__(self, employee_name, book_id, sale_date, real_price):
         self.employee_name = employee_name
         self.book_id = book_id
         self.sale_date = sale_date
         self.real_price = real_price
+        self.date_key = date_key(sale_date)
 
     def to_dict(self):
-        return self.__dict__
+        return {
+            "employee_name": self.employee_name,
+            "book_id": self.book_id,
+            "sale_date": self.sale_date,
+            "real_price": self.real_price
+        }
 
     @staticmethod
     def from_dict(data):
@@ -91,126 +267,837 @@ class Sale:
 
 class EmployeeManager:
     def __init__(self):
-        self.employees = []
+        self._employees = []  # None - надгробок видаленого працівника
+        self._dead = 0
+        self._by_name = {}    # ім'я в casefold -> позиції в _employees у порядку додавання
+        self.journal = None
+
+    @property
+    def employees(self):
+        if self._dead:
+            self._compact()
+        return self._employees
 
     def add_employee(self, emp: Employee):
-        self.employees.append(emp)
+        if self.journal is not None:
+            self.journal.append("add_employee", emp.to_dict())
+        self._by_name.setdefault(emp.full_name.casefold(), []).append(len(self._employees))
+        self._employees.append(emp)
 
     def remove_employee(self, full_name):
-        self.employees = [e for e in self.employees if e.full_name != full_name]
+        if self.journal is not None:
+            self.journal.append("remove_employee", full_name)
+        key = full_name.casefold()
+        kept = []
+        for pos in self._by_name.get(key, ()):
+            if self._employees[pos].full_name == full_name:
+                self._employees[pos] = None
+                self._dead += 1
+            else:
+                kept.append(pos)
+        if kept:
+            self._by_name[key] = kept
+        else:
+            self._by_name.pop(key, None)
+        if needs_compaction(self._dead, len(self._employees)):
+            self._compact()
 
-    def list_employees(self):
-        if not self.employees:
-            print("Список працівників порожній.")
-        for e in self.employees:
-            print(e)
+    def _compact(self):
+        self._employees = [e for e in self._employees if e is not None]
+        self._dead = 0
+        self._reindex()
+
+    def _reindex(self):
+        self._by_name = {}
+        for pos, e in enumerate(self._employees):
+            if e is not None:
+                self._by_name.setdefault(e.full_name.casefold(), []).append(pos)
+
+    def iter_employees(self):
+        return (e for e in self._employees if e is not None)
+
+    def list_employees(self, page_size=None):
+        show_pages(self.iter_employees(), page_size, "Список працівників порожній.")
 
     def find_employee(self, full_name):
-        return next((e for e in self.employees if e.full_name.lower() == full_name.lower()), None)
+        positions = self._by_name.get(full_name.casefold())
+        return self._employees[positions[0]] if positions else None
+
+    def iter_dicts(self):
+        for e in self.employees:
+            yield e.to_dict()
+
+    def snapshot_dicts(self):
+        # Копія для фонового збереження: знімається зараз, читається з іншого потоку.
+        # Працівники не змінюються на місці, тож досить копії списку. Без властивості
+        # employees: ущільнення перебудовує індекси, а їх у цей час читають інші потоки
+        return (e.to_dict() for e in [e for e in self._employees if e is not None])
 
     def to_dict(self):
         return [e.to_dict() for e in self.employees]
 
+    def set_employees(self, employees):
+        self._employees = list(employees)
+        self._dead = 0
+        self._reindex()
+
     def from_dict(self, data):
-        self.employees = [Employee.from_dict(d) for d in data]
+        self.set_employees(Employee.from_dict(d) for d in data)
 
 
 class BookManager:
     def __init__(self):
-        self.books = []
+        self._books = []     # None - надгробок видаленої книги
+        self._dead = 0
+        self._slots = {}     # id -> позиції книг з цим id у _books
+        self._by_id = {}     # id -> книга
+        # Назва, автор, жанр -> {книга: None}: порядок додавання і видалення за O(1).
+        # Ключ - сама книга, а не її id: після імпорту id можуть повторюватись
+        self._by_title = {}
+        self._by_author = {}  # (для фільтрів переліку)
+        self._by_genre = {}
+        self._search = SearchIndex()  # повнотекстовий пошук; не залежить від позицій, тож ущільнення його не чіпає
+        self.journal = None
+        self.report_cache = None
+        self.version = 0  # зростає при кожній зміні, що може вплинути на звіти
+
+    @property
+    def books(self):
+        if self._dead:
+            self._compact()
+        return self._books
+
+    def add_book(self, book: Book):
+        if self.journal is not None:
+            self.journal.append("add_book", book.to_dict())
+        self._slots.setdefault(book.id, []).append(len(self._books))
+        self._books.append(book)
+        self._by_id.setdefault(book.id, book)
+        self._index(book)
+        self._search.add(book)
+        self.version += 1
+        # Продажі могли посилатись на цей id і раніше (книгу видалили й відновили)
+        if self.report_cache is not None:
+            self.report_cache.book_changed(book.id)
+
+    def remove_book(self, book_id):
+        if book_id not in self._by_id:
+            return False
+        if self.journal is not None:
+            self.journal.append("remove_book", book_id)
+        for pos in self._slots.pop(book_id):
+            book = self._books[pos]
+            self._unindex(book)
+            self._search.discard(book)
+            self._books[pos] = None
+            self._dead += 1
+        del self._by_id[book_id]
+        if needs_compaction(self._dead, len(self._books)):
+            self._compact()
+        self.version += 1
+        if self.report_cache is not None:
+            self.report_cache.book_changed(book_id)
+        return True
+
+    def update_book(self, book_id, **changes):
+        Book.check_changes(changes)
+        book = self._by_id.get(book_id)
+        if book is None:
+            return False
+        if self.journal is not None:
+            self.journal.append("update_book", {"id": book_id, **changes})
+        # Книга переходить лише між кошиками змінених полів, без перебудови індексів
+        moved = [f for f in ("title", "author", "genre") if f in changes and changes[f] != getattr(book, f)]
+        if moved:
+            self._unindex(book, moved)
+            self._search.discard(book)
+        for field, value in changes.items():
+            setattr(book, field, value)
+        if moved:
+            self._index(book, moved)
+            self._search.add(book)
+        if set(changes) & set(Book.REPORT_FIELDS):
+            self.version += 1
+            if self.report_cache is not None:
+                self.report_cache.book_changed(book_id)
+        return True
+
+    def _compact(self):
+        self._books = [b for b in self._books if b is not None]
+        self._dead = 0
+        self._reindex()
+
+    def _reindex(self):
+        self._slots = {}
+        self._by_id = {}
+        self._by_title = {}
+        self._by_author = {}
+        self._by_genre = {}
+        for pos, b in enumerate(self._books):
+            if b is not None:
+                self._slots.setdefault(b.id, []).append(pos)
+                self._by_id.setdefault(b.id, b)
+                self._index(b)
+
+    def _index(self, book, fields=("title", "author", "genre")):
+        for field in fields:
+            getattr(self, "_by_" + field).setdefault(getattr(book, field), {})[book] = None
+
+    def _unindex(self, book, fields=("title", "author", "genre")):
+        for field in fields:
+            index = getattr(self, "_by_" + field)
+            value = getattr(book, field)
+            same = index[value]
+            del same[book]
+            if not same:
+                del index[value]
+
+    def iter_books(self, author=None, genre=None):
+        # Фільтр іде через індекс автора чи жанру (менший із двох, якщо задано обидва)
+        if author is None and genre is None:
+            return (b for b in self._books if b is not None)
+        candidates = [self._by_author.get(author, {}) if author is not None else None,
+                      self._by_genre.get(genre, {}) if genre is not None else None]
+        books = min((c for c in candidates if c is not None), key=len)
+        return (b for b in books
+                if (author is None or b.author == author) and (genre is None or b.genre == genre))
+
+    def list_books(self, page_size=None, author=None, genre=None):
+        empty = "Список книг порожній." if author is None and genre is None else "Книг не знайдено."
+        show_pages(self.iter_books(author, genre), page_size, empty)
+
+    def find_book(self, book_id):
+        return self._by_id.get(book_id)
 
-    def list_books(self):
-        if not self.books:
-            print("Список книг порожній.")
+    def find_book_by_title(self, title):
+        books = self._by_title.get(title)
+        return next(iter(books)) if books else None
+
+    def search_books(self, query, limit=DEFAULT_LIMIT):
+        # Найкращі limit книг за словами запиту в назві, авторі чи жанрі
+        return self._search.search(query, limit)
+
+    def iter_dicts(self):
         for b in self.books:
-            print(b)
+            yield b.to_dict()
 
-    def find_book(self, book_id):
-        return next((b for b in self.books if b.id == book_id), None)
+    def snapshot_dicts(self):
+        # Книги змінюються на місці (update_book), тож словники будуються одразу.
+        # Надгробки пропускаються тут, ущільнення лишається тим, хто змінює дані
+        return iter([b.to_dict() for b in self._books if b is not None])
 
     def to_dict(self):
         return [b.to_dict() for b in self.books]
 
+    def set_books(self, books):
+        self._books = list(books)
+        self._dead = 0
+        self._reindex()
+        self._search = SearchIndex()
+        for book in self._books:
+            self._search.add(book)
+        self.version += 1
+        if self.report_cache is not None:
+            self.report_cache.clear()
+
     def from_dict(self, data):
-        self.books = [Book.from_dict(d) for d in data]
+        self.set_books(Book.from_dict(d) for d in data)
+
+
+class DayBucket:
+    # Агрегати продажів за один день (або суму кількох днів).
+    # Прибуток не зберігається: його рахують з виручки за книгами і поточної
+    # собівартості, тож зміна ціни чи видалення книги не псують агрегати.
+    __slots__ = ("books", "book_revenue", "employees", "revenue")
+
+    def __init__(self):
+        self.books = Counter()    # id книги -> кількість продажів
+        self.book_revenue = {}    # id книги -> виручка
+        self.employees = Counter()
+        self.revenue = 0
+
+    def add(self, sale):
+        self.employees[sale.employee_name] += 1
+        self.revenue += sale.real_price
+        if sale.book_id is not None:
+            self.books[sale.book_id] += 1
+            self.book_revenue[sale.book_id] = self.book_revenue.get(sale.book_id, 0) + sale.real_price
+
+    def discard(self, sale):
+        # Зворотне до add. Лічильник, що став нулем, прибирається разом з виручкою
+        # книги, тож похибка віднімання не накопичується після її останнього продажу
+        self.employees[sale.employee_name] -= 1
+        if not self.employees[sale.employee_name]:
+            del self.employees[sale.employee_name]
+        self.revenue -= sale.real_price
+        if sale.book_id is not None:
+            self.books[sale.book_id] -= 1
+            if self.books[sale.book_id]:
+                self.book_revenue[sale.book_id] -= sale.real_price
+            else:
+                del self.books[sale.book_id]
+                del self.book_revenue[sale.book_id]
+
+    @staticmethod
+    def merged(buckets):
+        # Сума агрегатів. Виручка додається через fsum: результат не залежить від
+        # порядку днів (частин, магазинів) і не накопичує похибку по тисячах днів
+        total = DayBucket()
+        revenues, book_revenues = [], {}
+        for bucket in buckets:
+            total.books.update(bucket.books)
+            total.employees.update(bucket.employees)
+            revenues.append(bucket.revenue)
+            for book_id, revenue in bucket.book_revenue.items():
+                book_revenues.setdefault(book_id, []).append(revenue)
+        total.revenue = fsum(revenues)
+        total.book_revenue = {book_id: fsum(values) for book_id, values in book_revenues.items()}
+        return total
+
+    @staticmethod
+    def from_sales(sales):
+        bucket = DayBucket()
+        for s in sales:
+            bucket.add(s)
+        return bucket
+
+    def profit(self, book_manager):
+        terms = []
+        for book_id, revenue in self.book_revenue.items():
+            book = book_manager.find_book(book_id)
+            if book is not None:
+                terms += (revenue, -self.books[book_id] * book.cost_price)
+        return fsum(terms)
 
 
 class SaleManager:
+    sketch_capacity = DEFAULT_CAPACITY  # розмір місячних підсумків для approx_top
+
     def __init__(self):
-        self.sales = []
+        self._sales = []         # відсортовані за датою продажу; None - надгробок видаленого
+        self._keys = []          # ординали дат, паралельно до _sales (і для надгробків)
+        self._dead = 0
+        self._days = {}          # ординал дня -> DayBucket
+        self._day_keys = []      # відсортовані ординали днів з продажами
+        self._by_employee = {}   # працівник -> відсортовані ординали дат його продажів
+        self._employee_sales = {}  # працівник -> його продажі, паралельно до _by_employee
+        self.invalid_sales = []  # продажі з некоректною датою
+        self.journal = None
+        self.report_cache = None  # ReportCache, якому повідомляються змінені дні
+        self._month_tops = {}     # перший день місяця -> {вид рейтингу: (SpaceSaving, версія книг)}
+        self.rows_scanned = 0     # продажів або денних агрегатів, переглянутих запитами (діагностика)
+
+    @property
+    def sales(self):
+        if self._dead:
+            self._compact()
+        return self._sales
 
     def add_sale(self, sale):
-        self.sales.append(sale)
+        if self.journal is not None:
+            self.journal.append("add_sale", sale.to_dict())
+        if sale.date_key is None:
+            print(f"Продаж {sale.book_id} має некоректну дату: {sale.sale_date}")
+            self.invalid_sales.append(sale)
+            return
+        pos = bisect_right(self._keys, sale.date_key)
+        self._keys.insert(pos, sale.date_key)
+        self._sales.insert(pos, sale)
+        self._index_employee([sale])
+        bucket = self._days.get(sale.date_key)
+        if bucket is None:
+            bucket = self._days[sale.date_key] = DayBucket()
+            insort(self._day_keys, sale.date_key)
+        bucket.add(sale)
+        self._changed([sale.date_key])
+
+    def add_sales(self, sales):
+        # Пакетне додавання: одне злиття відсортованих списків замість вставки кожного продажу
+        sales = list(sales)
+        if self.journal is not None:
+            self.journal.append("add_sales", [s.to_dict() for s in sales])
+        batch = self._quarantine(sales)
+        if not batch:
+            return
+        batch.sort(key=attrgetter("date_key"))
+        in_order = not self._keys or batch[0].date_key >= self._keys[-1]
+        if not in_order and self._dead:
+            self._compact()
+        self._sales.extend(batch)
+        if in_order:
+            self._keys.extend(s.date_key for s in batch)
+        else:
+            # Два відсортовані прогони: сортування (стабільне) просто зливає їх
+            self._sales.sort(key=attrgetter("date_key"))
+            self._keys = [s.date_key for s in self._sales]
+        self._index_employee(batch)
+        new_days = False
+        for s in batch:
+            bucket = self._days.get(s.date_key)
+            if bucket is None:
+                bucket = self._days[s.date_key] = DayBucket()
+                new_days = True
+            bucket.add(s)
+        if new_days:
+            self._day_keys = sorted(self._days)
+        self._changed(s.date_key for s in batch)
+
+    def set_sales(self, sales):
+        self.invalid_sales = []
+        valid = self._quarantine(sales)
+        valid.sort(key=attrgetter("date_key"))
+        self._sales = valid
+        self._keys = [s.date_key for s in valid]
+        self._dead = 0
+        self._by_employee = {}
+        self._employee_sales = {}
+        self._index_employee(valid)
+        self._days = {}
+        for s in valid:
+            bucket = self._days.get(s.date_key)
+            if bucket is None:
+                bucket = self._days[s.date_key] = DayBucket()
+            bucket.add(s)
+        self._day_keys = list(self._days)
+        self._reset()
 
     def remove_sale(self, book_id, sale_date):
-        self.sales = [s for s in self.sales if not (s.book_id == book_id and s.sale_date == sale_date)]
+        # Повертає кількість видалених продажів (усі продажі книги за цей день)
+        if self.journal is not None:
+            self.journal.append("remove_sale", {"book_id": book_id, "sale_date": sale_date})
+        key = date_key(sale_date)
+        if key is None:
+            before = len(self.invalid_sales)
+            self.invalid_sales = [s for s in self.invalid_sales
+                                  if not (s.book_id == book_id and s.sale_date == sale_date)]
+            return before - len(self.invalid_sales)
+        # Денні агрегати - індекс (книга, день): якщо такої пари немає, нічого не скануємо
+        bucket = self._days.get(key)
+        if bucket is None or (book_id is not None and book_id not in bucket.books):
+            return 0
+        lo = bisect_left(self._keys, key)
+        hi = bisect_right(self._keys, key, lo)
+        self.rows_scanned += hi - lo
+        return self._remove_where(lo, hi, lambda s: s.book_id == book_id)
+
+    def remove_sales(self, book_id=None, employee_name=None, start_date=None, end_date=None):
+        # Пакетне видалення за один прохід: продажі книги і/або працівника за період
+        # (межі включно, будь-яку можна пропустити). Без меж періоду видаляються й
+        # такі ж продажі з некоректною датою. Повертає кількість видалених.
+        if book_id is None and employee_name is None and start_date is None and end_date is None:
+            raise ValueError("Потрібна хоча б одна умова видалення продажів.")
+        if self.journal is not None:
+            self.journal.append("remove_sales", {"book_id": book_id, "employee_name": employee_name,
+                                                 "start_date": start_date, "end_date": end_date})
+        keys = self._open_period_keys(start_date, end_date)
+        if keys is None:
+            return 0
+
+        def match(s):
+            return ((book_id is None or s.book_id == book_id)
+                    and (employee_name is None or s.employee_name == employee_name))
+        removed = 0
+        if start_date is None and end_date is None:
+            before = len(self.invalid_sales)
+            self.invalid_sales = [s for s in self.invalid_sales if not match(s)]
+            removed = before - len(self.invalid_sales)
+        if book_id is None and employee_name is None:
+            lo = bisect_left(self._keys, keys[0])
+            hi = bisect_right(self._keys, keys[1], lo)
+            self.rows_scanned += hi - lo
+            return removed + self._remove_where(lo, hi, match)
+        # Проходимо лише дні, де є продажі цієї книги чи працівника (за денними агрегатами)
+        lo = bisect_left(self._day_keys, keys[0])
+        hi = bisect_right(self._day_keys, keys[1], lo)
+        days = [day for day in self._day_keys[lo:hi]
+                if (book_id is None or book_id in self._days[day].books)
+                and (employee_name is None or employee_name in self._days[day].employees)]
+        for day in days:
+            lo = bisect_left(self._keys, day)
+            hi = bisect_right(self._keys, day, lo)
+            self.rows_scanned += hi - lo
+            removed += self._remove_where(lo, hi, match)
+        return removed
 
-    def list_sales(self):
-        if not self.sales:
-            print("Список продажів порожній.")
-        for s in self.sales:
-            print(s)
+    @staticmethod
+    def _open_period_keys(start_date, end_date):
+        # Як _period_keys, але пропущена межа (None) - відкритий край
+        first = 1 if start_date is None else date_key(start_date)
+        last = date.max.toordinal() if end_date is None else date_key(end_date)
+        if first is None or last is None:
+            print("Невірний формат дати! Використовуйте YYYY-MM-DD.")
+            return None
+        return first, last
+
+    def _remove_where(self, lo, hi, match):
+        # Видалені продажі в [lo, hi) стають надгробками: список не зсувається,
+        # а денні агрегати зменшуються на видалені продажі
+        sales = self._sales
+        removed = []
+        for i in range(lo, hi):
+            s = sales[i]
+            if s is not None and match(s):
+                sales[i] = None
+                removed.append(s)
+        if not removed:
+            return 0
+        self._dead += len(removed)
+        self._unindex_employees(removed)
+        emptied = []
+        for s in removed:
+            bucket = self._days[s.date_key]
+            bucket.discard(s)
+            if not bucket.employees:
+                del self._days[s.date_key]
+                emptied.append(s.date_key)
+        if len(emptied) == 1:
+            del self._day_keys[bisect_left(self._day_keys, emptied[0])]
+        elif emptied:
+            self._day_keys = [key for key in self._day_keys if key in self._days]
+        if needs_compaction(self._dead, len(sales)):
+            self._compact()
+        self._changed(s.date_key for s in removed)
+        return len(removed)
+
+    def _compact(self):
+        self._sales = [s for s in self._sales if s is not None]
+        self._keys = [s.date_key for s in self._sales]
+        self._dead = 0
+
+    def _index_employee(self, sales):
+        # sales відсортовані за датою. Продажі, не старші за наявні, дописуються
+        # в кінець списків працівника; інакше його списки пересортовуються
+        grouped = {}
+        for s in sales:
+            grouped.setdefault(s.employee_name, []).append(s)
+        for name, batch in grouped.items():
+            keys = self._by_employee.get(name)
+            if keys is None:
+                keys = self._by_employee[name] = []
+                self._employee_sales[name] = []
+            own = self._employee_sales[name]
+            in_order = not keys or batch[0].date_key >= keys[-1]
+            own.extend(batch)
+            if in_order:
+                keys.extend(s.date_key for s in batch)
+            else:
+                own.sort(key=attrgetter("date_key"))
+                keys[:] = [s.date_key for s in own]
+
+    def _unindex_employees(self, removed):
+        grouped = {}
+        for s in removed:
+            grouped.setdefault(s.employee_name, []).append(s)
+        for name, gone in grouped.items():
+            keys = self._by_employee[name]
+            own = self._employee_sales[name]
+            if len(gone) * 64 < len(own):
+                # Кілька продажів: кожен знаходимо bisect-ом серед продажів того ж дня
+                for sale in gone:
+                    lo = bisect_left(keys, sale.date_key)
+                    pos = next(i for i in range(lo, len(own)) if own[i] is sale)
+                    del keys[pos]
+                    del own[pos]
+            else:
+                gone = {id(s) for s in gone}
+                own[:] = [s for s in own if id(s) not in gone]
+                keys[:] = [s.date_key for s in own]
+            if not keys:
+                del self._by_employee[name]
+                del self._employee_sales[name]
+
+    def _quarantine(self, sales):
+        # Продажі з некоректною датою відкладаються в invalid_sales один раз, при
+        # надходженні; запити за період працюють лише з ординалами коректних дат
+        valid = []
+        invalid = self.invalid_sales
+        before = len(invalid)
+        for s in sales:
+            if s.date_key is None:
+                invalid.append(s)
+            else:
+                valid.append(s)
+        if len(invalid) > before:
+            print(f"Відкладено продажів з некоректною датою: {len(invalid) - before}")
+        return valid
+
+    def _changed(self, day_keys):
+        # Після зміни продажів за ці дні: скинути місячні підсумки і записи кешу звітів
+        day_keys = {key for key in day_keys if key is not None}
+        for key in {month_start(key) for key in day_keys}:
+            self._month_tops.pop(key, None)
+        if self.report_cache is not None:
+            self.report_cache.sales_changed(day_keys)
+
+    def _reset(self):
+        self._month_tops = {}
+        if self.report_cache is not None:
+            self.report_cache.clear()
+
+    def iter_sales(self, start_date=None, end_date=None, employee_name=None, book_id=None):
+        # Лінивий перелік продажів за датою (межі включно, будь-яку можна пропустити).
+        # Працівник - через його індекс, книга - лише дні, де вона продавалась
+        keys = self._open_period_keys(start_date, end_date)
+        if keys is None:
+            return
+        if employee_name is not None:
+            own_keys = self._by_employee.get(employee_name, [])
+            lo = bisect_left(own_keys, keys[0])
+            hi = bisect_right(own_keys, keys[1], lo)
+            sales, ranges = self._employee_sales.get(employee_name, []), [(lo, hi)]
+        elif book_id is not None:
+            lo = bisect_left(self._day_keys, keys[0])
+            hi = bisect_right(self._day_keys, keys[1], lo)
+            sales, ranges = self._sales, ((bisect_left(self._keys, day), bisect_right(self._keys, day))
+                                          for day in self._day_keys[lo:hi] if book_id in self._days[day].books)
+        else:
+            lo = bisect_left(self._keys, keys[0])
+            sales, ranges = self._sales, [(lo, bisect_right(self._keys, keys[1], lo))]
+        for lo, hi in ranges:
+            for i in range(lo, hi):
+                s = sales[i]
+                if s is not None and (book_id is None or s.book_id == book_id):
+                    yield s
+
+    def iter_invalid_sales(self, employee_name=None, book_id=None):
+        return (s for s in self.invalid_sales
+                if (employee_name is None or s.employee_name == employee_name)
+                and (book_id is None or s.book_id == book_id))
+
+    def list_sales(self, page_size=None, start_date=None, end_date=None, employee_name=None, book_id=None):
+        sales = self.iter_sales(start_date, end_date, employee_name, book_id)
+        if start_date is None and end_date is None:
+            # Продажі з некоректною датою - після решти, коли період не задано
+            invalid = (f"{s} (некоректна дата)" for s in self.iter_invalid_sales(employee_name, book_id))
+            sales = chain(sales, invalid)
+        filtered = any(f is not None for f in (start_date, end_date, employee_name, book_id))
+        show_pages(sales, page_size, "Продажів не знайдено." if filtered else "Список продажів порожній.")
 
-    def sales_by_period(self, start_date, end_date):
-        try:
-            start = datetime.strptime(start_date, "%Y-%m-%d")
-            end = datetime.strptime(end_date, "%Y-%m-%d")
-        except ValueError:
+    @staticmethod
+    def _period_keys(start_date, end_date):
+        # Ординали меж періоду або None (з повідомленням), якщо дата некоректна
+        start = date_key(start_date)
+        end = date_key(end_date)
+        if start is None or end is None:
             print("Невірний формат дати! Використовуйте YYYY-MM-DD.")
+            return None
+        return start, end
+
+    def _period_bounds(self, start_date, end_date):
+        # Межі [lo, hi) продажів періоду у відсортованому індексі або None
+        keys = self._period_keys(start_date, end_date)
+        if keys is None:
+            return None
+        lo = bisect_left(self._keys, keys[0])
+        hi = bisect_right(self._keys, keys[1], lo)
+        self.rows_scanned += hi - lo
+        return lo, hi
+
+    def sales_by_period(self, start_date, end_date):
+        bounds = self._period_bounds(start_date, end_date)
+        if bounds is None:
+            return []
+        sales = self._sales[bounds[0]:bounds[1]]
+        return [s for s in sales if s is not None] if self._dead else sales
+
+    def _period_totals(self, start_date, end_date):
+        # Сума денних агрегатів за період: O(днів), а не O(продажів)
+        keys = self._period_keys(start_date, end_date)
+        if keys is None:
+            return DayBucket()
+        lo = bisect_left(self._day_keys, keys[0])
+        hi = bisect_right(self._day_keys, keys[1], lo)
+        self.rows_scanned += hi - lo
+        return DayBucket.merged(self._days[day] for day in self._day_keys[lo:hi])
+
+    def sells_book(self, book_id, start_date, end_date):
+        # Чи є за період продажі книги (для точкового скидання кешу звітів)
+        keys = self._period_keys(start_date, end_date)
+        if keys is None:
+            return False
+        lo = bisect_left(self._day_keys, keys[0])
+        hi = bisect_right(self._day_keys, keys[1], lo)
+        return any(book_id in self._days[day].books for day in self._day_keys[lo:hi])
+
+    # ---------------------- Продажі працівника ----------------------
+
+    def sales_by_employee(self, employee_name, start_date, end_date):
+        # O(log n + k) за індексом працівника
+        keys = self._period_keys(start_date, end_date)
+        own_keys = self._by_employee.get(employee_name)
+        if keys is None or own_keys is None:
             return []
+        lo = bisect_left(own_keys, keys[0])
+        hi = bisect_right(own_keys, keys[1], lo)
+        self.rows_scanned += hi - lo
+        return self._employee_sales[employee_name][lo:hi]
+
+    def employee_leaderboard(self, start_date, end_date, top_n=None):
+        # [(працівник, кількість продажів)] за спаданням, при рівності - за ім'ям.
+        # Два bisect в індексі кожного працівника: O(працівників * log n), а не O(продажів)
+        keys = self._period_keys(start_date, end_date)
+        if keys is None:
+            return []
+        board = []
+        for name, own_keys in self._by_employee.items():
+            count = bisect_right(own_keys, keys[1]) - bisect_left(own_keys, keys[0])
+            if count:
+                board.append((name, count))
+        self.rows_scanned += len(self._by_employee)
+        board.sort(key=lambda item: (-item[1], item[0]))
+        return board if top_n is None else board[:top_n]
 
-        result = []
-        for s in self.sales:
-            try:
-                sale_dt = datetime.strptime(s.sale_date, "%Y-%m-%d")
-                if start <= sale_dt <= end:
-                    result.append(s)
-            except ValueError:
-                print(f"Продаж {s.book_id} має некоректну дату: {s.sale_date}")
-        return result
+    @staticmethod
+    def _grouped(book_counts, book_manager, attr):
+        # Кількість продажів за автором/жанром з лічильника книг
+        counter = Counter()
+        for book_id, count in book_counts.items():
+            book = book_manager.find_book(book_id)
+            if book is not None:
+                counter[getattr(book, attr)] += count
+        return counter
+
+    @staticmethod
+    def _top(counter, top_n):
+        if top_n is None:
+            return counter.most_common(1)[0] if counter else None
+        return counter.most_common(top_n)
 
-    def most_sold_book(self, start_date, end_date):
-        sales = self.sales_by_period(start_date, end_date)
-        counter = Counter([s.book_id for s in sales if s.book_id is not None])
-        return counter.most_common(1)[0] if counter else None
+    # top_n=None -> одна пара (або None), інакше список з top_n пар за спаданням
 
-    def best_employee(self, start_date, end_date):
-        sales = self.sales_by_period(start_date, end_date)
-        counter = Counter([s.employee_name for s in sales])
-        return counter.most_common(1)[0] if counter else None
+    def most_sold_book(self, start_date, end_date, top_n=None):
+        return self._top(self._period_totals(start_date, end_date).books, top_n)
+
+    def best_employee(self, start_date, end_date, top_n=None):
+        return self._top(self._period_totals(start_date, end_date).employees, top_n)
 
     def total_profit(self, start_date, end_date, book_manager):
-        sales = self.sales_by_period(start_date, end_date)
-        profit = 0
-        for s in sales:
-            book = next((b for b in book_manager.books if b.id == s.book_id), None)
-            if book:
-                profit += s.real_price - book.cost_price
-        return profit
-
-    def most_sold_author(self, start_date, end_date, book_manager):
-        sales = self.sales_by_period(start_date, end_date)
-        authors = [
-            next((b.author for b in book_manager.books if b.id == s.book_id), None)
-            for s in sales
-        ]
-        counter = Counter([a for a in authors if a is not None])
-        return counter.most_common(1)[0] if counter else None
-
-    def most_sold_genre(self, start_date, end_date, book_manager):
-        sales = self.sales_by_period(start_date, end_date)
-        genres = [
-            next((b.genre for b in book_manager.books if b.id == s.book_id), None)
-            for s in sales
-        ]
-        counter = Counter([g for g in genres if g is not None])
-        return counter.most_common(1)[0] if counter else None
+        return self._period_totals(start_date, end_date).profit(book_manager)
+
+    def most_sold_author(self, start_date, end_date, book_manager, top_n=None):
+        books = self._period_totals(start_date, end_date).books
+        return self._top(self._grouped(books, book_manager, "author"), top_n)
+
+    def most_sold_genre(self, start_date, end_date, book_manager, top_n=None):
+        books = self._period_totals(start_date, end_date).books
+        return self._top(self._grouped(books, book_manager, "genre"), top_n)
+
+    # ---------------------- Наближені рейтинги ----------------------
+
+    def _counts(self, kind, first_key, last_key, book_manager):
+        # Точний Counter виду kind ("book", "employee", "author", "genre") за дні [first_key, last_key]
+        total = self._period_totals(date.fromordinal(first_key).isoformat(),
+                                    date.fromordinal(last_key).isoformat())
+        if kind == "book":
+            return total.books
+        if kind == "employee":
+            return total.employees
+        return self._grouped(total.books, book_manager, kind)
+
+    def _month_top(self, kind, first_key, last_key, book_manager):
+        # Підсумок повного місяця будується один раз і живе до зміни продажів місяця
+        # (для авторів і жанрів - також до зміни книг)
+        version = None if kind in ("book", "employee") else (id(book_manager), book_manager.version)
+        tops = self._month_tops.setdefault(first_key, {})
+        entry = tops.get(kind)
+        if entry is None or entry[1] != version:
+            counts = self._counts(kind, first_key, last_key, book_manager)
+            entry = tops[kind] = (SpaceSaving.from_counts(counts, self.sketch_capacity), version)
+        return entry[0]
+
+    def approx_top(self, kind, start_date, end_date, book_manager=None, top_n=10):
+        # Наближений топ за довгий період з місячних підсумків Space-Saving обмеженого
+        # розміру; неповні місяці на краях періоду рахуються точно, результат об'єднання
+        # теж обмежений sketch_capacity лічильниками.
+        # Повертає [(елемент, оцінка, похибка)]: справжня кількість у [оцінка - похибка, оцінка].
+        if kind not in ("book", "employee", "author", "genre"):
+            raise ValueError(f"Невідомий вид рейтингу: {kind}")
+        keys = self._period_keys(start_date, end_date)
+        if keys is None:
+            return []
+        parts = []
+        for first, last in month_partitions(*keys):
+            if first == month_start(first) and month_start(last + 1) == last + 1:
+                parts.append(self._month_top(kind, first, last, book_manager))
+            else:
+                parts.append(SpaceSaving.from_counts(self._counts(kind, first, last, book_manager), None))
+        return SpaceSaving.merged(parts, self.sketch_capacity).top(top_n)
+
+    # ---------------------- Динаміка ----------------------
+
+    def time_series(self, start_date, end_date, book_manager, granularity="month"):
+        # Виручка, прибуток, кількість продажів і найпопулярніша книга за кожен
+        # день, тиждень чи місяць періоду - одним проходом по денних агрегатах
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Невідомий крок динаміки: {granularity}")
+        keys = self._period_keys(start_date, end_date)
+        if keys is None:
+            return []
+        return self._series(self._day_buckets(*keys), book_manager, granularity)
+
+    def _day_buckets(self, first_key, last_key):
+        lo = bisect_left(self._day_keys, first_key)
+        hi = bisect_right(self._day_keys, last_key, lo)
+        self.rows_scanned += hi - lo
+        return ((day, self._days[day]) for day in self._day_keys[lo:hi])
+
+    @staticmethod
+    def _bucket_days(sales):
+        # (день, DayBucket) з відсортованих за датою продажів - для сховищ без денних агрегатів
+        for day, group in groupby(sales, key=attrgetter("date_key")):
+            yield day, DayBucket.from_sales(group)
+
+    @staticmethod
+    def _series(day_buckets, book_manager, granularity):
+        rows = []
+        current, books, revenue, profit, units = None, Counter(), [], [], 0
+        for day, bucket in day_buckets:
+            start = bucket_start(day, granularity)
+            if start != current:
+                if current is not None:
+                    rows.append(series_row(current, fsum(revenue), fsum(profit), units, SaleManager._top(books, None)))
+                current, books, revenue, profit, units = start, Counter(), [], [], 0
+            books.update(bucket.books)
+            revenue.append(bucket.revenue)
+            profit.append(bucket.profit(book_manager))
+            units += sum(bucket.employees.values())
+        if current is not None:
+            rows.append(series_row(current, fsum(revenue), fsum(profit), units, SaleManager._top(books, None)))
+        return rows
+
+    def period_report(self, start_date, end_date, book_manager, top_n=None):
+        # Усі п'ять звітів з одного злиття денних агрегатів.
+        # top_n=None -> як у окремих методах (одна пара або None), інакше списки top_n пар.
+        return self._report(self._period_totals(start_date, end_date), book_manager, top_n)
+
+    @classmethod
+    def _report(cls, total, book_manager, top_n=None):
+        return {
+            "most_sold_book": cls._top(total.books, top_n),
+            "best_employee": cls._top(total.employees, top_n),
+            "total_profit": total.profit(book_manager),
+            "most_sold_author": cls._top(cls._grouped(total.books, book_manager, "author"), top_n),
+            "most_sold_genre": cls._top(cls._grouped(total.books, book_manager, "genre"), top_n)
+        }
+
+    def iter_dicts(self):
+        for s in self.sales:
+            yield s.to_dict()
+        for s in self.invalid_sales:
+            yield s.to_dict()
+
+    def snapshot_dicts(self):
+        # Продажі не змінюються на місці: копії списків достатньо.
+        # Надгробки пропускаються тут, ущільнення лишається тим, хто змінює дані
+        sales = [s for s in self._sales if s is not None]
+        invalid = list(self.invalid_sales)
+        return (s.to_dict() for s in chain(sales, invalid))
 
     def to_dict(self):
-        return [s.to_dict() for s in self.sales]
+        return [s.to_dict() for s in self.sales] + [s.to_dict() for s in self.invalid_sales]
 
     def from_dict(self, data):
-        self.sales = [Sale.from_dict(d) for d in data]
+        self.set_sales([Sale.from_dict(d) for d in data])
 
 
 # ---------------------- Клас для дій з книгами ----------------------
@@ -227,19 +1114,71 @@ class BookActions:
         cost_price = self.get_valid_float("Собівартість: ")
         sale_price = self.get_valid_float("Ціна продажу: ")
         book = Book(title, year, author, genre, cost_price, sale_price)
-        self.book_manager.books.append(book)
+        self.book_manager.add_book(book)
         print(f"Книгу [{book.id}] додано!")
 
     def remove_book(self):
         book_id = self.get_valid_int("Введіть ID книги для видалення: ")
-        before = len(self.book_manager.books)
-        self.book_manager.books = [b for b in self.book_manager.books if b.id != book_id]
-        after = len(self.book_manager.books)
-        if before == after:
+        if not self.book_manager.remove_book(book_id):
             print(f"Книга з ID {book_id} не знайдена.")
         else:
             print(f"Книгу [{book_id}] видалено!")
 
+    def edit_book(self):
+        book_id = self.get_valid_int("Введіть ID книги для зміни: ")
+        book = self.book_manager.find_book(book_id)
+        if book is None:
+            print(f"Книга з ID {book_id} не знайдена.")
+            return
+        print("Порожнє значення - без змін.")
+        changes = {}
+        for field, prompt in (("author", "Автор"), ("genre", "Жанр")):
+            value = input(f"{prompt} [{getattr(book, field)}]: ")
+            if value:
+                changes[field] = value
+        for field, prompt in (("cost_price", "Собівартість"), ("sale_price", "Ціна продажу")):
+            while True:
+                value = input(f"{prompt} [{getattr(book, field)}]: ")
+                if not value:
+                    break
+                try:
+                    changes[field] = float(value)
+                    break
+                except ValueError:
+                    print("Будь ласка, введіть число!")
+        if changes:
+            self.book_manager.update_book(book_id, **changes)
+        print(f"Книгу [{book_id}] оновлено!")
+
+    def search_books(self):
+        query = input("Пошук (слова з назви, автора чи жанру): ")
+        books = self.book_manager.search_books(query)
+        if not books:
+            print("Нічого не знайдено.")
+        for book in books:
+            print(book)
+
+    def choose_book(self):
+        # ID книги або пошуковий запит з вибором зі знайдених; None - книгу не вибрано
+        query = input("ID книги або пошук за назвою/автором/жанром: ").strip()
+        if query.isdigit():
+            book = self.book_manager.find_book(int(query))
+            if book is None:
+                print(f"Книга з ID {query} не знайдена.")
+            return book
+        books = self.book_manager.search_books(query)
+        if not books:
+            print("Нічого не знайдено.")
+            return None
+        for number, book in enumerate(books, 1):
+            print(f"{number}. {book}")
+        choice = input("Номер книги у списку (порожньо - скасувати): ").strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(books):
+            return books[int(choice) - 1]
+        if choice:
+            print("Невірний вибір.")
+        return None
+
     @staticmethod
     def get_valid_int(prompt):
         while True:
@@ -272,53 +1211,634 @@ class BookActions:
 
 # ---------------------- Збереження/завантаження ----------------------
 
-def save_data(employee_mgr, book_mgr, sale_mgr, filename="data.json"):
-    data = {
-        "employees": employee_mgr.to_dict(),
-        "books": book_mgr.to_dict(),
-        "sales": sale_mgr.to_dict()
-    }
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-
-
-def load_data(employee_mgr, book_mgr, sale_mgr, filename="data.json"):
+def save_data(employee_mgr, book_mgr, sale_mgr, filename="data.json", indent=4, journal=None, compress=None):
+    # З журналом це стискання: знімок фіксує номер останнього запису журналу,
+    # після чого журнал очищується. compress - "gzip", "lzma" або None (за розширенням файлу)
+    sections = [
+        ("employees", employee_mgr.iter_dicts()),
+        ("books", book_mgr.iter_dicts()),
+        ("sales", sale_mgr.iter_dicts())
+    ]
+    write_data_file(filename, sections, journal.seq if journal is not None else None, indent, compress)
+    if journal is not None:
+        journal.truncate()
+
+
+def write_data_file(filename, sections, journal_seq=None, indent=4, compress=None):
+    # Атомарний запис знімка: тимчасовий файл, fsync, перейменування
+    extras = {"journal_seq": journal_seq} if journal_seq is not None else None
+    with atomic_open(filename, compress or compression_for(filename)) as f:
+        write_records(f, sections, extras, indent=indent)
+
+
+def load_data(employee_mgr, book_mgr, sale_mgr, filename="data.json", journal=None):
+    # З журналом після знімка відтворюються записи, новіші за збережений у ньому номер
+    employees, books, sales = [], [], []
+    legacy = []  # продажі старого формату з назвою книги замість id
+    extras = {}
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        with open_data(filename) as f:
+            for section, s in iter_records(f, extras):
+                if section == "employees":
+                    employees.append(Employee.from_dict(s))
+                elif section == "books":
+                    books.append(Book.from_dict(s))
+                elif section == "sales":
+                    sale = Sale(
+                        s.get('employee_name', ''),
+                        s.get('book_id'),
+                        s.get('sale_date', ''),
+                        s.get('real_price', 0.0)
+                    )
+                    if sale.book_id is None and 'book_title' in s:
+                        legacy.append((sale, s['book_title']))
+                    sales.append(sale)
     except FileNotFoundError:
         print("Файл даних не знайдено. Створюємо нову базу.")
-        return
+    else:
+        employee_mgr.set_employees(employees)
+        book_mgr.set_books(books)
+        for sale, title in legacy:
+            found = book_mgr.find_book_by_title(title)
+            sale.book_id = found.id if found else None
+        sale_mgr.set_sales(sales)
+
+    if journal is not None:
+        journal.replay(employee_mgr, book_mgr, sale_mgr, after_seq=extras.get("journal_seq", 0))
+        journal.attach(employee_mgr, book_mgr, sale_mgr)
+
+
+def export_time_series(rows, filename):
+    # CSV для таблиць (за розширенням .csv), інакше JSON
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        if filename.lower().endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=SERIES_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, f, ensure_ascii=False, indent=4)
+
+
+# ---------------------- Журнал змін ----------------------
+
+def journal_path(filename):
+    # Повне ім'я знімка: у data.json і data.bin в одній теці журнали різні
+    return filename + ".journal.jsonl"
+
+
+class Journal:
+    # Журнал змін лише на дописування (JSON Lines): кожна зміна - один рядок,
+    # тож збереження коштує O(1) незалежно від розміру бази
+    def __init__(self, filename, fsync=False):
+        self.filename = filename
+        self.fsync = fsync
+        self.seq = 0
+        self._f = None
+        self._lock = threading.Lock()  # append і trim з фонового автозбереження
+
+    def append(self, op, data):
+        with self._lock:
+            if self._f is None:
+                self._open()
+            self.seq += 1
+            self._f.write(json.dumps({"seq": self.seq, "op": op, "data": data}, ensure_ascii=False) + "\n")
+            self._f.flush()
+            if self.fsync:
+                os.fsync(self._f.fileno())
+
+    def _open(self):
+        # Обірваний останній рядок (збій під час запису) не повинен склеїтись з новим
+        broken_tail = False
+        try:
+            with open(self.filename, "rb") as f:
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    broken_tail = f.read(1) != b"\n"
+        except FileNotFoundError:
+            pass
+        self._f = open(self.filename, "a", encoding="utf-8")
+        if broken_tail:
+            self._f.write("\n")
+
+    def attach(self, employee_mgr, book_mgr, sale_mgr):
+        employee_mgr.journal = self
+        book_mgr.journal = self
+        sale_mgr.journal = self
+
+    def replay(self, employee_mgr, book_mgr, sale_mgr, after_seq=0):
+        self.seq = after_seq
+        applied = 0
+        try:
+            f = open(self.filename, "r", encoding="utf-8", errors="replace")
+        except FileNotFoundError:
+            return applied
+        with f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    seq, op, data = entry["seq"], entry["op"], entry["data"]
+                except (ValueError, KeyError, TypeError):
+                    print(f"Журнал: пошкоджений запис у рядку {line_no} пропущено.")
+                    continue
+                if seq <= after_seq:
+                    continue
+                if op == "add_employee":
+                    employee_mgr.add_employee(Employee.from_dict(data))
+                elif op == "remove_employee":
+                    employee_mgr.remove_employee(data)
+                elif op == "add_book":
+                    book_mgr.add_book(Book.from_dict(data))
+                elif op == "remove_book":
+                    book_mgr.remove_book(data)
+                elif op == "update_book":
+                    book_mgr.update_book(data.pop("id"), **data)
+                elif op == "add_sale":
+                    sale_mgr.add_sale(Sale.from_dict(data))
+                elif op == "add_sales":
+                    sale_mgr.add_sales(Sale.from_dict(d) for d in data)
+                elif op == "remove_sale":
+                    sale_mgr.remove_sale(data["book_id"], data["sale_date"])
+                elif op == "remove_sales":
+                    sale_mgr.remove_sales(**data)
+                else:
+                    print(f"Журнал: невідома операція '{op}' у рядку {line_no}.")
+                    continue
+                self.seq = max(self.seq, seq)
+                applied += 1
+        return applied
+
+    def truncate(self):
+        with self._lock:
+            self.close()
+            open(self.filename, "w", encoding="utf-8").close()
+
+    def trim(self, through_seq):
+        # Після знімка з journal_seq = through_seq лишаються лише новіші записи -
+        # зроблені, поки знімок записувався у фоні
+        with self._lock:
+            self.close()
+            try:
+                with open(self.filename, "r", encoding="utf-8", errors="replace") as f:
+                    lines = f.readlines()
+            except FileNotFoundError:
+                return
+            kept = []
+            for line in lines:
+                try:
+                    if json.loads(line)["seq"] > through_seq:
+                        kept.append(line if line.endswith("\n") else line + "\n")
+                except (ValueError, KeyError, TypeError):
+                    continue
+            with atomic_open(self.filename, fsync=self.fsync) as f:
+                f.writelines(kept)
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+class Autosaver:
+    # Фонове збереження data.json кожні every_changes змін або раз на every_seconds
+    # секунд, якщо зміни були (0 - без цієї умови). Менеджери пишуть зміни сюди як у
+    # журнал: запис пересилається справжньому журналу і рахується. Зберігає власний
+    # потік: прокидається за таймером (тож знімок пишеться і тоді, коли магазин
+    # простоює) або з check після змін, знімає копію стану під lock, пише знімок і
+    # прибирає з журналу записи, що вже у знімку. Зміни даних мають іти під тим самим
+    # lock (Store.changing), щоб копія не застала зміну напівзробленою.
+    def __init__(self, employee_mgr, book_mgr, sale_mgr, filename, journal=None,
+                 every_changes=1000, every_seconds=300, indent=4, compress=None):
+        self.managers = (employee_mgr, book_mgr, sale_mgr)
+        self.filename = filename
+        self.journal = journal
+        self.every_changes = every_changes
+        self.every_seconds = every_seconds
+        self.indent = indent
+        self.compress = compress
+        self.changes = 0  # змін після останньої копії стану
+        self.saves = 0
+        self.error = None  # остання помилка запису
+        self.lock = threading.RLock()  # повторно береться в append, поки зміна йде під Store.changing
+        self._since = time.monotonic()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._idle = threading.Event()  # немає незавершеного запису
+        self._idle.set()
+        for mgr in self.managers:
+            mgr.journal = self
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def append(self, op, data):
+        if self.journal is not None:
+            self.journal.append(op, data)
+        with self.lock:
+            self.changes += 1
+
+    @property
+    def busy(self):
+        return not self._idle.is_set()
+
+    def due(self):
+        if not self.changes:
+            return False
+        if self.every_changes and self.changes >= self.every_changes:
+            return True
+        return bool(self.every_seconds) and time.monotonic() - self._since >= self.every_seconds
+
+    def check(self):
+        # Викликається між змінами: якщо вже час, будить потік збереження
+        if self.due():
+            self._wake.set()
+
+    def _timeout(self):
+        # Скільки спати до перевірки за таймером; None - лише до check
+        if not self.every_seconds:
+            return None
+        return max(0.0, self._since + self.every_seconds - time.monotonic())
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self._timeout())
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self._save_if_due()
+            except Exception as e:
+                # Потік мусить жити далі: незбережені зміни лишаються в журналі,
+                # наступна спроба - за наступною умовою
+                self.error = e
+                print(f"Автозбереження не вдалося: {e!r}")
+
+    def _save_if_due(self):
+        with self.lock:
+            if not self.due():
+                if not self.changes:
+                    self._since = time.monotonic()  # змін не було - таймер починається знову
+                return
+            employee_mgr, book_mgr, sale_mgr = self.managers
+            sections = [
+                ("employees", employee_mgr.snapshot_dicts()),
+                ("books", book_mgr.snapshot_dicts()),
+                ("sales", sale_mgr.snapshot_dicts())
+            ]
+            seq = self.journal.seq if self.journal is not None else None
+            copied = self.changes
+            self.changes = 0
+            self._since = time.monotonic()
+            self._idle.clear()
+        try:
+            write_data_file(self.filename, sections, seq, self.indent, self.compress)
+            if seq is not None:
+                self.journal.trim(seq)
+            self.saves += 1
+        except Exception:
+            # Знімок не записано - його зміни лишаються незбереженими до наступної спроби
+            with self.lock:
+                self.changes += copied
+            raise
+        finally:
+            self._idle.set()
+
+    def wait(self):
+        # Дочекатися запису, що вже почався
+        self._idle.wait()
+
+    def close(self):
+        # Зупинити потік (після поточного запису) і повернути менеджерам справжній журнал
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        for mgr in self.managers:
+            mgr.journal = self.journal
+
+
+# ---------------------- Сховище ----------------------
+
+def create_sale_manager(backend="list"):
+    if backend == "columnar":
+        from columnar_store import ColumnarSaleManager
+        return ColumnarSaleManager()
+    return SaleManager()
+
+
+class Store:
+    # Менеджери вибраного сховища разом з журналом (JSON і двійковий знімок)
+    # або з'єднанням SQLite; спільні для меню і HTTP-сервісу
+    def __init__(self, backend="json", sales_backend="list", filename="data.json", db_file="bookstore.db",
+                 use_journal=True, import_json=None, autosave_changes=0, autosave_seconds=0, compress=None):
+        self.backend = backend
+        self.filename = filename
+        self.compress = compress
+        self.conn = None
+        self.journal = None
+        self.autosaver = None
+        if backend == "sqlite":
+            from sqlite_store import connect, create_managers
+            self.conn = connect(db_file)
+            self.employee_mgr, self.book_mgr, self.sale_mgr = create_managers(self.conn)
+            if import_json:
+                load_data(self.employee_mgr, self.book_mgr, self.sale_mgr, import_json)
+                print(f"Дані з {import_json} імпортовано у {db_file}.")
+        elif backend == "binary":
+            from snapshot_bin import load_snapshot
+            self.journal = Journal(journal_path(filename)) if use_journal else None
+            if os.path.exists(filename):
+                self.employee_mgr, self.book_mgr, self.sale_mgr = load_snapshot(filename, journal=self.journal)
+            else:
+                print("Файл даних не знайдено. Створюємо нову базу.")
+                self.employee_mgr, self.book_mgr, self.sale_mgr = EmployeeManager(), BookManager(), SaleManager()
+                if self.journal is not None:
+                    self.journal.replay(self.employee_mgr, self.book_mgr, self.sale_mgr)
+                    self.journal.attach(self.employee_mgr, self.book_mgr, self.sale_mgr)
+        else:
+            self.employee_mgr = EmployeeManager()
+            self.book_mgr = BookManager()
+            self.sale_mgr = create_sale_manager(sales_backend)
+            self.journal = Journal(journal_path(filename)) if use_journal else None
+            load_data(self.employee_mgr, self.book_mgr, self.sale_mgr, filename, journal=self.journal)
+            if autosave_changes or autosave_seconds:
+                self.autosaver = Autosaver(*self.managers(), filename, self.journal,
+                                           autosave_changes, autosave_seconds, compress=compress)
+
+    def managers(self):
+        return self.employee_mgr, self.book_mgr, self.sale_mgr
+
+    def changing(self):
+        # Зміни даних - під замком автозбереження, щоб його потік не зняв копію посеред зміни
+        return self.autosaver.lock if self.autosaver is not None else nullcontext()
+
+    def autosave(self):
+        # Точка між змінами, де можна почати фонове збереження
+        if self.autosaver is not None:
+            self.autosaver.check()
+
+    def compact(self):
+        # Перенести журнал у знімок; для SQLite нічого робити не треба
+        if self.autosaver is not None:
+            self.autosaver.wait()
+        if self.backend == "binary":
+            from snapshot_bin import write_snapshot
+            write_snapshot(self.filename, *self.managers(), self.journal.seq if self.journal else 0)
+            if self.journal is not None:
+                self.journal.truncate()
+        elif self.conn is None:
+            save_data(*self.managers(), self.filename, journal=self.journal, compress=self.compress)
+
+    def close(self):
+        if self.autosaver is not None:
+            self.autosaver.close()
+        if self.conn is not None:
+            # SQLite фіксує кожну зміну одразу
+            self.conn.close()
+        elif self.journal is not None:
+            # Усі зміни вже записані в журнал - переписувати весь файл не потрібно
+            self.journal.close()
+        elif self.backend == "binary":
+            from snapshot_bin import write_snapshot
+            write_snapshot(self.filename, *self.managers())
+        else:
+            save_data(*self.managers(), self.filename, compress=self.compress)
 
-    employee_mgr.from_dict(raw.get("employees", []))
-    book_mgr.from_dict(raw.get("books", []))
-
-    sales_raw = raw.get("sales", [])
-    sales_objs = []
-    for s in sales_raw:
-        book_id = s.get('book_id')
-        if book_id is None and 'book_title' in s:
-            found = next((b for b in book_mgr.books if b.title == s['book_title']), None)
-            book_id = found.id if found else None
-        sale_obj = Sale(
-            s.get('employee_name', ''),
-            book_id,
-            s.get('sale_date', ''),
-            s.get('real_price', 0.0)
-        )
-        sales_objs.append(sale_obj)
-    sale_mgr.sales = sales_objs
+
+def create_reports(sale_mgr, book_mgr, workers=1, report_cache=128):
+    # Об'єкт звітів: сам менеджер, за потреби з процесами і кешем попереду
+    reports = sale_mgr
+    if workers > 1:
+        from parallel_reports import ParallelReports
+        reports = ParallelReports(sale_mgr, workers=workers)
+    if report_cache > 0:
+        from report_cache import ReportCache
+        reports = ReportCache(sale_mgr, reports, maxsize=report_cache)
+        reports.attach(book_mgr)
+    return reports
 
 
 # ---------------------- Інтерактивне меню ----------------------
 
-def main():
-    emp_mgr = EmployeeManager()
-    book_mgr = BookManager()
-    sale_mgr = SaleManager()
+def main(backend="json", sales_backend="list", filename="data.json", db_file="bookstore.db",
+         use_journal=True, compact=False, import_json=None, workers=1, report_cache=128, instrument=False,
+         autosave_changes=0, autosave_seconds=0, compress=None):
+    # load_data/save_data обгортаються лише з --instrument і повертаються після виходу з меню
+    if not instrument:
+        return run_menu(backend, sales_backend, filename, db_file, use_journal, compact, import_json, workers,
+                        report_cache, autosave_changes, autosave_seconds, compress)
+    from instrumentation import Instrumentation
+    instrumentation = Instrumentation()
+    with instrumentation.instrument_functions(globals()):
+        run_menu(backend, sales_backend, filename, db_file, use_journal, compact, import_json, workers,
+                 report_cache, autosave_changes, autosave_seconds, compress, instrumentation)
+
+
+def run_menu(backend, sales_backend, filename, db_file, use_journal, compact, import_json, workers,
+             report_cache, autosave_changes, autosave_seconds, compress, instrumentation=None):
+    store = Store(backend, sales_backend, filename, db_file, use_journal, import_json,
+                  autosave_changes, autosave_seconds, compress)
+    if (autosave_changes or autosave_seconds) and store.autosaver is None:
+        print("Автозбереження доступне лише для сховища json.")
+    if compact and store.conn is None:
+        store.compact()
+        print("Журнал перенесено у знімок.")
+        return
+    emp_mgr, book_mgr, sale_mgr = store.managers()
     book_actions = BookActions(book_mgr)
-
-    load_data(emp_mgr, book_mgr, sale_mgr)
+    reports = create_reports(sale_mgr, book_mgr, workers, report_cache)
+    if instrumentation is not None:
+        instrumentation.instrument_managers(emp_mgr, book_mgr, sale_mgr)
+
+    def employees_menu():
+        print("\n--- Працівники ---")
+        print("1. Додати працівника")
+        print("2. Видалити працівника")
+        print("3. Показати всіх працівників")
+        print("4. Продажі працівника за період")
+        print("5. Рейтинг продавців за період")
+        sub_choice = input("Виберіть опцію: ")
+        if sub_choice == "1":
+            name = input("Ім'я: ")
+            pos = input("Посада: ")
+            phone = input("Телефон: ")
+            email = input("Email: ")
+            emp_mgr.add_employee(Employee(name, pos, phone, email))
+            print("Працівника додано!")
+        elif sub_choice == "2":
+            name = input("Ім'я працівника для видалення: ")
+            emp_mgr.remove_employee(name)
+            print("Працівника видалено!")
+        elif sub_choice == "3":
+            emp_mgr.list_employees(PAGE_SIZE)
+        elif sub_choice == "4":
+            name = input("Ім'я працівника: ")
+            employee = emp_mgr.find_employee(name)
+            if not employee:
+                print(f"Працівник '{name}' не знайдений.")
+                return
+            start_date = input("Початкова дата (YYYY-MM-DD): ")
+            end_date = input("Кінцева дата (YYYY-MM-DD): ")
+            sales = sale_mgr.sales_by_employee(employee.full_name, start_date, end_date)
+            for s in sales:
+                print(s)
+            print(f"Продажів: {len(sales)}")
+        elif sub_choice == "5":
+            start_date = input("Початкова дата (YYYY-MM-DD): ")
+            end_date = input("Кінцева дата (YYYY-MM-DD): ")
+            board = sale_mgr.employee_leaderboard(start_date, end_date, 10)
+            if not board:
+                print("Продажів за період немає.")
+            for place, (name, count) in enumerate(board, 1):
+                print(f"{place}. {name}: {count}")
+
+    def books_menu():
+        print("\n--- Книги ---")
+        print("1. Додати книгу")
+        print("2. Видалити книгу")
+        print("3. Показати книги")
+        print("4. Змінити книгу")
+        print("5. Знайти книгу")
+        sub_choice = input("Виберіть опцію: ")
+        if sub_choice == "1":
+            book_actions.add_book()
+        elif sub_choice == "2":
+            book_actions.remove_book()
+        elif sub_choice == "3":
+            print("Фільтри (порожньо - без фільтра):")
+            author = input("Автор: ") or None
+            genre = input("Жанр: ") or None
+            book_mgr.list_books(PAGE_SIZE, author=author, genre=genre)
+        elif sub_choice == "4":
+            book_actions.edit_book()
+        elif sub_choice == "5":
+            book_actions.search_books()
+
+    def sales_menu():
+        print("\n--- Продажі ---")
+        print("1. Додати продаж")
+        print("2. Видалити продаж")
+        print("3. Показати продажі")
+        print("4. Видалити всі продажі книги до дати")
+        sub_choice = input("Виберіть опцію: ")
+        if sub_choice == "1":
+            emp_name = input("Продавець: ")
+            employee = emp_mgr.find_employee(emp_name)
+            if not employee:
+                print(f"Працівник '{emp_name}' не знайдений.")
+                return
+
+            book = book_actions.choose_book()
+            if not book:
+                return
+            book_id = book.id
+
+            sale_date = input("Дата продажу (YYYY-MM-DD): ")
+            if date_key(sale_date) is None:
+                print("Невірний формат дати.")
+                return
+
+            real_price = book_actions.get_valid_float("Фактична ціна: ")
+            # Канонічне ім'я працівника, щоб індекс продажів не ділився за регістром
+            sale_mgr.add_sale(Sale(employee.full_name, book_id, sale_date, real_price))
+            print("Продаж додано!")
+
+        elif sub_choice == "2":
+            book_id = book_actions.get_valid_int("ID книги: ")
+            sale_date = input("Дата продажу (YYYY-MM-DD): ")
+            if sale_mgr.remove_sale(book_id, sale_date):
+                print("Продаж видалено!")
+            else:
+                print("Такого продажу не знайдено.")
+
+        elif sub_choice == "3":
+            print("Фільтри (порожньо - без фільтра):")
+            start_date = input("Від дати (YYYY-MM-DD): ") or None
+            end_date = input("До дати включно (YYYY-MM-DD): ") or None
+            emp_name = input("Продавець: ")
+            employee = emp_mgr.find_employee(emp_name) if emp_name else None
+            if emp_name and not employee:
+                print(f"Працівник '{emp_name}' не знайдений.")
+                return
+            book_id = input("ID книги: ")
+            if book_id and not book_id.isdigit():
+                print("ID книги має бути цілим числом.")
+                return
+            sale_mgr.list_sales(PAGE_SIZE, start_date, end_date,
+                                employee.full_name if employee else None, int(book_id) if book_id else None)
+
+        elif sub_choice == "4":
+            book_id = book_actions.get_valid_int("ID книги: ")
+            end_date = input("Остання дата включно (YYYY-MM-DD): ")
+            if date_key(end_date) is None:
+                print("Невірний формат дати.")
+                return
+            removed = sale_mgr.remove_sales(book_id=book_id, end_date=end_date)
+            print(f"Видалено продажів: {removed}")
+
+    def reports_menu():
+        print("\n--- Звіти ---")
+        print("1. Звіт за період")
+        print("2. Динаміка за днями, тижнями чи місяцями")
+        sub_choice = input("Виберіть опцію: ")
+        if sub_choice not in ("1", "2"):
+            return
+        start_date = input("Початкова дата (YYYY-MM-DD): ")
+        end_date = input("Кінцева дата (YYYY-MM-DD): ")
+
+        if sub_choice == "1":
+            report = reports.period_report(start_date, end_date, book_mgr)
+            print("\nНайбільш продавана книга:", report["most_sold_book"])
+            print("Найуспішніший працівник:", report["best_employee"])
+            print("Сумарний прибуток:", report["total_profit"], "$")
+            print("Найпопулярніший автор:", report["most_sold_author"])
+            print("Найпопулярніший жанр:", report["most_sold_genre"])
+            return
+
+        granularity = input("Крок (day/week/month) [month]: ") or "month"
+        if granularity not in GRANULARITIES:
+            print("Невірний крок.")
+            return
+        rows = sale_mgr.time_series(start_date, end_date, book_mgr, granularity)
+        if not rows:
+            print("Продажів за період немає.")
+            return
+        print(f"\n{'Період':<12}{'Виручка':>12}{'Прибуток':>12}{'Продажів':>10}  Книга-лідер")
+        for row in rows:
+            print(f"{row['period']:<12}{row['revenue']:>12.2f}{row['profit']:>12.2f}{row['units']:>10}"
+                  f"  {row['top_book']} ({row['top_book_units']})")
+        filename = input("Експортувати у файл (.csv або .json, порожньо - ні): ")
+        if filename:
+            export_time_series(rows, filename)
+            print(f"Динаміку записано у {filename}")
+
+    actions = {"1": employees_menu, "2": books_menu, "3": sales_menu, "4": reports_menu}
+
+    def diagnostics_menu():
+        from instrumentation import run_profiled
+
+        print("\n--- Діагностика ---")
+        print("1. Статистика викликів")
+        print("2. Скинути статистику")
+        print("3. Виконати дію меню під cProfile")
+        print("4. Виконати дію меню під tracemalloc")
+        sub_choice = input("Виберіть опцію: ")
+        if sub_choice in ("1", "2") and instrumentation is None:
+            print("Інструментування вимкнено - запустіть програму з --instrument.")
+        elif sub_choice == "1":
+            instrumentation.print_stats()
+            if hasattr(reports, "stats"):
+                print("Кеш звітів:", reports.stats())
+        elif sub_choice == "2":
+            instrumentation.reset()
+            print("Статистику скинуто.")
+        elif sub_choice in ("3", "4"):
+            action = actions.get(input("Дія головного меню (1-4): "))
+            if action is None:
+                print("Невірний вибір.")
+                return
+            run_profiled(action, "cpu" if sub_choice == "3" else "mem")
+
+    actions["6"] = diagnostics_menu
 
     while True:
         print("\n--- Меню книжкового магазину ---")
@@ -327,102 +1847,65 @@ def main():
         print("3. Продажі")
         print("4. Звіти")
         print("5. Вийти")
+        print("6. Діагностика")
         choice = input("Виберіть опцію: ")
 
-        if choice == "1":
-            print("\n--- Працівники ---")
-            print("1. Додати працівника")
-            print("2. Видалити працівника")
-            print("3. Показати всіх працівників")
-            sub_choice = input("Виберіть опцію: ")
-            if sub_choice == "1":
-                name = input("Ім'я: ")
-                pos = input("Посада: ")
-                phone = input("Телефон: ")
-                email = input("Email: ")
-                emp_mgr.add_employee(Employee(name, pos, phone, email))
-                print("Працівника додано!")
-            elif sub_choice == "2":
-                name = input("Ім'я працівника для видалення: ")
-                emp_mgr.remove_employee(name)
-                print("Працівника видалено!")
-            elif sub_choice == "3":
-                emp_mgr.list_employees()
-
-        elif choice == "2":
-            print("\n--- Книги ---")
-            print("1. Додати книгу")
-            print("2. Видалити книгу")
-            print("3. Показати всі книги")
-            sub_choice = input("Виберіть опцію: ")
-            if sub_choice == "1":
-                book_actions.add_book()
-            elif sub_choice == "2":
-                book_actions.remove_book()
-            elif sub_choice == "3":
-                book_mgr.list_books()
-
-        elif choice == "3":
-            print("\n--- Продажі ---")
-            print("1. Додати продаж")
-            print("2. Видалити продаж")
-            print("3. Показати всі продажі")
-            sub_choice = input("Виберіть опцію: ")
-            if sub_choice == "1":
-                emp_name = input("Продавець: ")
-                employee = emp_mgr.find_employee(emp_name)
-                if not employee:
-                    print(f"Працівник '{emp_name}' не знайдений.")
-                    continue
-
-                book_id = book_actions.get_valid_int("ID книги: ")
-                book = book_mgr.find_book(book_id)
-                if not book:
-                    print(f"Книга з ID {book_id} не знайдена.")
-                    continue
-
-                date = input("Дата продажу (YYYY-MM-DD): ")
-                try:
-                    datetime.strptime(date, "%Y-%m-%d")
-                except ValueError:
-                    print("Невірний формат дати.")
-                    continue
-
-                real_price = book_actions.get_valid_float("Фактична ціна: ")
-                sale_mgr.add_sale(Sale(emp_name, book_id, date, real_price))
-                print("Продаж додано!")
-
-            elif sub_choice == "2":
-                book_id = book_actions.get_valid_int("ID книги: ")
-                date = input("Дата продажу (YYYY-MM-DD): ")
-                sale_mgr.remove_sale(book_id, date)
-                print("Продаж видалено!")
-
-            elif sub_choice == "3":
-                sale_mgr.list_sales()
-
-        elif choice == "4":
-            print("\n--- Звіти ---")
-            start_date = input("Початкова дата (YYYY-MM-DD): ")
-            end_date = input("Кінцева дата (YYYY-MM-DD): ")
-            most_book = sale_mgr.most_sold_book(start_date, end_date)
-            best_emp = sale_mgr.best_employee(start_date, end_date)
-            profit = sale_mgr.total_profit(start_date, end_date, book_mgr)
-            most_author = sale_mgr.most_sold_author(start_date, end_date, book_mgr)
-            most_genre = sale_mgr.most_sold_genre(start_date, end_date, book_mgr)
-
-            print("\nНайбільш продавана книга:", most_book)
-            print("Найуспішніший працівник:", best_emp)
-            print("Сумарний прибуток:", profit, "$")
-            print("Найпопулярніший автор:", most_author)
-            print("Найпопулярніший жанр:", most_genre)
-
-        elif choice == "5":
-            save_data(emp_mgr, book_mgr, sale_mgr)
+        if choice == "5":
+            if hasattr(reports, "close"):
+                reports.close()
+            store.close()
             print("Дані збережено. Вихід...")
             break
+        elif choice in actions:
+            # Поки дія триває (разом з її запитаннями), автозбереження чекає
+            with store.changing():
+                actions[choice]()
+            store.autosave()
         else:
             print("Невірний вибір. Спробуйте ще раз.")
 
 
-main()
\ No newline at end of file
+def cli(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Книжковий магазин")
+    parser.add_argument("--backend", choices=["json", "binary", "sqlite"], default="json",
+                        help="сховище даних: data.json або двійковий знімок (обидва з журналом змін), "
+                             "або база SQLite")
+    parser.add_argument("--db", default="bookstore.db", help="файл бази SQLite")
+    parser.add_argument("--import-json", metavar="FILE",
+                        help="імпортувати data.json у базу SQLite перед запуском")
+    parser.add_argument("--sales-backend", choices=["list", "columnar"], default="list",
+                        help="сховище продажів: список об'єктів або колонкові масиви")
+    parser.add_argument("--data", default="data.json", help="файл знімка даних (JSON або двійковий)")
+    parser.add_argument("--no-journal", action="store_true",
+                        help="без журналу змін: зберігати весь файл при виході")
+    parser.add_argument("--compact", action="store_true",
+                        help="перенести журнал змін у знімок і вийти")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="процесів для звітів за довгі періоди (двійковий знімок)")
+    parser.add_argument("--report-cache", type=int, default=128, metavar="N",
+                        help="скільки звітів тримати в кеші (0 - без кешу)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="збирати статистику викликів менеджерів (меню 6. Діагностика)")
+    parser.add_argument("--autosave-changes", type=int, default=0, metavar="N",
+                        help="зберігати знімок у фоні кожні N змін (сховище json)")
+    parser.add_argument("--autosave-seconds", type=float, default=0, metavar="S",
+                        help="зберігати знімок у фоні, якщо з останнього минуло S секунд і були зміни")
+    parser.add_argument("--compress", choices=["gzip", "lzma"],
+                        help="стискати знімок data.json (читання розпізнає стиснення саме)")
+    args = parser.parse_args(argv)
+    main(backend=args.backend, sales_backend=args.sales_backend, filename=args.data, db_file=args.db,
+         use_journal=not args.no_journal, compact=args.compact, import_json=args.import_json,
+         workers=args.workers, report_cache=args.report_cache, instrument=args.instrument,
+         autosave_changes=args.autosave_changes, autosave_seconds=args.autosave_seconds, compress=args.compress)
+
+
+if __name__ == "__main__":
+    # Решта модулів імпортує var2_2: під цим ім'ям лежить цей самий модуль, інакше
+    # було б два класи Book з окремими лічильниками id і повторні id нових книг.
+    # Класи називаються var2_2.<клас>, щоб pickle знаходив їх і в інших процесах
+    sys.modules.setdefault("var2_2", sys.modules[__name__])
+    for _cls in [v for v in globals().values() if isinstance(v, type) and v.__module__ == __name__]:
+        _cls.__module__ = "var2_2"
+    cli()